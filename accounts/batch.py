@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import uuid
+
+from enum import Enum
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from accounts import metrics
+from accounts.cache import account_cache
+from accounts.exceptions import AccountNotFound
+from accounts.exceptions import InsufficientBalance
+from accounts.exceptions import NegativeTransaction
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+from accounts.models import SummaryChanges
+
+
+class BatchOperationType(str, Enum):
+    deposit = "deposit"
+    withdraw = "withdraw"
+    transfer = "transfer"
+
+
+class BatchMode(str, Enum):
+    atomic = "atomic"
+    best_effort = "best_effort"
+
+
+class BatchOperationStatus(str, Enum):
+    applied = "applied"
+    rejected = "rejected"
+    rolled_back = "rolled_back"
+
+
+@dataclasses.dataclass
+class BatchOperation():
+    type: BatchOperationType
+    account: int
+    amount: decimal.Decimal
+    to_account: int | None = None
+
+
+@dataclasses.dataclass
+class BatchOperationResult():
+    index: int
+    status: BatchOperationStatus
+    balance: decimal.Decimal | None = None
+    error: str | None = None
+
+
+class BatchProcessor():
+    """Apply many deposits, withdrawals and transfers with a handful of queries.
+
+    All referenced accounts are locked and resolved in one query, operations
+    are applied in memory in the given order, and the resulting balances,
+    points and ledger entries are written with bulk statements in a single
+    transaction. In atomic mode any rejected operation rolls back the batch;
+    in best-effort mode rejected operations are skipped.
+    """
+
+    deposit_cutoff_amount: decimal.Decimal = decimal.Decimal(100.00)
+    transfer_cutoff_amount: decimal.Decimal = decimal.Decimal(150.00)
+
+    def __init__(
+        self,
+        operations: list[BatchOperation],
+        mode: BatchMode = BatchMode.atomic,
+        batch_size: int = 1000,
+    ) -> None:
+        self.operations: list[BatchOperation] = operations
+        self.mode: BatchMode = mode
+        self.batch_size: int = batch_size
+
+        self.accounts: dict[int, Account] = {}
+        self.changed_accounts: dict[uuid.UUID, Account] = {}
+        self.entries: list[LedgerEntry] = []
+
+    def get_account_numbers(self) -> set[int]:
+        numbers: set[int] = set()
+
+        for operation in self.operations:
+            numbers.add(operation.account)
+
+            if operation.to_account is not None:
+                numbers.add(operation.to_account)
+
+        return numbers
+
+    def lock_accounts(self) -> None:
+        accounts = Account.objects.polymorphic().select_for_update(of=("self",)).filter(
+            number__in=self.get_account_numbers(),
+        ).order_by("pk")
+
+        self.accounts = {account.number: account.as_concrete() for account in accounts}
+
+    def get_account(self, number: int | None) -> Account:
+        try:
+            return self.accounts[number]
+        except KeyError:
+            raise AccountNotFound(f"Account {number} not found.")
+
+    def credit(self, account: Account, amount: decimal.Decimal, cutoff_amount: decimal.Decimal) -> None:
+        account.balance: decimal.Decimal = account.balance + amount
+
+        if isinstance(account, BonusAccount):
+            account.points: int = account.points + account.calculate_points(amount, cutoff_amount)
+
+        self.changed_accounts[account.pk] = account
+
+    def debit(self, account: Account, amount: decimal.Decimal) -> None:
+        if (account.balance - amount) < account.minimum_balance_value:
+            metrics.insufficient_balance_rejections.inc()
+            raise InsufficientBalance("Account doesn't have sufficient balance.")
+
+        account.balance: decimal.Decimal = account.balance - amount
+
+        self.changed_accounts[account.pk] = account
+
+    def apply(self, operation: BatchOperation) -> Account:
+        if operation.amount < decimal.Decimal(0.0):
+            raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
+
+        account: Account = self.get_account(operation.account)
+
+        if operation.type == BatchOperationType.deposit:
+            self.credit(account, operation.amount, self.deposit_cutoff_amount)
+            self.entries.append(account.build_entry(LedgerEntryKind.deposit, operation.amount))
+
+        elif operation.type == BatchOperationType.withdraw:
+            self.debit(account, operation.amount)
+            self.entries.append(account.build_entry(LedgerEntryKind.withdraw, operation.amount))
+
+        elif operation.type == BatchOperationType.transfer:
+            to_account: Account = self.get_account(operation.to_account)
+            correlation_id: uuid.UUID = uuid.uuid4()
+
+            self.debit(account, operation.amount)
+            self.credit(to_account, operation.amount, self.transfer_cutoff_amount)
+            self.entries.append(account.build_entry(LedgerEntryKind.transfer_out, operation.amount, correlation_id))
+            self.entries.append(to_account.build_entry(LedgerEntryKind.transfer_in, operation.amount, correlation_id))
+
+        return account
+
+    def save(self) -> None:
+        changed_accounts: list[Account] = list(self.changed_accounts.values())
+        bonus_accounts: list[BonusAccount] = [
+            account for account in changed_accounts if isinstance(account, BonusAccount)
+        ]
+
+        Account.objects.bulk_update(changed_accounts, ["balance"], batch_size=self.batch_size)
+        BonusAccount.objects.bulk_update(bonus_accounts, ["points"], batch_size=self.batch_size)
+        LedgerEntry.objects.bulk_create(self.entries, batch_size=self.batch_size)
+
+        changes: SummaryChanges = SummaryChanges()
+
+        for account in changed_accounts:
+            account.collect_summary_changes(changes)
+
+        changes.save()
+
+        metrics.count_entries(self.entries)
+
+        account_cache.invalidate(*[account.number for account in changed_accounts])
+
+    def run(self) -> list[BatchOperationResult]:
+        results: list[BatchOperationResult] = []
+
+        with transaction.atomic():
+            self.lock_accounts()
+
+            for index, operation in enumerate(self.operations):
+                snapshot: dict[int, tuple[decimal.Decimal, int | None]] = {
+                    number: (self.accounts[number].balance, getattr(self.accounts[number], "points", None))
+                    for number in (operation.account, operation.to_account)
+                    if number in self.accounts
+                }
+                entries_count: int = len(self.entries)
+
+                try:
+                    account: Account = self.apply(operation)
+                except ValidationError as err:
+                    self.restore(snapshot)
+                    del self.entries[entries_count:]
+
+                    results.append(BatchOperationResult(
+                        index=index,
+                        status=BatchOperationStatus.rejected,
+                        error=err.message,
+                    ))
+                else:
+                    results.append(BatchOperationResult(
+                        index=index,
+                        status=BatchOperationStatus.applied,
+                        balance=account.balance,
+                    ))
+
+            if self.mode == BatchMode.atomic and self.has_rejections(results):
+                for result in results:
+                    if result.status == BatchOperationStatus.applied:
+                        result.status = BatchOperationStatus.rolled_back
+                        result.balance = None
+
+                return results
+
+            self.save()
+
+        return results
+
+    def restore(self, snapshot: dict[int, tuple[decimal.Decimal, int | None]]) -> None:
+        for number, (balance, points) in snapshot.items():
+            account: Account = self.accounts[number]
+            account.balance: decimal.Decimal = balance
+
+            if points is not None:
+                account.points: int = points
+
+    @staticmethod
+    def has_rejections(results: list[BatchOperationResult]) -> bool:
+        return any(result.status == BatchOperationStatus.rejected for result in results)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import decimal
+import random
+import time
+
+from typing import Dict
+from typing import List
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.test import AsyncClient
+
+from accounts.bulk import bulk_create_accounts
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+
+
+ENDPOINTS: Dict[str, str] = {
+    "sync_list": "/api/accounts?limit=50",
+    "async_list": "/api/async/accounts?limit=50",
+    "sync_detail": "/api/accounts/{number}",
+    "async_detail": "/api/async/accounts/{number}",
+    "async_search": "/api/async/accounts/search?number={number}",
+}
+
+
+@dataclasses.dataclass
+class ASGIBenchmarkResult():
+    endpoint: str
+    requests: int
+    concurrency: int
+    errors: int
+    elapsed: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+
+async def drive(paths: List[str], concurrency: int) -> tuple[int, float]:
+    """Send the requests through Django's ASGI handler, ``concurrency`` at a time."""
+    client: AsyncClient = AsyncClient()
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(path: str) -> int:
+        async with semaphore:
+            response = await client.get(path)
+
+            return response.status_code
+
+    started_at: float = time.perf_counter()
+    statuses: List[int] = await asyncio.gather(*[send(path) for path in paths])
+    elapsed: float = time.perf_counter() - started_at
+
+    return sum(1 for status_code in statuses if status_code >= 400), elapsed
+
+
+def run_asgi_benchmark(
+    requests: int = 500,
+    concurrency: int = 50,
+    accounts: int = 300,
+    seed: int = 0,
+) -> List[ASGIBenchmarkResult]:
+    """Compare the throughput of the sync and async read endpoints under ASGI.
+
+    The detail cache is cleared before every endpoint so the sync detail view
+    is measured on the same cold start as the async one.
+    """
+    generator: random.Random = random.Random(seed)
+    first_number: int = (Account.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+    models: List[type[Account]] = [Account, BonusAccount, SavingsAccount]
+
+    bulk_create_accounts([
+        models[number % len(models)](number=number, balance=decimal.Decimal("100.00"))
+        for number in range(first_number, first_number + accounts)
+    ])
+
+    results: List[ASGIBenchmarkResult] = []
+
+    try:
+        for endpoint, path in ENDPOINTS.items():
+            cache.clear()
+
+            paths: List[str] = [
+                path.format(number=first_number + generator.randrange(accounts))
+                for _ in range(requests)
+            ]
+            errors, elapsed = asyncio.run(drive(paths, concurrency))
+
+            results.append(ASGIBenchmarkResult(endpoint, requests, concurrency, errors, elapsed))
+    finally:
+        Account.objects.filter(number__range=(first_number, first_number + accounts - 1)).delete()
+
+    return results
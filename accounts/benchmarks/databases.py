@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django.conf import settings
+
+
+def run_manage(args: List[str], environment: Dict[str, str]) -> str:
+    completed: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, str(settings.BASE_DIR / "manage.py"), *args],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return completed.stdout
+
+
+def run_database_profile_benchmark(
+    profiles: List[str],
+    operations: List[str],
+    threads: int = 8,
+    transfers_per_thread: int = 200,
+    accounts: int = 100,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Run the concurrent transfer benchmark once per database profile and operation.
+
+    Each profile runs in its own process against a fresh SQLite file, since
+    the profile is picked when the settings load. Server profiles such as
+    ``postgresql`` use the database named by the environment instead.
+    """
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    for profile in profiles:
+        with tempfile.TemporaryDirectory() as directory:
+            environment: Dict[str, str] = {**os.environ, "SYSBANKING_DB_PROFILE": profile}
+
+            if profile.startswith("sqlite"):
+                environment["SYSBANKING_DB_NAME"] = os.path.join(directory, "benchmark.sqlite3")
+
+            run_manage(["migrate", "--verbosity", "0"], environment)
+
+            results[profile] = {
+                operation: json.loads(run_manage(
+                    [
+                        "benchmark_transfers",
+                        "--json",
+                        "--operation", operation,
+                        "--threads", str(threads),
+                        "--transfers", str(transfers_per_thread),
+                        "--accounts", str(accounts),
+                    ],
+                    environment,
+                ))
+                for operation in operations
+            }
+
+    return results
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import decimal
+import random
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from django.db import transaction
+from django.db.models import Max
+
+from accounts.benchmarks.suite import ScenarioResult
+from accounts.benchmarks.suite import measure
+from accounts.bulk import bulk_create_accounts
+from accounts.exceptions import InsufficientBalance
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import FlatAccount
+from accounts.models import FlatBonusAccount
+from accounts.models import FlatSavingsAccount
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+from accounts.models import SavingsAccount
+from accounts.models import SummaryChanges
+
+
+LAYOUT_MODELS: Dict[str, List[type]] = {
+    "multi_table": [Account, BonusAccount, SavingsAccount],
+    "single_table": [FlatAccount, FlatBonusAccount, FlatSavingsAccount],
+}
+
+
+class LayoutBenchmark():
+    """Seed the same accounts in both storage layouts and time lookups and writes.
+
+    The multi-table deposit and transfer paths also append ledger entries,
+    so ``write_bonus`` saves balance and points directly to compare the raw
+    cost of each layout, and the single-table deposit writes the same ledger
+    entry and portfolio summary update as the multi-table one. Both layouts
+    share account ids, so those entries point at the seeded multi-table
+    account, and the summary moves made for the single-table layout are
+    reverted on cleanup.
+    """
+
+    def __init__(self, size: int, iterations: int = 200, seed: int = 0) -> None:
+        self.size: int = size
+        self.iterations: int = iterations
+        self.random: random.Random = random.Random(seed)
+
+        self.first_number: int = 0
+        self.bonus_numbers: List[int] = []
+        self.summary_reversal: SummaryChanges = SummaryChanges()
+
+    def seed(self, batch_size: int = 5000) -> None:
+        self.first_number = max(
+            Account.objects.aggregate(last=Max("number"))["last"] or 0,
+            FlatAccount.objects.aggregate(last=Max("number"))["last"] or 0,
+        ) + 1
+
+        for start in range(0, self.size, batch_size):
+            numbers: range = range(self.first_number + start, self.first_number + min(start + batch_size, self.size))
+
+            accounts: List[Account] = bulk_create_accounts(
+                [self.build(LAYOUT_MODELS["multi_table"], number) for number in numbers],
+                batch_size=batch_size,
+            )
+
+            flat_accounts: List[FlatAccount] = [self.build(LAYOUT_MODELS["single_table"], number) for number in numbers]
+
+            for account, flat_account in zip(accounts, flat_accounts):
+                flat_account.id = account.id
+                flat_account.type = flat_account.account_type.value
+
+                if isinstance(flat_account, FlatBonusAccount):
+                    flat_account.points = 10
+
+            FlatAccount.objects.bulk_create(flat_accounts, batch_size=batch_size)
+
+            self.bonus_numbers.extend(
+                flat_account.number for flat_account in flat_accounts
+                if isinstance(flat_account, FlatBonusAccount)
+            )
+
+    @staticmethod
+    def build(models: List[type], number: int) -> Any:
+        return models[number % len(models)](number=number, balance=decimal.Decimal("1000.00"))
+
+    def cleanup(self) -> None:
+        numbers: tuple[int, int] = (self.first_number, self.first_number + self.size - 1)
+
+        with transaction.atomic():
+            Account.objects.filter(number__range=numbers).delete()
+            FlatAccount.objects.filter(number__range=numbers).delete()
+
+            self.summary_reversal.save()
+
+    def any_number(self) -> int:
+        return self.first_number + self.random.randrange(self.size)
+
+    def any_bonus_number(self) -> int:
+        return self.random.choice(self.bonus_numbers)
+
+    def write_bonus(self, account: BonusAccount | FlatBonusAccount) -> None:
+        account.balance = account.balance + decimal.Decimal("1.00")
+        account.points = account.points + 1
+        account.save(update_fields=["balance", "points"])
+
+    def deposit_flat(self, account: FlatAccount) -> None:
+        amount: decimal.Decimal = decimal.Decimal("1.00")
+
+        with transaction.atomic():
+            account.deposit(amount)
+
+            LedgerEntry.objects.create(
+                account_id=account.pk,
+                kind=LedgerEntryKind.deposit,
+                amount=amount,
+                balance=account.balance,
+            )
+
+            changes: SummaryChanges = SummaryChanges()
+            changes.change_balance(account.type, account.balance - amount, account.balance)
+            changes.save()
+
+        self.summary_reversal.change_balance(account.type, account.balance, account.balance - amount)
+
+    def transfer(self, transfer: Callable[..., None], get_account: Callable[[int], Any]) -> None:
+        try:
+            transfer(decimal.Decimal("1.00"), get_account(self.any_number()), get_account(self.any_number()))
+        except InsufficientBalance:
+            pass
+
+    def get_scenarios(self) -> Dict[str, Dict[str, Callable[[], Any]]]:
+        return {
+            "multi_table": {
+                "lookup_by_number": lambda: Account.objects.get_by_number(self.any_number()),
+                "list_bonus_page": lambda: list(BonusAccount.objects.order_by("number")[:100]),
+                "write_bonus": lambda: self.write_bonus(BonusAccount.objects.get(number=self.any_bonus_number())),
+                "deposit": lambda: Account.objects.get_by_number(self.any_number()).deposit(decimal.Decimal("1.00")),
+                "transfer": lambda: self.transfer(Account.transfer, Account.objects.get_by_number),
+            },
+            "single_table": {
+                "lookup_by_number": lambda: FlatAccount.objects.get(number=self.any_number()),
+                "list_bonus_page": lambda: list(FlatBonusAccount.objects.order_by("number")[:100]),
+                "write_bonus": lambda: self.write_bonus(FlatBonusAccount.objects.get(number=self.any_bonus_number())),
+                "deposit": lambda: self.deposit_flat(FlatAccount.objects.get(number=self.any_number())),
+                "transfer": lambda: self.transfer(
+                    FlatAccount.transfer, lambda number: FlatAccount.objects.get(number=number),
+                ),
+            },
+        }
+
+    def run(self) -> Dict[str, Dict[str, ScenarioResult]]:
+        self.seed()
+
+        try:
+            return {
+                layout: {
+                    name: measure(name, operation, self.iterations)
+                    for name, operation in scenarios.items()
+                }
+                for layout, scenarios in self.get_scenarios().items()
+            }
+        finally:
+            self.cleanup()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import random
+import time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from django.db.models import Max
+
+from accounts.bulk import bulk_create_accounts
+from accounts.models import Account
+from accounts.models import AccountType
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+from restapi.rows import detail_rows
+from restapi.rows import list_rows
+from restapi.rows import serialize_detail_row
+from restapi.rows import serialize_list_row
+from restapi.serializers import AccountSerializer
+from restapi.serializers import DetailAccountSerializer
+from restapi.serializers import DetailBonusAccountSerializer
+from restapi.serializers import DetailSavingsAccountSerializer
+
+
+DETAIL_SERIALIZERS: Dict[str, type[DetailAccountSerializer]] = {
+    AccountType.simple.value: DetailAccountSerializer,
+    AccountType.bonus.value: DetailBonusAccountSerializer,
+    AccountType.savings.value: DetailSavingsAccountSerializer,
+}
+
+
+@dataclasses.dataclass
+class SerializationResult():
+    payload: str
+    path: str
+    rows: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def serialize_list_models(accounts) -> List[Dict[str, Any]]:
+    return AccountSerializer(
+        [account.as_concrete() for account in accounts.polymorphic()],
+        many=True,
+    ).data
+
+
+def serialize_list_values(accounts) -> List[Dict[str, Any]]:
+    return [serialize_list_row(row) for row in list_rows(accounts)]
+
+
+def serialize_detail_models(accounts) -> List[Dict[str, Any]]:
+    return [
+        DETAIL_SERIALIZERS[account.account_type](account.as_concrete()).data
+        for account in accounts.polymorphic().with_type()
+    ]
+
+
+def serialize_detail_values(accounts) -> List[Dict[str, Any]]:
+    return [serialize_detail_row(*row) for row in detail_rows(accounts)]
+
+
+PATHS: Dict[str, Dict[str, Callable[[Any], List[Dict[str, Any]]]]] = {
+    "list": {"model_serializer": serialize_list_models, "values_rows": serialize_list_values},
+    "detail": {"model_serializer": serialize_detail_models, "values_rows": serialize_detail_values},
+}
+
+
+def run_serialization_benchmark(accounts: int = 100_000, seed: int = 0) -> List[SerializationResult]:
+    """Time the ``ModelSerializer`` and ``values()`` row paths over the same seeded accounts.
+
+    Both paths include the query, so the figures compare what a request pays
+    end to end for the list and detail payloads.
+    """
+    generator: random.Random = random.Random(seed)
+    first_number: int = (Account.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+    models: List[type[Account]] = [Account, BonusAccount, SavingsAccount]
+
+    bulk_create_accounts(
+        [
+            models[number % len(models)](
+                number=number,
+                balance=decimal.Decimal(generator.randrange(-100_000, 1_000_000)) / 100,
+            )
+            for number in range(first_number, first_number + accounts)
+        ],
+        batch_size=5000,
+    )
+
+    queryset = Account.objects.filter(
+        number__range=(first_number, first_number + accounts - 1),
+    ).order_by("number")
+    results: List[SerializationResult] = []
+
+    try:
+        for payload, paths in PATHS.items():
+            for path, serialize in paths.items():
+                started_at: float = time.perf_counter()
+                rows: List[Dict[str, Any]] = serialize(queryset)
+                elapsed: float = time.perf_counter() - started_at
+
+                results.append(SerializationResult(payload, path, len(rows), elapsed))
+    finally:
+        queryset.delete()
+
+    return results
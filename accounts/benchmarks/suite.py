@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+import json
+import platform
+import random
+import statistics
+import time
+import uuid
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import django
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from django.test import Client
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.bulk import bulk_create_accounts
+from accounts.exceptions import InsufficientBalance
+from accounts.jobs import YieldWorker
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+from accounts.models import YieldRun
+
+
+SCALES: Dict[str, int] = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+ACCOUNT_MODELS: List[type[Account]] = [Account, BonusAccount, SavingsAccount]
+
+YIELD_SCENARIOS: List[str] = ["generate_yield_for_savings_accounts", "api_yields"]
+
+
+@dataclasses.dataclass
+class ScenarioResult():
+    name: str
+    iterations: int
+    elapsed: float
+    latencies: List[float]
+    queries: int
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percent - 1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "elapsed_s": self.elapsed,
+            "throughput_ops_s": self.iterations / self.elapsed if self.elapsed else 0.0,
+            "mean_ms": statistics.fmean(self.latencies) * 1000 if self.latencies else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "queries_per_op": self.queries / self.iterations if self.iterations else 0.0,
+        }
+
+
+def measure(name: str, operation: Callable[[], Any], iterations: int) -> ScenarioResult:
+    latencies: List[float] = []
+
+    with CaptureQueriesContext(connection) as queries:
+        started_at: float = time.perf_counter()
+
+        for _ in range(iterations):
+            operation_started_at: float = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - operation_started_at)
+
+        elapsed: float = time.perf_counter() - started_at
+
+    return ScenarioResult(name, iterations, elapsed, latencies, len(queries.captured_queries))
+
+
+class BenchmarkSuite():
+    """Seed a dataset and time the account model paths and REST endpoints.
+
+    Accounts are seeded above the highest existing number and removed after
+    the run unless ``keep`` is set. Yield scenarios credit every savings
+    account, so they refuse to run on a database that already holds accounts
+    unless ``force`` is set. The yield runs the suite queues are the only ones
+    it drains, and they are removed with the seeded accounts.
+    """
+
+    def __init__(self, size: int, iterations: int = 200, seed: int = 0, keep: bool = False, force: bool = False) -> None:
+        self.size: int = size
+        self.iterations: int = iterations
+        self.keep: bool = keep
+        self.force: bool = force
+        self.random: random.Random = random.Random(seed)
+        self.client: Client = Client()
+
+        self.first_number: int = 0
+        self.numbers: Dict[type[Account], List[int]] = {}
+        self.yield_references: List[str] = []
+
+    def seed(self, batch_size: int = 5000) -> None:
+        self.first_number = (Account.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+        self.numbers = {model: [] for model in ACCOUNT_MODELS}
+
+        for start in range(0, self.size, batch_size):
+            accounts: List[Account] = []
+
+            for number in range(self.first_number + start, self.first_number + min(start + batch_size, self.size)):
+                model: type[Account] = ACCOUNT_MODELS[number % len(ACCOUNT_MODELS)]
+                accounts.append(model(number=number, balance=decimal.Decimal("1000.00")))
+                self.numbers[model].append(number)
+
+            bulk_create_accounts(accounts, batch_size=batch_size)
+
+    def cleanup(self) -> None:
+        Account.objects.filter(
+            number__range=(self.first_number, self.first_number + self.size - 1),
+        ).delete()
+        YieldRun.objects.filter(reference__in=self.yield_references).delete()
+
+    def any_number(self) -> int:
+        return self.first_number + self.random.randrange(self.size)
+
+    def measure(self, name: str, operation: Callable[[], Any], iterations: int | None = None) -> ScenarioResult:
+        return measure(name, operation, iterations or self.iterations)
+
+    def transfer(self) -> None:
+        from_number, to_number = self.any_number(), self.any_number()
+
+        try:
+            Account.transfer(
+                decimal.Decimal("1.00"),
+                Account.objects.get_by_number(from_number),
+                Account.objects.get_by_number(to_number),
+            )
+        except InsufficientBalance:
+            pass
+
+    def put(self, path: str, data: Dict[str, Any]) -> None:
+        self.client.put(path, json.dumps(data), content_type="application/json")
+
+    def next_yield_reference(self) -> str:
+        self.yield_references.append(f"benchmark-{uuid.uuid4().hex}")
+
+        return self.yield_references[-1]
+
+    def generate_yields(self) -> None:
+        SavingsAccount.generate_yield_for_savings_accounts(decimal.Decimal("0.01"), reference=self.next_yield_reference())
+
+    def api_yields(self) -> None:
+        reference: str = self.next_yield_reference()
+
+        # A spawned worker would drain every queued run, not only the benchmark's.
+        with override_settings(ACCOUNTS_YIELD_JOBS={**getattr(settings, "ACCOUNTS_YIELD_JOBS", {}), "SPAWN_WORKER": False}):
+            self.put("/api/accounts/yields", {"tax": "0.01", "reference": reference})
+
+        YieldWorker().run_pending([reference])
+
+    def get_scenarios(self) -> Dict[str, tuple[Callable[[], Any], int | None]]:
+        return {
+            "get_account_by_number": (
+                lambda: Account.objects.get_by_number(self.any_number()), None,
+            ),
+            "transfer": (self.transfer, None),
+            "generate_yield_for_savings_accounts": (self.generate_yields, 3),
+            "api_list": (lambda: self.client.get("/api/accounts"), None),
+            "api_detail": (lambda: self.client.get(f"/api/accounts/{self.any_number()}"), None),
+            "api_history": (lambda: self.client.get(f"/api/accounts/{self.any_number()}/history"), None),
+            "api_deposit": (
+                lambda: self.put(f"/api/accounts/{self.any_number()}/deposit", {"amount": "1.00"}), None,
+            ),
+            "api_withdraw": (
+                lambda: self.put(f"/api/accounts/{self.any_number()}/withdraw", {"amount": "1.00"}), None,
+            ),
+            "api_transfer": (
+                lambda: self.put(
+                    f"/api/accounts/{self.any_number()}/transfer",
+                    {"amount": "1.00", "to_account": self.any_number()},
+                ),
+                None,
+            ),
+            "api_batch": (
+                lambda: self.client.post(
+                    "/api/accounts/batch",
+                    json.dumps({
+                        "mode": "best_effort",
+                        "operations": [
+                            {"type": "deposit", "account": self.any_number(), "amount": "1.00"}
+                            for _ in range(100)
+                        ],
+                    }),
+                    content_type="application/json",
+                ),
+                None,
+            ),
+            "api_yields": (self.api_yields, 3),
+        }
+
+    def run(self, scenarios: List[str] | None = None) -> Dict[str, Any]:
+        runs_yields: bool = any(not scenarios or name in scenarios for name in YIELD_SCENARIOS)
+
+        if runs_yields and not self.force and Account.objects.exists():
+            raise RuntimeError(
+                "Yield scenarios credit every savings account and the database already holds accounts, "
+                "run them against a dedicated database or force them."
+            )
+
+        seed_started_at: float = time.perf_counter()
+        self.seed()
+        seed_elapsed: float = time.perf_counter() - seed_started_at
+
+        results: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            for name, (operation, iterations) in self.get_scenarios().items():
+                if scenarios and name not in scenarios:
+                    continue
+
+                results[name] = self.measure(name, operation, iterations).as_dict()
+        finally:
+            if not self.keep:
+                self.cleanup()
+
+        return {
+            "meta": {
+                "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "accounts": self.size,
+                "accounts_by_type": {model.__name__: len(numbers) for model, numbers in self.numbers.items()},
+                "iterations": self.iterations,
+                "seed_s": seed_elapsed,
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+            },
+            "results": results,
+        }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Ratio of current to baseline for the latency and throughput metrics of shared scenarios."""
+    comparison: Dict[str, Dict[str, float]] = {}
+
+    for name, metrics in current["results"].items():
+        baseline_metrics: Dict[str, float] | None = baseline["results"].get(name)
+
+        if not baseline_metrics:
+            continue
+
+        comparison[name] = {
+            metric: metrics[metric] / baseline_metrics[metric]
+            for metric in ["p50_ms", "p95_ms", "p99_ms", "throughput_ops_s", "queries_per_op"]
+            if baseline_metrics.get(metric)
+        }
+
+    return comparison
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import random
+import threading
+import time
+
+from django.db import connection
+from django.db import OperationalError
+from django.db.models import Max
+from django.db.models import Sum
+
+from accounts.bulk import bulk_create_accounts
+from accounts.exceptions import InsufficientBalance
+from accounts.models import Account
+
+
+OPERATIONS: list[str] = ["transfer", "deposit"]
+
+
+@dataclasses.dataclass
+class TransferBenchmarkResult():
+    operation: str
+    threads: int
+    attempted: int
+    completed: int
+    rejected: int
+    failed: int
+    elapsed: float
+    initial_total: decimal.Decimal
+    final_total: decimal.Decimal
+    amount: decimal.Decimal = decimal.Decimal("1.00")
+
+    @property
+    def transfers_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def conserved(self) -> bool:
+        if self.operation == "deposit":
+            return self.final_total == self.initial_total + self.completed * self.amount
+
+        return self.initial_total == self.final_total
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            **dataclasses.asdict(self),
+            "initial_total": str(self.initial_total),
+            "final_total": str(self.final_total),
+            "amount": str(self.amount),
+            "transfers_per_second": self.transfers_per_second,
+            "conserved": self.conserved,
+        }
+
+
+def seed_accounts(size: int, balance: decimal.Decimal) -> list[int]:
+    first_number: int = (Account.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+    numbers: list[int] = list(range(first_number, first_number + size))
+
+    bulk_create_accounts(
+        [Account(number=number, balance=balance) for number in numbers],
+        batch_size=1000,
+    )
+
+    return numbers
+
+
+def total_balance(numbers: list[int]) -> decimal.Decimal:
+    return Account.objects.filter(number__range=(numbers[0], numbers[-1])).aggregate(
+        total=Sum("balance"),
+    )["total"] or decimal.Decimal(0)
+
+
+def run_transfer_benchmark(
+    accounts: int = 100,
+    threads: int = 8,
+    transfers_per_thread: int = 200,
+    amount: decimal.Decimal = decimal.Decimal("1.00"),
+    initial_balance: decimal.Decimal = decimal.Decimal("100.00"),
+    keep: bool = False,
+    operation: str = "transfer",
+) -> TransferBenchmarkResult:
+    """Run random transfers between seeded accounts from several threads at once.
+
+    Every thread opens its own database connection. Transfers rejected for
+    insufficient balance or failed on database locking are counted apart,
+    and the balance total is compared before and after to prove conservation.
+    With the ``deposit`` operation every thread deposits into random
+    accounts instead, and the total must grow by the completed deposits.
+    """
+    numbers: list[int] = seed_accounts(accounts, initial_balance)
+    initial_total: decimal.Decimal = total_balance(numbers)
+
+    counters: dict[str, int] = {"completed": 0, "rejected": 0, "failed": 0}
+    counters_lock: threading.Lock = threading.Lock()
+    start_barrier: threading.Barrier = threading.Barrier(threads)
+
+    def worker(seed: int) -> None:
+        generator: random.Random = random.Random(seed)
+        results: dict[str, int] = {"completed": 0, "rejected": 0, "failed": 0}
+
+        try:
+            start_barrier.wait()
+
+            for _ in range(transfers_per_thread):
+                from_number, to_number = generator.sample(numbers, 2)
+
+                try:
+                    if operation == "deposit":
+                        Account.objects.get_by_number(to_number).deposit(amount)
+                    else:
+                        Account.transfer(
+                            amount=amount,
+                            from_account=Account.objects.get_by_number(from_number),
+                            to_account=Account.objects.get_by_number(to_number),
+                        )
+                except InsufficientBalance:
+                    results["rejected"] += 1
+                except OperationalError:
+                    results["failed"] += 1
+                else:
+                    results["completed"] += 1
+        finally:
+            connection.close()
+
+            with counters_lock:
+                for key, value in results.items():
+                    counters[key] += value
+
+    workers: list[threading.Thread] = [
+        threading.Thread(target=worker, args=(seed,)) for seed in range(threads)
+    ]
+
+    started_at: float = time.perf_counter()
+
+    for thread in workers:
+        thread.start()
+
+    for thread in workers:
+        thread.join()
+
+    elapsed: float = time.perf_counter() - started_at
+
+    result: TransferBenchmarkResult = TransferBenchmarkResult(
+        operation=operation,
+        threads=threads,
+        attempted=threads * transfers_per_thread,
+        elapsed=elapsed,
+        initial_total=initial_total,
+        final_total=total_balance(numbers),
+        amount=amount,
+        **counters,
+    )
+
+    if not keep:
+        Account.objects.filter(number__range=(numbers[0], numbers[-1])).delete()
+
+    return result
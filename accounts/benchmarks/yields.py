@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import hashlib
+import random
+import time
+
+from typing import List
+
+from django.db.models import Max
+
+from accounts.bulk import bulk_create_accounts
+from accounts.models import Account
+from accounts.models import SavingsAccount
+from accounts.models import YieldRun
+from accounts.yields import CENT
+from accounts.yields import ParallelYieldEngine
+from accounts.yields import YieldEngine
+
+
+@dataclasses.dataclass
+class YieldScalingResult():
+    workers: int
+    accounts: int
+    elapsed: float
+    total_yield: decimal.Decimal
+    balances_digest: str
+    matches_sequential: bool = True
+
+    @property
+    def accounts_per_second(self) -> float:
+        return self.accounts / self.elapsed if self.elapsed else 0.0
+
+
+class YieldScalingBenchmark():
+    """Time one yield run over the same savings accounts for every worker count.
+
+    The accounts are seeded again with the same balances before every run,
+    and each run's total and final balances are checked against the
+    sequential ``YieldEngine`` run. Multi-process runs need a database other
+    processes can open, in-memory SQLite falls back to running in-process.
+    """
+
+    def __init__(
+        self,
+        accounts: int = 100_000,
+        workers: List[int] | None = None,
+        tax: decimal.Decimal = decimal.Decimal("0.73"),
+        chunk_size: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.accounts: int = accounts
+        self.workers: List[int] = workers or [1, 2, 4]
+        self.tax: decimal.Decimal = tax
+        self.chunk_size: int | None = chunk_size
+        self.seed: int = seed
+
+        self.first_number: int = 0
+
+    def seed_accounts(self) -> None:
+        generator: random.Random = random.Random(self.seed)
+
+        bulk_create_accounts(
+            [
+                SavingsAccount(number=number, balance=decimal.Decimal(generator.randrange(0, 10_000_000)) / 100)
+                for number in range(self.first_number, self.first_number + self.accounts)
+            ],
+            batch_size=5000,
+        )
+
+    def get_accounts(self):
+        return Account.objects.filter(number__range=(self.first_number, self.first_number + self.accounts - 1))
+
+    def get_balances_digest(self) -> str:
+        digest = hashlib.sha256()
+
+        for number, balance in self.get_accounts().order_by("number").values_list("number", "balance").iterator():
+            digest.update(f"{number}:{balance.quantize(CENT)}\n".encode())
+
+        return digest.hexdigest()
+
+    def measure(self, workers: int) -> YieldScalingResult:
+        self.seed_accounts()
+
+        try:
+            reference: str = f"benchmark-{self.first_number}-{workers}"
+            started_at: float = time.perf_counter()
+
+            if workers:
+                yield_run: YieldRun = ParallelYieldEngine.start(
+                    self.tax, workers, reference=reference, chunk_size=self.chunk_size,
+                ).run()
+            else:
+                yield_run: YieldRun = YieldEngine.start(
+                    self.tax, reference=reference, chunk_size=self.chunk_size,
+                ).run()
+
+            elapsed: float = time.perf_counter() - started_at
+
+            return YieldScalingResult(
+                workers=workers,
+                accounts=yield_run.accounts_processed,
+                elapsed=elapsed,
+                total_yield=yield_run.total_yield,
+                balances_digest=self.get_balances_digest(),
+            )
+        finally:
+            self.get_accounts().delete()
+            YieldRun.objects.filter(reference__startswith=f"benchmark-{self.first_number}-").delete()
+
+    def run(self) -> List[YieldScalingResult]:
+        """Measure the sequential engine first, labelled as 0 workers, then every worker count."""
+        if SavingsAccount.objects.exists():
+            raise RuntimeError("Yield runs credit every savings account, run the benchmark against an empty database")
+
+        self.first_number = (Account.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+
+        sequential: YieldScalingResult = self.measure(0)
+        results: List[YieldScalingResult] = [sequential]
+
+        for workers in self.workers:
+            result: YieldScalingResult = self.measure(workers)
+            result.matches_sequential = (
+                result.total_yield == sequential.total_yield
+                and result.balances_digest == sequential.balances_digest
+            )
+            results.append(result)
+
+        return results
+
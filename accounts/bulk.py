@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import connections
+from django.db import router
+from django.db import transaction
+
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+from accounts.models import SummaryChanges
+from accounts.numbers import account_number_allocator
+
+
+def insert_subclass_rows(model: type[Account], accounts: list[Account], using: str) -> None:
+    """Insert only the subclass table rows, ``bulk_create`` refuses multi-table inherited models."""
+    connection = connections[using]
+    fields = model._meta.local_concrete_fields
+    quote_name = connection.ops.quote_name
+
+    sql: str = "INSERT INTO {table} ({columns}) VALUES ({placeholders})".format(
+        table=quote_name(model._meta.db_table),
+        columns=", ".join(quote_name(field.column) for field in fields),
+        placeholders=", ".join(["%s"] * len(fields)),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            [field.get_db_prep_save(getattr(account, field.attname), connection) for field in fields]
+            for account in accounts
+        ])
+
+
+def bulk_create_accounts(
+    accounts: Iterable[Account | BonusAccount | SavingsAccount],
+    batch_size: int = 1000,
+) -> list[Account | BonusAccount | SavingsAccount]:
+    """Insert accounts of any type with one batched insert per table."""
+    accounts: list[Account] = list(accounts)
+    using: str = router.db_for_write(Account)
+
+    for account in accounts:
+        account.kind = account.type.value
+
+        if type(account) is not Account:
+            account.account_ptr_id = account.id
+
+    with transaction.atomic(using=using):
+        account_number_allocator.claim([account.number for account in accounts], using=using)
+
+        Account.objects.using(using).bulk_create(
+            [
+                Account(id=account.id, number=account.number, balance=account.balance, kind=account.kind)
+                for account in accounts
+            ],
+            batch_size=batch_size,
+        )
+
+        for model in [BonusAccount, SavingsAccount]:
+            subclass_accounts: list[Account] = [
+                account for account in accounts if type(account) is model
+            ]
+
+            for start in range(0, len(subclass_accounts), batch_size):
+                insert_subclass_rows(model, subclass_accounts[start:start + batch_size], using)
+
+        changes: SummaryChanges = SummaryChanges()
+
+        for account in accounts:
+            changes.add_account(account)
+
+        changes.save()
+
+    for account in accounts:
+        account._state.adding = False
+        account._state.db = using
+
+    return accounts
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import uuid
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from accounts.models import Account
+
+
+class AccountCache():
+    """Versioned read-through cache for resolved accounts and their payloads.
+
+    Every account number has a random version token and all accounts share a
+    generation token. Both are part of the entry keys, so replacing a token
+    after a balance change makes the old entries unreachable, and they age
+    out through the backend's own TTL/LRU eviction.
+    """
+
+    def __init__(self, alias: str = "default", timeout: int | None = 30, prefix: str = "accounts") -> None:
+        self.alias: str = alias
+        self.timeout: int | None = timeout
+        self.prefix: str = prefix
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.counters_lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> AccountCache:
+        options: Dict[str, Any] = getattr(settings, "ACCOUNTS_CACHE", {})
+
+        return cls(
+            alias=options.get("ALIAS", "default"),
+            timeout=options.get("TIMEOUT", 30),
+            prefix=options.get("PREFIX", "accounts"),
+        )
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.prefix}:generation"
+
+    def get_version_key(self, number: int) -> str:
+        return f"{self.prefix}:version:{number}"
+
+    def get_version(self, number: int) -> str:
+        keys: list[str] = [self.generation_key, self.get_version_key(number)]
+        tokens: Dict[str, str] = self.cache.get_many(keys)
+
+        for key in keys:
+            if key not in tokens:
+                tokens[key] = self.cache.get_or_set(key, uuid.uuid4().hex, timeout=None)
+
+        return ".".join(tokens[key] for key in keys)
+
+    def get_or_load(self, kind: str, number: int, loader: Callable[[], Any]) -> Any:
+        key: str = f"{self.prefix}:{kind}:{number}:{self.get_version(number)}"
+        value: Any = self.cache.get(key)
+
+        if value is not None:
+            self.count(hit=True)
+            return value
+
+        self.count(hit=False)
+
+        value = loader()
+        self.cache.set(key, value, timeout=self.timeout)
+
+        return value
+
+    def get_account(self, number: int) -> Account:
+        from accounts.models import Account
+
+        return self.get_or_load("account", number, lambda: Account.objects.get_by_number(number))
+
+    def get_payload(self, number: int, serialize: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+        return self.get_or_load("payload", number, lambda: serialize(number))
+
+    def invalidate(self, *numbers: int) -> None:
+        """Replace the version tokens of the given accounts once the transaction commits."""
+        def replace_tokens() -> None:
+            self.cache.set_many(
+                {self.get_version_key(number): uuid.uuid4().hex for number in numbers},
+                timeout=None,
+            )
+
+        transaction.on_commit(replace_tokens)
+
+    def invalidate_all(self) -> None:
+        transaction.on_commit(
+            lambda: self.cache.set(self.generation_key, uuid.uuid4().hex, timeout=None)
+        )
+
+    def count(self, hit: bool) -> None:
+        with self.counters_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+account_cache: AccountCache = AccountCache.from_settings()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+
+from enum import Enum
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import DecimalField
+from django.db.models import Exists
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import Account
+from accounts.models import AccountQuerySet
+from accounts.models import BalanceCheckpoint
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+
+
+class CheckpointPeriod(str, Enum):
+    day = "day"
+    month = "month"
+
+
+CENT: decimal.Decimal = decimal.Decimal("0.01")
+
+MONEY_FIELD: DecimalField = DecimalField(max_digits=15, decimal_places=2)
+
+SIGNED_AMOUNT: Case = Case(
+    When(kind__in=[LedgerEntryKind.withdraw, LedgerEntryKind.transfer_out], then=-F("amount")),
+    default=F("amount"),
+    output_field=MONEY_FIELD,
+)
+
+
+def get_period_end(period: CheckpointPeriod, day: datetime.date) -> datetime.datetime:
+    """End of the period holding ``day``, the local midnight that starts the next one."""
+    if period == CheckpointPeriod.month:
+        next_start: datetime.date = (day.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+    else:
+        next_start: datetime.date = day + datetime.timedelta(days=1)
+
+    return timezone.make_aware(datetime.datetime.combine(next_start, datetime.time.min))
+
+
+def get_last_period_end(period: CheckpointPeriod, now: datetime.datetime | None = None) -> datetime.datetime:
+    """End of the most recent period that is already over."""
+    today: datetime.date = timezone.localdate(now)
+
+    if period == CheckpointPeriod.month:
+        return get_period_end(period, today.replace(day=1) - datetime.timedelta(days=1))
+
+    return get_period_end(period, today - datetime.timedelta(days=1))
+
+
+def sum_entries(entries: QuerySet[LedgerEntry]) -> Coalesce:
+    return Coalesce(
+        Subquery(entries.values("account").annotate(total=Sum(SIGNED_AMOUNT)).values("total")),
+        Value(decimal.Decimal(0)),
+        output_field=MONEY_FIELD,
+    )
+
+
+def with_balance_as_of(accounts: AccountQuerySet, at: datetime.datetime) -> AccountQuerySet:
+    """Annotate ``balance_as_of`` and ``last_entry_id_as_of`` for the moment ``at``.
+
+    Accounts with a checkpoint at or before ``at`` replay the entries
+    recorded after it, a bounded range of the ledger index. Accounts without
+    one subtract the entries recorded after ``at`` from the current balance.
+    Everything is resolved in the same statement, so the balance and the
+    entries it is corrected with come from one snapshot.
+
+    An opening balance has no ledger entry, so accounts opened after ``at``
+    are left out instead of reporting that balance for a time they did not
+    exist yet.
+    """
+    checkpoints: QuerySet[BalanceCheckpoint] = BalanceCheckpoint.objects.filter(
+        account=OuterRef("pk"),
+        period_end__lte=at,
+    ).order_by("-period_end")
+    entries: QuerySet[LedgerEntry] = LedgerEntry.objects.filter(account=OuterRef("pk"))
+
+    return accounts.filter(
+        Q(created_at__isnull=True) | Q(created_at__lte=at),
+    ).annotate(
+        checkpoint_balance=Subquery(checkpoints.values("balance")[:1]),
+        checkpoint_entry_id=Subquery(checkpoints.values("last_entry_id")[:1]),
+    ).annotate(
+        balance_as_of=Case(
+            When(
+                checkpoint_balance__isnull=True,
+                then=F("balance") - sum_entries(entries.filter(created_at__gt=at)),
+            ),
+            default=F("checkpoint_balance") + sum_entries(entries.filter(
+                id__gt=Coalesce(OuterRef("checkpoint_entry_id"), 0),
+                created_at__lte=at,
+            )),
+            output_field=MONEY_FIELD,
+        ),
+        last_entry_id_as_of=Subquery(
+            entries.filter(created_at__lte=at).order_by("-id").values("id")[:1],
+        ),
+    )
+
+
+def get_balances_as_of(numbers: Iterable[int], at: datetime.datetime) -> Dict[int, decimal.Decimal]:
+    """Balances of the given accounts at ``at``, keyed by number.
+
+    Unknown numbers and accounts opened after ``at`` are left out.
+    """
+    return {
+        number: balance.quantize(CENT)
+        for number, balance in with_balance_as_of(Account.objects.filter(number__in=list(numbers)), at).values_list(
+            "number", "balance_as_of",
+        )
+    }
+
+
+class CheckpointWriter():
+    """Record the balance of every account at the end of a period.
+
+    Accounts are walked in primary key chunks and each chunk's checkpoints
+    are inserted with one bulk insert. Accounts already checkpointed for the
+    period, or opened after it ended, are skipped, so an interrupted or
+    repeated run only fills the gaps.
+    """
+
+    def __init__(self, chunk_size: int = 2000) -> None:
+        self.chunk_size: int = chunk_size
+
+    def write(self, period_end: datetime.datetime) -> int:
+        accounts: AccountQuerySet = with_balance_as_of(
+            Account.objects.filter(
+                ~Exists(BalanceCheckpoint.objects.filter(account=OuterRef("pk"), period_end=period_end)),
+            ),
+            period_end,
+        ).order_by("pk")
+
+        written: int = 0
+        last_pk = None
+
+        while True:
+            chunk: AccountQuerySet = accounts if last_pk is None else accounts.filter(pk__gt=last_pk)
+
+            with transaction.atomic():
+                rows: List[tuple] = list(
+                    chunk.values_list("pk", "balance_as_of", "last_entry_id_as_of")[:self.chunk_size]
+                )
+
+                BalanceCheckpoint.objects.bulk_create(
+                    [
+                        BalanceCheckpoint(
+                            account_id=pk,
+                            period_end=period_end,
+                            balance=balance,
+                            last_entry_id=last_entry_id,
+                        )
+                        for pk, balance, last_entry_id in rows
+                    ],
+                    ignore_conflicts=True,
+                )
+
+            written += len(rows)
+
+            if len(rows) < self.chunk_size:
+                return written
+
+            last_pk = rows[-1][0]
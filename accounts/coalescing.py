@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import threading
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+
+from accounts import metrics
+from accounts.cache import account_cache
+from accounts.exceptions import NegativeTransaction
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+
+
+@dataclasses.dataclass
+class CoalescedDeposit():
+    """A caller's deposit, acknowledged once the combined write it joined commits."""
+
+    number: int
+    amount: decimal.Decimal
+    balance: decimal.Decimal | None = None
+    batch_size: int = 0
+    error: Exception | None = None
+    done: threading.Event = dataclasses.field(default_factory=threading.Event, repr=False)
+
+
+@dataclasses.dataclass
+class PendingDeposits():
+    deposits: List[CoalescedDeposit] = dataclasses.field(default_factory=list)
+    full: threading.Event = dataclasses.field(default_factory=threading.Event)
+
+
+class DepositCoalescer():
+    """Combine concurrent deposits to the same account into a single write.
+
+    The first deposit to an account opens a batch and waits up to ``window``
+    seconds, or until ``max_batch`` deposits joined, then applies the whole
+    batch in one transaction: one locking read, one UPDATE per changed table
+    and one ledger insert. Points are accrued per deposit, exactly as when
+    depositing one at a time. Every caller blocks until the batch commits
+    and gets its own acknowledgement, or the batch's error.
+
+    Coalescing only happens across threads of one process, and never inside
+    a transaction, since acknowledging others before the caller's
+    transaction commits could report deposits that are later rolled back.
+    """
+
+    deposit_cutoff_amount: decimal.Decimal = decimal.Decimal(100.00)
+
+    def __init__(self, window: float = 0.005, max_batch: int = 100) -> None:
+        self.window: float = window
+        self.max_batch: int = max_batch
+
+        self.pending: Dict[int, PendingDeposits] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> DepositCoalescer:
+        options: Dict[str, Any] = getattr(settings, "ACCOUNTS_DEPOSIT_COALESCING", {})
+
+        return cls(
+            window=options.get("WINDOW_MS", 5) / 1000,
+            max_batch=options.get("MAX_BATCH", 100),
+        )
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return getattr(settings, "ACCOUNTS_DEPOSIT_COALESCING", {}).get("ENABLED", False)
+
+    def deposit(self, number: int, amount: decimal.Decimal) -> CoalescedDeposit:
+        if type(amount) is not decimal.Decimal:
+            amount: decimal.Decimal = decimal.Decimal(amount)
+
+        if amount < decimal.Decimal(0.0):
+            raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
+
+        deposit: CoalescedDeposit = CoalescedDeposit(number, amount)
+
+        if transaction.get_connection().in_atomic_block:
+            self.flush(number, [deposit])
+        else:
+            with self.lock:
+                pending: PendingDeposits | None = self.pending.get(number)
+                is_leader: bool = pending is None
+
+                if is_leader:
+                    pending = self.pending[number] = PendingDeposits()
+
+                pending.deposits.append(deposit)
+
+                if len(pending.deposits) >= self.max_batch:
+                    pending.full.set()
+
+            if is_leader:
+                pending.full.wait(self.window)
+
+                with self.lock:
+                    del self.pending[number]
+
+                self.flush(number, pending.deposits)
+            else:
+                deposit.done.wait()
+
+        if deposit.error is not None:
+            raise deposit.error
+
+        return deposit
+
+    def flush(self, number: int, deposits: List[CoalescedDeposit]) -> None:
+        try:
+            with transaction.atomic():
+                account: Account = Account.objects.get_by_number(number)
+                Account.lock_accounts(account)
+
+                entries: List[LedgerEntry] = []
+
+                for deposit in deposits:
+                    account.balance: decimal.Decimal = account.balance + deposit.amount
+
+                    if isinstance(account, BonusAccount):
+                        account.points: int = account.points + account.calculate_points(
+                            deposit.amount,
+                            self.deposit_cutoff_amount,
+                        )
+
+                    entries.append(account.build_entry(LedgerEntryKind.deposit, deposit.amount))
+                    deposit.balance = account.balance
+                    deposit.batch_size = len(deposits)
+
+                account.save()
+                LedgerEntry.objects.bulk_create(entries)
+
+                metrics.count_entries(entries)
+                account_cache.invalidate(number)
+        except Exception as err:
+            for deposit in deposits:
+                deposit.error = err
+        finally:
+            for deposit in deposits:
+                deposit.done.set()
+
+
+deposit_coalescer: DepositCoalescer = DepositCoalescer.from_settings()
@@ -1,7 +1,21 @@
 from django.core.exceptions import ValidationError
 
+
 class InsufficientBalance(ValidationError):
     ...
 
+
 class NegativeTransaction(ValidationError):
-    ...
\ No newline at end of file
+    ...
+
+
+class AccountNotFound(ValidationError):
+    ...
+
+
+class AccountNumberUnavailable(ValidationError):
+    ...
+
+
+class DuplicateYieldRun(ValidationError):
+    ...
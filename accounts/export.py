@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import csv
+import decimal
+import json
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from accounts.models import Account
+from accounts.models import AccountQuerySet
+from accounts.models import AccountType
+
+
+EXPORT_FIELDS: List[str] = ["id", "number", "type", "balance", "points"]
+
+EXPORT_CHUNK_SIZE: int = 2000
+
+
+def export_accounts(
+    account_type: AccountType | None = None,
+    min_balance: decimal.Decimal | None = None,
+    max_balance: decimal.Decimal | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield every matching account as a plain row, ordered by number.
+
+    Rows come from ``values()`` over a chunked iterator, server-side cursors
+    where the backend supports them, so memory stays flat whatever the
+    number of accounts.
+    """
+    accounts: AccountQuerySet = Account.objects.with_type()
+
+    if account_type is not None:
+        accounts = accounts.of_type(account_type)
+
+    if min_balance is not None:
+        accounts = accounts.filter(balance__gte=min_balance)
+
+    if max_balance is not None:
+        accounts = accounts.filter(balance__lte=max_balance)
+
+    rows: Iterator[Dict[str, Any]] = accounts.order_by("number").values(
+        "id", "number", "account_type", "balance", "bonusaccount__points",
+    ).iterator(chunk_size=chunk_size)
+
+    for row in rows:
+        yield {
+            "id": row["id"],
+            "number": row["number"],
+            "type": row["account_type"],
+            "balance": row["balance"],
+            "points": row["bonusaccount__points"],
+        }
+
+
+class LineBuffer():
+    """File-like target that hands back what ``csv.writer`` writes instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], fields: List[str] = EXPORT_FIELDS) -> Iterator[str]:
+    writer = csv.DictWriter(LineBuffer(), fieldnames=fields)
+
+    yield writer.writeheader()
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS: Dict[str, tuple[Callable[[Iterable[Dict[str, Any]]], Iterator[str]], str]] = {
+    "csv": (iter_csv, "text/csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
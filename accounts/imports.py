@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import csv
+import dataclasses
+import itertools
+import json
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from django.core.exceptions import ValidationError
+from django.db.utils import IntegrityError
+
+from accounts.bulk import bulk_create_accounts
+from accounts.exceptions import AccountNumberUnavailable
+from accounts.models import Account
+from accounts.models import AccountType
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+from accounts.numbers import account_number_allocator
+
+
+IMPORT_MODELS: Dict[str, type[Account]] = {
+    AccountType.simple.value: Account,
+    AccountType.bonus.value: BonusAccount,
+    AccountType.savings.value: SavingsAccount,
+}
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    yield from csv.DictReader(lines)
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield {"__error__": "Malformed JSON line."}
+
+
+IMPORT_FORMATS: Dict[str, Any] = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+@dataclasses.dataclass
+class ImportRowError():
+    row: int
+    error: str
+
+
+@dataclasses.dataclass
+class ImportReport():
+    created: int = 0
+    duplicates: List[int] = dataclasses.field(default_factory=list)
+    errors: List[ImportRowError] = dataclasses.field(default_factory=list)
+
+
+class AccountImporter():
+    """Create accounts of every type from a stream of rows, one batch at a time.
+
+    Each batch is validated in memory, checked for existing numbers with one
+    query and inserted with one batched insert per table. Rows with a number
+    that already exists, in the database or earlier in the stream, are
+    reported as duplicates and skipped instead of aborting the load, and
+    rows with a number the allocator may hand out are reported as errors.
+    """
+
+    def __init__(self, batch_size: int = 1000) -> None:
+        self.batch_size: int = batch_size
+        self.report: ImportReport = ImportReport()
+
+    def build_account(self, row: Dict[str, Any]) -> Account:
+        if "__error__" in row:
+            raise ValidationError(row["__error__"])
+
+        account_type: str = row.get("type") or AccountType.simple.value
+
+        if account_type not in IMPORT_MODELS:
+            raise ValidationError(f"Unknown account type {account_type!r}.")
+
+        model: type[Account] = IMPORT_MODELS[account_type]
+        values: Dict[str, Any] = {}
+
+        for field_name in ["number", "balance", "points"]:
+            value: Any = row.get(field_name)
+
+            if value in (None, ""):
+                continue
+
+            if not hasattr(model, field_name):
+                raise ValidationError(f"{model.__name__} does not have {field_name}.")
+
+            values[field_name] = model._meta.get_field(field_name).clean(value, None)
+
+        if "number" not in values:
+            raise ValidationError("Account number is required.")
+
+        account: Account = model(**values)
+
+        if account.balance < account.minimum_balance_value:
+            raise ValidationError(f"Balance below the minimum of {account.minimum_balance_value} for {account.verbose_type}.")
+
+        return account
+
+    def reject_reserved_number(self, index: int, number: int) -> None:
+        self.report.errors.append(ImportRowError(
+            index,
+            f"Account number {number} is reserved for server-assigned numbers.",
+        ))
+
+    def validate(self, rows: List[tuple[int, Dict[str, Any]]]) -> Dict[int, tuple[int, Account]]:
+        """The new accounts to insert by number, each with the index of its row."""
+        accounts: Dict[int, tuple[int, Account]] = {}
+        reserved_numbers: range = account_number_allocator.get_reserved_range()
+
+        for index, row in rows:
+            try:
+                account: Account = self.build_account(row)
+            except ValidationError as err:
+                self.report.errors.append(ImportRowError(index, "; ".join(err.messages)))
+                continue
+
+            if account.number in reserved_numbers:
+                self.reject_reserved_number(index, account.number)
+                continue
+
+            if account.number in accounts:
+                self.report.duplicates.append(account.number)
+                continue
+
+            accounts[account.number] = (index, account)
+
+        existing_numbers: set[int] = set(
+            Account.objects.filter(number__in=list(accounts)).values_list("number", flat=True)
+        )
+
+        self.report.duplicates.extend(sorted(existing_numbers))
+
+        return {number: row for number, row in accounts.items() if number not in existing_numbers}
+
+    def insert(self, rows: List[tuple[int, Dict[str, Any]]]) -> None:
+        accounts: Dict[int, tuple[int, Account]] = self.validate(rows)
+
+        while accounts:
+            try:
+                bulk_create_accounts([account for _, account in accounts.values()], batch_size=self.batch_size)
+                break
+            except IntegrityError:
+                # Another writer inserted some of these numbers since they were checked.
+                taken: set[int] = set(
+                    Account.objects.filter(number__in=list(accounts)).values_list("number", flat=True)
+                )
+
+                if not taken:
+                    raise
+
+                self.report.duplicates.extend(sorted(taken))
+            except AccountNumberUnavailable:
+                # A block reserved since the check now covers some of these numbers.
+                reserved_numbers: range = account_number_allocator.get_reserved_range()
+                taken: set[int] = {number for number in accounts if number in reserved_numbers}
+
+                if not taken:
+                    raise
+
+                for number in sorted(taken):
+                    self.reject_reserved_number(accounts[number][0], number)
+
+            accounts = {number: row for number, row in accounts.items() if number not in taken}
+
+        self.report.created += len(accounts)
+
+    def run(self, rows: Iterable[Dict[str, Any]]) -> ImportReport:
+        numbered_rows: Iterator[tuple[int, Dict[str, Any]]] = enumerate(rows, start=1)
+
+        while batch := list(itertools.islice(numbered_rows, self.batch_size)):
+            self.insert(batch)
+
+        return self.report
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import subprocess
+import sys
+import time
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from accounts.exceptions import DuplicateYieldRun
+from accounts.models import YieldRun
+from accounts.models import YieldRunStatus
+from accounts.yields import ParallelYieldEngine
+from accounts.yields import YieldEngine
+
+
+def get_current_period() -> str:
+    """The default run reference, one yield run per calendar month."""
+    return timezone.localdate().strftime("%Y-%m")
+
+
+def submit_yield_run(tax: decimal.Decimal, reference: str | None = None) -> YieldRun:
+    """Queue a yield run for ``reference``, the current period by default.
+
+    A reference that already has a run is rejected, unless that run failed,
+    in which case it is queued again and resumes after its last committed chunk.
+    Part of a failed run may already be applied, so it is only queued again
+    with the tax it was submitted with.
+    """
+    reference: str = reference or get_current_period()
+
+    try:
+        with transaction.atomic():
+            yield_run: YieldRun = YieldRun.objects.create(reference=reference, tax=tax)
+    except IntegrityError:
+        failed: QuerySet[YieldRun] = YieldRun.objects.filter(reference=reference, status=YieldRunStatus.failed)
+        requeued: int = failed.filter(tax=tax).update(
+            status=YieldRunStatus.pending,
+            error="",
+            updated_at=timezone.now(),
+        )
+
+        if not requeued:
+            failed_tax: decimal.Decimal | None = failed.values_list("tax", flat=True).first()
+
+            if failed_tax is not None:
+                raise DuplicateYieldRun(
+                    f"The failed yield run for {reference} used a tax of {failed_tax}% and can only be resumed with it"
+                )
+
+            raise DuplicateYieldRun(f"A yield run for {reference} was already submitted")
+
+        yield_run: YieldRun = YieldRun.objects.get(reference=reference)
+
+    if YieldWorker.spawns_on_submit():
+        transaction.on_commit(YieldWorker.spawn)
+
+    return yield_run
+
+
+class YieldWorker():
+    """Run queued yield runs, using the ``YieldRun`` table as the queue.
+
+    A run is claimed with a conditional UPDATE, so any number of workers can
+    poll the same database without a broker. A run left ``running`` by a
+    worker that died is claimed again once it has not progressed for
+    ``lease`` seconds, and resumes after its last committed chunk.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        poll_interval: float = 1.0,
+        lease: float = 300.0,
+        processes: int = 1,
+    ) -> None:
+        self.chunk_size: int | None = chunk_size
+        self.processes: int = processes
+        self.poll_interval: float = poll_interval
+        self.lease: float = lease
+
+    @classmethod
+    def from_settings(cls, **kwargs: Any) -> YieldWorker:
+        options: Dict[str, Any] = getattr(settings, "ACCOUNTS_YIELD_JOBS", {})
+
+        return cls(
+            poll_interval=options.get("POLL_INTERVAL_S", 1.0),
+            lease=options.get("LEASE_S", 300.0),
+            processes=options.get("PROCESSES", 1),
+            **kwargs,
+        )
+
+    @staticmethod
+    def spawns_on_submit() -> bool:
+        """Whether submissions start a worker, never for in-memory databases other processes cannot open."""
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            return False
+
+        return getattr(settings, "ACCOUNTS_YIELD_JOBS", {}).get("SPAWN_WORKER", True)
+
+    @staticmethod
+    def spawn() -> subprocess.Popen:
+        """Start a detached worker process that exits once the queue is empty."""
+        return subprocess.Popen(
+            [sys.executable, "-m", "django", "run_yield_worker", "--until-empty"],
+            cwd=settings.BASE_DIR,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def claim(self, references: List[str] | None = None) -> YieldRun | None:
+        stale_before: datetime.datetime = timezone.now() - datetime.timedelta(seconds=self.lease)
+        candidates = YieldRun.objects.filter(
+            Q(status=YieldRunStatus.pending)
+            | Q(status=YieldRunStatus.running, updated_at__lt=stale_before)
+        ).order_by("created_at")
+
+        if references is not None:
+            candidates = candidates.filter(reference__in=references)
+
+        for yield_run in candidates[:10]:
+            claimed: int = YieldRun.objects.filter(
+                pk=yield_run.pk,
+                status=yield_run.status,
+                updated_at=yield_run.updated_at,
+            ).update(status=YieldRunStatus.running, updated_at=timezone.now())
+
+            if claimed:
+                return YieldRun.objects.get(pk=yield_run.pk)
+
+        return None
+
+    def run_job(self, yield_run: YieldRun) -> YieldRun:
+        try:
+            if self.processes > 1:
+                return ParallelYieldEngine(
+                    yield_run,
+                    self.processes,
+                    self.chunk_size,
+                    heartbeat_interval=self.lease / 3,
+                ).run()
+
+            return YieldEngine(yield_run, self.chunk_size).run()
+        except Exception as err:
+            YieldRun.objects.filter(pk=yield_run.pk).update(
+                status=YieldRunStatus.failed,
+                error=f"{type(err).__name__}: {err}",
+                updated_at=timezone.now(),
+            )
+
+            yield_run.refresh_from_db()
+
+            return yield_run
+
+    def run_pending(self, references: List[str] | None = None) -> int:
+        """Run queued runs until none is left, or only those of ``references``, returning how many were run."""
+        processed: int = 0
+
+        while (yield_run := self.claim(references)) is not None:
+            self.run_job(yield_run)
+            processed += 1
+
+        return processed
+
+    def run_forever(self) -> None:
+        while True:
+            if not self.run_pending():
+                time.sleep(self.poll_interval)
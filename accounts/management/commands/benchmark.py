@@ -0,0 +1,73 @@
+import json
+
+from typing import Any
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.suite import SCALES
+from accounts.benchmarks.suite import BenchmarkSuite
+from accounts.benchmarks.suite import compare_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed accounts at the given scale and report latency percentiles, throughput and "
+        "query counts for the account model paths and REST endpoints. Yield scenarios "
+        "credit every savings account, so they only run on a database without accounts "
+        "unless --force is given."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--scale", choices=SCALES.keys(), default="1k")
+        parser.add_argument("--accounts", type=int, help="Number of accounts, overrides --scale.")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--scenario", action="append", dest="scenarios", help="Run only this scenario, repeatable.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="benchmark.json", help="JSON file to write the results to.")
+        parser.add_argument("--compare", help="Previous results JSON file to compare against.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded accounts.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the yield scenarios even though they also credit existing savings accounts.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        suite: BenchmarkSuite = BenchmarkSuite(
+            size=options["accounts"] or SCALES[options["scale"]],
+            iterations=options["iterations"],
+            seed=options["seed"],
+            keep=options["keep"],
+            force=options["force"],
+        )
+
+        try:
+            report: Dict[str, Any] = suite.run(options["scenarios"])
+        except RuntimeError as err:
+            raise CommandError(str(err))
+
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as baseline_file:
+                    report["comparison"] = compare_results(report, json.load(baseline_file))
+            except OSError as err:
+                raise CommandError(f"Unable to read {options['compare']}: {err}")
+
+        with open(options["output"], "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+        self.stdout.write(f"{'scenario':<40}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}{'queries':>10}")
+
+        for name, metrics in report["results"].items():
+            self.stdout.write(
+                f"{name:<40}{metrics['p50_ms']:>10.2f}{metrics['p95_ms']:>10.2f}{metrics['p99_ms']:>10.2f}"
+                f"{metrics['throughput_ops_s']:>12.1f}{metrics['queries_per_op']:>10.1f}"
+            )
+
+        for name, ratios in report.get("comparison", {}).items():
+            self.stdout.write(f"{name:<40}" + "  ".join(f"{metric} x{ratio:.2f}" for metric, ratio in ratios.items()))
+
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
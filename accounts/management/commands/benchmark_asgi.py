@@ -0,0 +1,32 @@
+from typing import Any
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.asgi import ASGIBenchmarkResult
+from accounts.benchmarks.asgi import run_asgi_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent-request throughput of the sync and async REST read endpoints under ASGI."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--accounts", type=int, default=300)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        results: List[ASGIBenchmarkResult] = run_asgi_benchmark(
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            accounts=options["accounts"],
+        )
+
+        self.stdout.write(f"{'endpoint':<20}{'requests':>10}{'errors':>8}{'elapsed s':>12}{'req/s':>10}")
+
+        for result in results:
+            self.stdout.write(
+                f"{result.endpoint:<20}{result.requests:>10}{result.errors:>8}"
+                f"{result.elapsed:>12.3f}{result.requests_per_second:>10.1f}"
+            )
@@ -0,0 +1,44 @@
+from typing import Any
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.databases import run_database_profile_benchmark
+from accounts.benchmarks.transfers import OPERATIONS
+from sysbanking.database import DATABASE_PROFILES
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent transfer and deposit throughput across database profiles."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="profiles",
+            choices=DATABASE_PROFILES.keys(),
+            help="Profile to benchmark, repeatable. Defaults to sqlite and sqlite-tuned.",
+        )
+        parser.add_argument("--operation", action="append", dest="operations", choices=OPERATIONS)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--transfers", type=int, default=200, help="Operations per thread.")
+        parser.add_argument("--accounts", type=int, default=100)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        results: Dict[str, Dict[str, Dict[str, Any]]] = run_database_profile_benchmark(
+            profiles=options["profiles"] or ["sqlite", "sqlite-tuned"],
+            operations=options["operations"] or OPERATIONS,
+            threads=options["threads"],
+            transfers_per_thread=options["transfers"],
+            accounts=options["accounts"],
+        )
+
+        self.stdout.write(f"{'profile':<16}{'operation':<12}{'completed':>10}{'failed':>8}{'elapsed s':>12}{'ops/s':>10}")
+
+        for profile, operations in results.items():
+            for operation, result in operations.items():
+                self.stdout.write(
+                    f"{profile:<16}{operation:<12}{result['completed']:>10}{result['failed']:>8}"
+                    f"{result['elapsed']:>12.3f}{result['transfers_per_second']:>10.1f}"
+                )
@@ -0,0 +1,35 @@
+from typing import Any
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.layouts import LayoutBenchmark
+from accounts.benchmarks.suite import ScenarioResult
+
+
+class Command(BaseCommand):
+    help = "Compare lookups and writes between the multi-table and the single-table account layouts."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--accounts", type=int, default=10_000)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        results: Dict[str, Dict[str, ScenarioResult]] = LayoutBenchmark(
+            size=options["accounts"],
+            iterations=options["iterations"],
+            seed=options["seed"],
+        ).run()
+
+        self.stdout.write(f"{'layout':<16}{'scenario':<20}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>12}{'queries':>10}")
+
+        for layout, scenarios in results.items():
+            for name, result in scenarios.items():
+                metrics: Dict[str, float] = result.as_dict()
+
+                self.stdout.write(
+                    f"{layout:<16}{name:<20}{metrics['p50_ms']:>10.2f}{metrics['p95_ms']:>10.2f}"
+                    f"{metrics['throughput_ops_s']:>12.1f}{metrics['queries_per_op']:>10.1f}"
+                )
@@ -0,0 +1,30 @@
+from typing import Any
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.serialization import SerializationResult
+from accounts.benchmarks.serialization import run_serialization_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare ModelSerializer and values() row serialization of the account list and detail payloads."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--accounts", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        results: List[SerializationResult] = run_serialization_benchmark(
+            accounts=options["accounts"],
+            seed=options["seed"],
+        )
+
+        self.stdout.write(f"{'payload':<10}{'path':<20}{'rows':>10}{'elapsed s':>12}{'rows/s':>12}")
+
+        for result in results:
+            self.stdout.write(
+                f"{result.payload:<10}{result.path:<20}{result.rows:>10}"
+                f"{result.elapsed:>12.3f}{result.rows_per_second:>12.0f}"
+            )
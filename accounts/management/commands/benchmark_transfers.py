@@ -0,0 +1,58 @@
+import decimal
+import json
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.transfers import OPERATIONS
+from accounts.benchmarks.transfers import TransferBenchmarkResult
+from accounts.benchmarks.transfers import run_transfer_benchmark
+
+
+class Command(BaseCommand):
+    help = "Run concurrent transfers between seeded accounts and report throughput and balance conservation."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--accounts", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--transfers", type=int, default=200, help="Transfers per thread.")
+        parser.add_argument("--amount", type=decimal.Decimal, default=decimal.Decimal("1.00"))
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded accounts.")
+        parser.add_argument("--operation", choices=OPERATIONS, default="transfer")
+        parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result: TransferBenchmarkResult = run_transfer_benchmark(
+            accounts=options["accounts"],
+            threads=options["threads"],
+            transfers_per_thread=options["transfers"],
+            amount=options["amount"],
+            keep=options["keep"],
+            operation=options["operation"],
+        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result.as_dict()))
+
+            if not result.conserved:
+                raise CommandError("Balances were not conserved.")
+
+            return
+
+        self.stdout.write(f"Threads:             {result.threads}")
+        self.stdout.write(f"Transfers attempted: {result.attempted}")
+        self.stdout.write(f"Transfers completed: {result.completed}")
+        self.stdout.write(f"Transfers rejected:  {result.rejected}")
+        self.stdout.write(f"Transfers failed:    {result.failed}")
+        self.stdout.write(f"Elapsed:             {result.elapsed:.3f}s")
+        self.stdout.write(f"Throughput:          {result.transfers_per_second:.1f} transfers/s")
+        self.stdout.write(f"Balance before:      {result.initial_total}")
+        self.stdout.write(f"Balance after:       {result.final_total}")
+
+        if not result.conserved:
+            raise CommandError("Balances were not conserved.")
+
+        self.stdout.write(self.style.SUCCESS("Balances conserved."))
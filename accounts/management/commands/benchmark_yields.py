@@ -0,0 +1,48 @@
+import decimal
+
+from typing import Any
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.benchmarks.yields import YieldScalingBenchmark
+from accounts.benchmarks.yields import YieldScalingResult
+
+
+class Command(BaseCommand):
+    help = "Compare the sequential yield run with parallel runs over a range of worker counts."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--accounts", type=int, default=100_000)
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+        parser.add_argument("--tax", type=decimal.Decimal, default=decimal.Decimal("0.73"))
+        parser.add_argument("--chunk-size", type=int)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        benchmark: YieldScalingBenchmark = YieldScalingBenchmark(
+            accounts=options["accounts"],
+            workers=options["workers"],
+            tax=options["tax"],
+            chunk_size=options["chunk_size"],
+        )
+
+        try:
+            results: List[YieldScalingResult] = benchmark.run()
+        except RuntimeError as err:
+            raise CommandError(err)
+
+        baseline: float = results[0].elapsed
+
+        self.stdout.write(f"{'workers':<12}{'accounts':>10}{'elapsed s':>12}{'accounts/s':>12}{'speedup':>9}  total yield")
+
+        for result in results:
+            self.stdout.write(
+                f"{result.workers or 'sequential':<12}{result.accounts:>10}{result.elapsed:>12.3f}"
+                f"{result.accounts_per_second:>12.0f}{baseline / result.elapsed:>9.2f}  {result.total_yield}"
+                f"{'' if result.matches_sequential else '  MISMATCH'}"
+            )
+
+        if not all(result.matches_sequential for result in results):
+            raise CommandError("Parallel yield runs do not match the sequential run")
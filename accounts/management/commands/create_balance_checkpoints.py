@@ -0,0 +1,38 @@
+import datetime
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.checkpoints import CheckpointPeriod
+from accounts.checkpoints import CheckpointWriter
+from accounts.checkpoints import get_last_period_end
+from accounts.checkpoints import get_period_end
+
+
+class Command(BaseCommand):
+    help = (
+        "Record every account's balance at the end of a period. "
+        "Schedule it shortly after each period ends, e.g. daily after midnight."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--period", choices=[period.value for period in CheckpointPeriod], default=CheckpointPeriod.day.value)
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            help="Any day of the period to checkpoint, defaults to the last completed period.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        period: CheckpointPeriod = CheckpointPeriod(options["period"])
+
+        period_end: datetime.datetime = (
+            get_period_end(period, options["date"]) if options["date"] else get_last_period_end(period)
+        )
+
+        written: int = CheckpointWriter(chunk_size=options["chunk_size"]).write(period_end)
+
+        self.stdout.write(f"Wrote {written} checkpoints for the {period.value} ending {period_end.isoformat()}.")
@@ -0,0 +1,45 @@
+import decimal
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.export import EXPORT_FORMATS
+from accounts.export import export_accounts
+from accounts.models import AccountType
+
+
+class Command(BaseCommand):
+    help = "Stream every account, optionally filtered by type and balance range, as CSV or NDJSON."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--format", choices=EXPORT_FORMATS.keys(), default="csv", dest="export_format")
+        parser.add_argument(
+            "--type",
+            choices=[account_type.value for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]],
+            dest="account_type",
+        )
+        parser.add_argument("--min-balance", type=decimal.Decimal)
+        parser.add_argument("--max-balance", type=decimal.Decimal)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--output", help="File to write to, defaults to stdout.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        render, _ = EXPORT_FORMATS[options["export_format"]]
+
+        rows = export_accounts(
+            account_type=AccountType(options["account_type"]) if options["account_type"] else None,
+            min_balance=options["min_balance"],
+            max_balance=options["max_balance"],
+            chunk_size=options["chunk_size"],
+        )
+
+        if not options["output"]:
+            for line in render(rows):
+                self.stdout.write(line, ending="")
+
+            return
+
+        with open(options["output"], "w", newline="") as output:
+            output.writelines(render(rows))
@@ -0,0 +1,45 @@
+import decimal
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.exceptions import DuplicateYieldRun
+from accounts.models import SavingsAccount
+from accounts.models import YieldRun
+
+
+class Command(BaseCommand):
+    help = "Generate yields for every savings account in chunks, resuming runs by reference."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("tax", type=decimal.Decimal)
+        parser.add_argument(
+            "--reference",
+            help="Run reference, reuse it to resume an interrupted run.",
+        )
+        parser.add_argument("--chunk-size", type=int)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes, each applying the yield to its own primary-key range.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            yield_run: YieldRun = SavingsAccount.generate_yield_for_savings_accounts(
+                options["tax"],
+                reference=options["reference"],
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+            )
+        except DuplicateYieldRun as err:
+            raise CommandError("; ".join(err.messages))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Yield run {yield_run.reference} {yield_run.status}: "
+            f"{yield_run.accounts_processed} accounts, total yield {yield_run.total_yield}."
+        ))
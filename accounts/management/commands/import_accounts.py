@@ -0,0 +1,60 @@
+import pathlib
+import sys
+
+from typing import Any
+from typing import TextIO
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.imports import IMPORT_FORMATS
+from accounts.imports import AccountImporter
+from accounts.imports import ImportReport
+
+
+class Command(BaseCommand):
+    help = (
+        "Create accounts from a CSV or NDJSON file with number, type, balance and points "
+        "columns, in batches. Existing numbers are reported as duplicates and skipped."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to import, - reads from stdin.")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS.keys(),
+            dest="import_format",
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        import_format: str | None = options["import_format"] or pathlib.Path(options["path"]).suffix.lstrip(".")
+
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError("Unable to tell the file format, use --format.")
+
+        try:
+            source: TextIO = sys.stdin if options["path"] == "-" else open(options["path"], newline="")
+        except OSError as err:
+            raise CommandError(f"Unable to read {options['path']}: {err}")
+
+        try:
+            report: ImportReport = AccountImporter(batch_size=options["batch_size"]).run(
+                IMPORT_FORMATS[import_format](source),
+            )
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        for number in report.duplicates:
+            self.stderr.write(f"Duplicate account number {number}.")
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error.row}: {error.error}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created} accounts, skipped {len(report.duplicates)} duplicates "
+            f"and {len(report.errors)} invalid rows."
+        ))
@@ -0,0 +1,35 @@
+from typing import Any
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from accounts.summary import compute_summary
+from accounts.summary import get_drift
+from accounts.summary import read_summary
+from accounts.summary import rebuild_summary
+
+
+class Command(BaseCommand):
+    help = "Check the maintained portfolio summary against the accounts, or rebuild it from scratch."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rebuild", action="store_true", help="Recompute the summary from every account.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["rebuild"]:
+            drift: Dict[str, Dict[str, tuple]] = rebuild_summary()
+        else:
+            drift: Dict[str, Dict[str, tuple]] = get_drift(read_summary(), compute_summary())
+
+        for account_type, fields in drift.items():
+            for field, (maintained, actual) in fields.items():
+                self.stdout.write(f"{account_type} {field}: summary {maintained}, accounts {actual}")
+
+        if options["rebuild"]:
+            self.stdout.write("Portfolio summary rebuilt.")
+        elif drift:
+            raise CommandError("Portfolio summary drifted from the accounts, run with --rebuild to fix it.")
+        else:
+            self.stdout.write("Portfolio summary matches the accounts.")
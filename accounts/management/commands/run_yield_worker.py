@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from accounts.jobs import YieldWorker
+
+
+class Command(BaseCommand):
+    help = "Run queued yield runs, polling the database for new ones."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--until-empty",
+            action="store_true",
+            help="Exit once no queued run is left instead of polling.",
+        )
+        parser.add_argument("--chunk-size", type=int)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        worker: YieldWorker = YieldWorker.from_settings(chunk_size=options["chunk_size"])
+
+        if not options["until_empty"]:
+            worker.run_forever()
+
+        processed: int = worker.run_pending()
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} yield runs."))
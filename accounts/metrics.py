@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import threading
+
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+
+from accounts.cache import account_cache
+
+if TYPE_CHECKING:
+    from accounts.models import LedgerEntry
+
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+QUERY_COUNT_BUCKETS: List[float] = [0, 1, 2, 5, 10, 20, 50, 100, 200]
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs: List[str] = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric():
+    type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: LabelValues = tuple(labelnames)
+        self.lock: threading.Lock = threading.Lock()
+
+    def get_label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.render_samples(),
+        ]
+
+
+class Counter(Metric):
+    type: str = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = collections.defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key: LabelValues = self.get_label_values(labels)
+
+        with self.lock:
+            self.values[key] += amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self.get_label_values(labels), 0)
+
+    def render_samples(self) -> List[str]:
+        with self.lock:
+            values: List[tuple[LabelValues, float]] = list(self.values.items())
+
+        return [f"{self.name}{format_labels(self.labelnames, key)} {value}" for key, value in values]
+
+
+class Gauge(Metric):
+    """Gauge whose samples are read from a callback when the metrics are scraped."""
+
+    type: str = "gauge"
+
+    def __init__(self, name: str, documentation: str, collect: Callable[[], Dict[LabelValues, float]], labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.collect: Callable[[], Dict[LabelValues, float]] = collect
+
+    def render_samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.labelnames, key)} {value}" for key, value in self.collect().items()]
+
+
+class Histogram(Metric):
+    type: str = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: List[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets: List[float] = sorted(buckets)
+        self.values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key: LabelValues = self.get_label_values(labels)
+        index: int = bisect.bisect_left(self.buckets, value)
+
+        with self.lock:
+            # Per-bucket (not cumulative) counts, then the sum and the total count.
+            series: list = self.values.setdefault(key, [0] * len(self.buckets) + [0, 0.0, 0])
+
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def get_count(self, **labels: str) -> int:
+        series: list | None = self.values.get(self.get_label_values(labels))
+
+        return series[-1] if series else 0
+
+    def get_sum(self, **labels: str) -> float:
+        series: list | None = self.values.get(self.get_label_values(labels))
+
+        return series[-2] if series else 0.0
+
+    def render_samples(self) -> List[str]:
+        with self.lock:
+            values: List[tuple[LabelValues, list]] = [(key, list(series)) for key, series in self.values.items()]
+
+        samples: List[str] = []
+        bucket_labelnames: LabelValues = self.labelnames + ("le",)
+
+        for key, series in values:
+            cumulative: int = 0
+
+            for bound, count in zip(self.buckets + [float("inf")], series):
+                cumulative += count
+                upper_bound: str = "+Inf" if bound == float("inf") else repr(float(bound))
+                samples.append(f"{self.name}_bucket{format_labels(bucket_labelnames, key + (upper_bound,))} {cumulative}")
+
+            samples.append(f"{self.name}_sum{format_labels(self.labelnames, key)} {series[-2]}")
+            samples.append(f"{self.name}_count{format_labels(self.labelnames, key)} {series[-1]}")
+
+        return samples
+
+
+class MetricsRegistry():
+    """In-process metric aggregates rendered in the Prometheus text exposition format.
+
+    Every worker process keeps its own aggregates, updates only take a
+    per-metric lock, and nothing is computed until the metrics are scraped.
+    """
+
+    content_type: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics.values() for line in metric.render()) + "\n"
+
+
+registry: MetricsRegistry = MetricsRegistry()
+
+request_latency: Histogram = registry.register(Histogram(
+    "sysbanking_request_duration_seconds", "Request latency by route.", ["method", "route"],
+))
+requests_total: Counter = registry.register(Counter(
+    "sysbanking_requests_total", "Requests by route and status code.", ["method", "route", "status"],
+))
+request_errors: Counter = registry.register(Counter(
+    "sysbanking_request_errors_total", "Requests answered with a server error or an unhandled exception.", ["method", "route"],
+))
+request_queries: Histogram = registry.register(Histogram(
+    "sysbanking_request_db_queries", "Database queries per request by route.", ["method", "route"], QUERY_COUNT_BUCKETS,
+))
+request_query_time: Counter = registry.register(Counter(
+    "sysbanking_request_db_seconds_total", "Time spent in database queries by route.", ["method", "route"],
+))
+
+ledger_entries: Counter = registry.register(Counter(
+    "sysbanking_ledger_entries_total", "Committed balance changes by ledger entry kind.", ["kind"],
+))
+insufficient_balance_rejections: Counter = registry.register(Counter(
+    "sysbanking_insufficient_balance_rejections_total", "Withdrawals and transfers rejected for insufficient balance.",
+))
+yield_runs: Counter = registry.register(Counter(
+    "sysbanking_yield_runs_total", "Completed yield runs.",
+))
+account_cache_lookups: Gauge = registry.register(Gauge(
+    "sysbanking_account_cache_lookups", "Account detail cache lookups since the process started.",
+    lambda: {(result,): count for result, count in account_cache.stats().items()},
+    ["result"],
+))
+
+
+def count_entries(entries: Iterable[LedgerEntry]) -> None:
+    """Count deposits, withdrawals, transfers and yielded accounts once their entries commit."""
+    counts: collections.Counter = collections.Counter(str(entry.kind) for entry in entries)
+
+    def increment() -> None:
+        for kind, count in counts.items():
+            ledger_entries.inc(count, kind=kind)
+
+    transaction.on_commit(increment)
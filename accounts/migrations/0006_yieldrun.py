@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:42
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_account_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YieldRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Yield Run Identifier')),
+                ('reference', models.CharField(max_length=64, unique=True, verbose_name='Yield Run Reference')),
+                ('tax', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Yield Tax')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed')], default='pending', max_length=16, verbose_name='Yield Run Status')),
+                ('last_account_id', models.UUIDField(blank=True, null=True, verbose_name='Last Processed Account Identifier')),
+                ('accounts_processed', models.PositiveIntegerField(default=0, verbose_name='Accounts Processed')),
+                ('total_yield', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=20, verbose_name='Total Yield')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_yieldrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('deposit', 'Deposit'), ('withdraw', 'Withdraw'), ('transfer_in', 'Transfer In'), ('transfer_out', 'Transfer Out'), ('yield', 'Yields')], max_length=16, verbose_name='Entry Kind')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Entry Amount')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Resulting Balance')),
+                ('correlation_id', models.UUIDField(blank=True, null=True, verbose_name='Correlation Identifier')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('account', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='accounts.account', verbose_name='Account')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['account', '-id'], name='ledger_account_id_idx')],
+            },
+        ),
+    ]
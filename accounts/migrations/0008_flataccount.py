@@ -0,0 +1,48 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:52
+
+import django.core.validators
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_ledgerentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlatAccount',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='Account Identifier')),
+                ('number', models.PositiveIntegerField(unique=True, verbose_name='Account Number')),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=15, validators=[django.core.validators.MinValueValidator(Decimal('-1000'))], verbose_name='Account Balance')),
+                ('type', models.CharField(choices=[('simple', 'simple'), ('bonus', 'bonus'), ('savings', 'savings')], db_index=True, default='simple', max_length=16, verbose_name='Account Type')),
+                ('points', models.PositiveIntegerField(blank=True, null=True, verbose_name='Account Points')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FlatBonusAccount',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('accounts.flataccount',),
+        ),
+        migrations.CreateModel(
+            name='FlatSavingsAccount',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('accounts.flataccount',),
+        ),
+    ]
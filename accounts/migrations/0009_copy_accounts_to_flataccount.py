@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+
+
+def copy_accounts_to_flataccount(apps, schema_editor):
+    """Copy every multi-table account into the single-table layout, keeping its id."""
+    Account = apps.get_model("accounts", "Account")
+    FlatAccount = apps.get_model("accounts", "FlatAccount")
+    using = schema_editor.connection.alias
+
+    rows = Account.objects.using(using).order_by("pk").values_list(
+        "id", "number", "balance", "bonusaccount__points", "savingsaccount__account_ptr",
+    )
+    batch = []
+
+    for id, number, balance, points, savings_id in rows.iterator(chunk_size=BATCH_SIZE):
+        if savings_id is not None:
+            account_type = "savings"
+        elif points is not None:
+            account_type = "bonus"
+        else:
+            account_type = "simple"
+
+        batch.append(FlatAccount(id=id, number=number, balance=balance, type=account_type, points=points))
+
+        if len(batch) >= BATCH_SIZE:
+            FlatAccount.objects.using(using).bulk_create(batch)
+            batch = []
+
+    FlatAccount.objects.using(using).bulk_create(batch)
+
+
+def clear_flataccount(apps, schema_editor):
+    FlatAccount = apps.get_model("accounts", "FlatAccount")
+    FlatAccount.objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_flataccount'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_accounts_to_flataccount, clear_flataccount),
+    ]
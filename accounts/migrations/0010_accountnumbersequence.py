@@ -0,0 +1,20 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_copy_accounts_to_flataccount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountNumberSequence',
+            fields=[
+                ('name', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Sequence Name')),
+                ('next_number', models.PositiveBigIntegerField(verbose_name='Next Unreserved Number')),
+            ],
+        ),
+    ]
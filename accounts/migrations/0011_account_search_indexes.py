@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_accountnumbersequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['balance', 'number'], name='account_balance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('balance__lt', 0)), fields=['number'], name='account_overdrawn_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_account_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_end', models.DateTimeField(verbose_name='Period End')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Balance At Period End')),
+                ('last_entry_id', models.BigIntegerField(blank=True, null=True, verbose_name='Last Ledger Entry Identifier')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('account', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='balance_checkpoints', to='accounts.account', verbose_name='Account')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account', 'period_end'), name='checkpoint_account_period_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:18
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_portfolio_summary(apps, schema_editor):
+    """Seed the summary with the totals of the accounts that already exist."""
+    Account = apps.get_model("accounts", "Account")
+    PortfolioSummary = apps.get_model("accounts", "PortfolioSummary")
+    using = schema_editor.connection.alias
+
+    accounts_by_type = {
+        "simple": Account.objects.using(using).filter(bonusaccount__isnull=True, savingsaccount__isnull=True),
+        "bonus": Account.objects.using(using).filter(bonusaccount__isnull=False),
+        "savings": Account.objects.using(using).filter(savingsaccount__isnull=False),
+    }
+
+    for account_type, accounts in accounts_by_type.items():
+        totals = accounts.aggregate(
+            accounts=Count("pk"),
+            total_balance=Sum("balance"),
+            overdrawn_accounts=Count("pk", filter=Q(balance__lt=0)),
+            total_points=Sum("bonusaccount__points"),
+        )
+
+        PortfolioSummary.objects.using(using).create(
+            account_type=account_type,
+            slot=0,
+            accounts=totals["accounts"],
+            total_balance=totals["total_balance"] or Decimal(0),
+            overdrawn_accounts=totals["overdrawn_accounts"],
+            total_points=totals["total_points"] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_balancecheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account_type', models.CharField(max_length=16, verbose_name='Account Type')),
+                ('slot', models.PositiveSmallIntegerField(verbose_name='Slot')),
+                ('accounts', models.BigIntegerField(default=0, verbose_name='Accounts')),
+                ('total_balance', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=20, verbose_name='Total Balance')),
+                ('overdrawn_accounts', models.BigIntegerField(default=0, verbose_name='Overdrawn Accounts')),
+                ('total_points', models.BigIntegerField(default=0, verbose_name='Total Points')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account_type', 'slot'), name='summary_type_slot_unique')],
+            },
+        ),
+        migrations.RunPython(build_portfolio_summary, migrations.RunPython.noop),
+    ]
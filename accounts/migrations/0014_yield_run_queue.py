@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_portfoliosummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yieldrun',
+            name='error',
+            field=models.TextField(blank=True, default='', verbose_name='Last Error'),
+        ),
+        migrations.AlterField(
+            model_name='yieldrun',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Yield Run Status'),
+        ),
+        migrations.AddIndex(
+            model_name='yieldrun',
+            index=models.Index(fields=['status', 'created_at'], name='yieldrun_queue_idx'),
+        ),
+    ]
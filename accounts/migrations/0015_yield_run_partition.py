@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_yield_run_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YieldRunPartition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(verbose_name='Partition Index')),
+                ('lower_account_id', models.UUIDField(blank=True, null=True, verbose_name='Lower Account Identifier (exclusive)')),
+                ('upper_account_id', models.UUIDField(blank=True, null=True, verbose_name='Upper Account Identifier (inclusive)')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Partition Status')),
+                ('last_account_id', models.UUIDField(blank=True, null=True, verbose_name='Last Processed Account Identifier')),
+                ('accounts_processed', models.PositiveIntegerField(default=0, verbose_name='Accounts Processed')),
+                ('total_yield', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=20, verbose_name='Total Yield')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('yield_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='partitions', to='accounts.yieldrun', verbose_name='Yield Run')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('yield_run', 'index'), name='yieldrunpartition_run_index_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_yield_run_partition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountnumbersequence',
+            name='first_number',
+            field=models.PositiveBigIntegerField(default=1, verbose_name='First Server-Assigned Number'),
+        ),
+    ]
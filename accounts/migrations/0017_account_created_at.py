@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_account_number_sequence_first_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, null=True, verbose_name='Created At'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+def set_account_kinds(apps, schema_editor):
+    """Record the subclass of every bonus and savings account, the rest keep the default."""
+    Account = apps.get_model("accounts", "Account")
+    using = schema_editor.connection.alias
+
+    for kind, model_name in [("bonus", "BonusAccount"), ("savings", "SavingsAccount")]:
+        subclass_ids = apps.get_model("accounts", model_name).objects.using(using).values("account_ptr_id")
+
+        Account.objects.using(using).filter(pk__in=subclass_ids).update(kind=kind)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_account_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='kind',
+            field=models.CharField(choices=[('simple', 'simple'), ('bonus', 'bonus'), ('savings', 'savings')], default='simple', editable=False, max_length=16, verbose_name='Account Type'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['kind', 'number'], name='account_kind_number_idx'),
+        ),
+        migrations.RunPython(set_account_kinds, migrations.RunPython.noop),
+    ]
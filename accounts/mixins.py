@@ -4,7 +4,6 @@ from typing import Any
 from typing import Dict
 
 from django.contrib import messages
-from django.db.models.query import QuerySet
 from django.http import HttpRequest
 from django.http import HttpResponse
 from django.http import HttpResponseRedirect
@@ -31,47 +30,12 @@ class GetAccountMultipleTypesMixin():
     slug_url_kwarg: str
 
     def get_object(self) -> Account | BonusAccount | SavingsAccount:
-        
-        account: QuerySet[BonusAccount] = BonusAccount.objects.filter(
+        return Account.objects.polymorphic().get(
             **{self.slug_field: self.kwargs.get(self.slug_url_kwarg)}
-        )
-
-        if account:
-            return account.get()
-
-        account: QuerySet[SavingsAccount] = SavingsAccount.objects.filter(
-            **{self.slug_field: self.kwargs.get(self.slug_url_kwarg)}
-        )
-
-        if account:
-            return account.get()
-        
-        account: QuerySet[Account] = Account.objects.filter(
-            **{self.slug_field: self.kwargs.get(self.slug_url_kwarg)}
-        )
-        
-        return account.get()
+        ).as_concrete()
     
     def get_account_by_number(self, number: int) -> Account | BonusAccount | SavingsAccount:
-        account: QuerySet[BonusAccount] = BonusAccount.objects.filter(
-            number=number,
-        )
-
-        if account:
-            return account.get()
-
-        account: QuerySet[SavingsAccount] = SavingsAccount.objects.filter(
-            number=number,
-        )
-
-        if account:
-            return account.get()
-        
-        account: QuerySet[Account] = Account.objects.filter(
-            number=number,
-        )
-        
-        return account.get()
+        return Account.objects.get_by_number(number)
 
 
 class TemplateTitleMixin():
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import random
 import uuid
 import decimal
 
 from enum import Enum
+from typing import Any
+from typing import Iterable
 
+from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MinValueValidator
+from django.db.models import F
 
+from accounts import metrics
+from accounts.cache import account_cache
 from accounts.exceptions import InsufficientBalance
 from accounts.exceptions import NegativeTransaction
 
@@ -18,6 +27,72 @@ class AccountType(str, Enum):
     unknown = "unknown"
 
 
+def get_subclass_relations(model: type[models.Model]) -> list[models.ForeignObjectRel]:
+    return [
+        relation for relation in model._meta.related_objects
+        if relation.parent_link
+        and relation.related_model is not model
+        and issubclass(relation.related_model, model)
+    ]
+
+
+class AccountQuerySet(models.QuerySet):
+
+    def polymorphic(self) -> AccountQuerySet:
+        """Join the subclass tables so every row can be downcast without extra queries."""
+        return self.select_related(
+            *[relation.name for relation in get_subclass_relations(self.model)]
+        )
+
+    def get_by_number(self, number: int) -> Account | BonusAccount | SavingsAccount:
+        """Retrieve the account with its concrete type in a single query."""
+        return self.polymorphic().get(number=number).as_concrete()
+
+    def with_type(self) -> AccountQuerySet:
+        """Annotate every row with its account type, resolved by the database."""
+        return self.annotate(
+            account_type=models.Case(
+                models.When(bonusaccount__isnull=False, then=models.Value(AccountType.bonus.value)),
+                models.When(savingsaccount__isnull=False, then=models.Value(AccountType.savings.value)),
+                default=models.Value(AccountType.simple.value),
+                output_field=models.CharField(),
+            )
+        )
+
+    def of_type(self, account_type: AccountType) -> AccountQuerySet:
+        """Filter by account type through the indexed ``kind`` column."""
+        return self.filter(kind=account_type.value)
+
+    def get_removal_changes(self) -> SummaryChanges:
+        """Portfolio summary changes that take the selected accounts out of the totals."""
+        changes: SummaryChanges = SummaryChanges()
+
+        totals = Account.objects.filter(pk__in=self.values("pk")).with_type().values("account_type").annotate(
+            accounts=models.Count("pk"),
+            total_balance=models.Sum("balance"),
+            overdrawn_accounts=models.Count("pk", filter=models.Q(balance__lt=0)),
+            total_points=models.Sum("bonusaccount__points"),
+        )
+
+        for row in totals:
+            changes.add(
+                row["account_type"],
+                accounts=-row["accounts"],
+                total_balance=-row["total_balance"],
+                overdrawn_accounts=-row["overdrawn_accounts"],
+                total_points=-(row["total_points"] or 0),
+            )
+
+        return changes
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        with transaction.atomic(using=self.db):
+            self.get_removal_changes().save()
+            account_cache.invalidate(*self.values_list("number", flat=True))
+
+            return super().delete()
+
+
 class Account(models.Model):
     id = models.UUIDField(
         verbose_name="Account Identifier",
@@ -46,6 +121,34 @@ class Account(models.Model):
         validators=[MinValueValidator(decimal.Decimal(-1000.0))]
     )
 
+    # Null for accounts opened before the column existed, they are taken to have always existed.
+    created_at = models.DateTimeField(
+        verbose_name="Created At",
+        auto_now_add=True,
+        null=True,
+    )
+
+    # Copy of the subclass an account belongs to, so type searches walk an index in number order.
+    kind = models.CharField(
+        verbose_name="Account Type",
+        max_length=16,
+        choices=[
+            (account_type.value, account_type.value)
+            for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]
+        ],
+        default=AccountType.simple.value,
+        editable=False,
+    )
+
+    objects = AccountQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "number"], name="account_kind_number_idx"),
+            models.Index(fields=["balance", "number"], name="account_balance_idx"),
+            models.Index(fields=["number"], condition=models.Q(balance__lt=0), name="account_overdrawn_idx"),
+        ]
+
     @property
     def type(self) -> str:     
         return AccountType.simple
@@ -58,6 +161,133 @@ class Account(models.Model):
     def minimum_balance_value(self) -> decimal.Decimal:
         return decimal.Decimal(-1000.0)
 
+    @classmethod
+    def from_db(cls, db: str, field_names: list[str], values: list) -> Account:
+        instance: Account = super().from_db(db, field_names, values)
+        instance.mark_saved(*field_names)
+
+        return instance
+
+    def mark_saved(self, *field_names: str) -> None:
+        """Remember the persisted value of the given fields for dirty-field saves."""
+        saved_values: dict[str, object] = self.__dict__.setdefault("_saved_values", {})
+
+        for field_name in field_names:
+            field: models.Field = self._meta.get_field(field_name)
+            saved_values[field.attname] = getattr(self, field.attname)
+
+    def get_loaded_fields(self) -> list[str]:
+        deferred_fields: set[str] = self.get_deferred_fields()
+
+        return [
+            field.attname for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname not in deferred_fields
+        ]
+
+    def get_dirty_fields(self) -> list[str] | None:
+        """Names of the fields changed since they were loaded or saved, ``None`` when unknown."""
+        saved_values: dict[str, object] | None = self.__dict__.get("_saved_values")
+
+        if self._state.adding or not saved_values:
+            return None
+
+        concrete_fields: list[models.Field] = [
+            field for field in self._meta.concrete_fields if not field.primary_key
+        ]
+
+        if any(field.attname not in saved_values for field in concrete_fields):
+            return None
+
+        return [
+            field.name for field in concrete_fields
+            if saved_values[field.attname] != getattr(self, field.attname)
+        ]
+
+    def collect_summary_changes(self, changes: SummaryChanges) -> None:
+        """Add how this account moved the portfolio summary since it was loaded or saved."""
+        if self._state.adding:
+            changes.add_account(self)
+            return
+
+        saved_values: dict[str, object] = self.__dict__.get("_saved_values", {})
+        is_bonus: bool = isinstance(self, BonusAccount)
+
+        if "balance" not in saved_values or (is_bonus and "points" not in saved_values):
+            try:
+                balance, points = Account.objects.filter(pk=self.pk).values_list(
+                    "balance", "bonusaccount__points",
+                ).get()
+            except Account.DoesNotExist:
+                changes.add_account(self)
+                return
+
+            saved_values = {"balance": balance, "points": points}
+
+        changes.change_balance(self.type, saved_values["balance"], self.balance)
+
+        if is_bonus:
+            changes.add(self.type, total_points=self.points - saved_values["points"])
+
+    def save(self, *args, **kwargs) -> None:
+        """Write only the changed columns of an already persisted account.
+
+        The portfolio summary is updated in the same transaction, and a new
+        account's number is claimed from the number allocator in it too.
+        """
+        from accounts.numbers import account_number_allocator
+
+        adding: bool = self._state.adding
+
+        if kwargs.get("update_fields") is None and not kwargs.get("force_insert") and not args:
+            kwargs["update_fields"] = self.get_dirty_fields()
+
+        if kwargs.get("update_fields") == []:
+            return
+
+        changes: SummaryChanges = SummaryChanges()
+        self.collect_summary_changes(changes)
+
+        if adding:
+            self.kind = self.type.value
+
+        with transaction.atomic(savepoint=False):
+            if adding:
+                account_number_allocator.claim([self.number], using=kwargs.get("using"))
+
+            super().save(*args, **kwargs)
+            changes.save()
+
+        self.mark_saved(*self.get_loaded_fields())
+
+    def refresh_from_db(self, using: str | None = None, fields: Iterable[str] | None = None, **kwargs: Any) -> None:
+        if fields is not None:
+            fields: list[str] = list(fields)
+
+        super().refresh_from_db(using, fields, **kwargs)
+
+        self.mark_saved(*[
+            field_name for field_name in self.get_loaded_fields()
+            if fields is None or field_name in fields
+        ])
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        with transaction.atomic():
+            Account.objects.filter(pk=self.pk).get_removal_changes().save()
+            account_cache.invalidate(self.number)
+
+            return super().delete(*args, **kwargs)
+
+    def as_concrete(self) -> Account | BonusAccount | SavingsAccount:
+        for relation in get_subclass_relations(type(self)):
+            try:
+                subclass_account: Account = getattr(self, relation.get_accessor_name())
+            except ObjectDoesNotExist:
+                continue
+
+            return subclass_account.as_concrete()
+
+        return self
+
     def deposit(self, amount: decimal.Decimal) -> None:
         if type(amount) is not decimal.Decimal:
             amount: decimal.Decimal = decimal.Decimal(amount)
@@ -65,9 +295,15 @@ class Account(models.Model):
         if amount < decimal.Decimal(0.0):
             raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
 
-        self.balance: decimal.Decimal = self.balance + amount
+        with transaction.atomic():
+            Account.lock_accounts(self)
+
+            self.balance: decimal.Decimal = self.balance + amount
 
-        self.save()
+            self.save()
+            self.record_entry(LedgerEntryKind.deposit, amount)
+
+            account_cache.invalidate(self.number)
 
     def withdraw(self, amount: decimal.Decimal) -> None:
         if type(amount) is not decimal.Decimal:
@@ -76,18 +312,85 @@ class Account(models.Model):
         if amount < decimal.Decimal(0.0):
             raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
 
-        if (self.balance - amount) < self.minimum_balance_value:
-            raise InsufficientBalance("Account doesn't have sufficient balance.")
+        with transaction.atomic():
+            Account.lock_accounts(self)
+
+            if (self.balance - amount) < self.minimum_balance_value:
+                metrics.insufficient_balance_rejections.inc()
+                raise InsufficientBalance("Account doesn't have sufficient balance.")
+
+            self.balance: decimal.Decimal = self.balance - amount
+
+            self.save()
+            self.record_entry(LedgerEntryKind.withdraw, amount)
 
-        self.balance: decimal.Decimal = self.balance - amount
+            account_cache.invalidate(self.number)
 
-        self.save()
+    def build_entry(
+        self,
+        kind: LedgerEntryKind,
+        amount: decimal.Decimal,
+        correlation_id: uuid.UUID | None = None,
+    ) -> LedgerEntry:
+        return LedgerEntry(
+            account_id=self.pk,
+            kind=kind,
+            amount=amount,
+            balance=self.balance,
+            correlation_id=correlation_id,
+        )
+
+    def record_entry(
+        self,
+        kind: LedgerEntryKind,
+        amount: decimal.Decimal,
+        correlation_id: uuid.UUID | None = None,
+    ) -> LedgerEntry:
+        entry: LedgerEntry = self.build_entry(kind, amount, correlation_id)
+        entry.save()
+
+        metrics.count_entries([entry])
+
+        return entry
     
+    def update_balance(self, amount: decimal.Decimal) -> None:
+        """Persist a balance change with a database-side expression."""
+        Account.objects.filter(pk=self.pk).update(balance=F("balance") + amount)
+
+        self.balance: decimal.Decimal = self.balance + amount
+        self.mark_saved("balance")
+
     def transfer_deposit(self, amount: decimal.Decimal) -> None:
-        self.deposit(amount)
+        self.update_balance(amount)
 
     def transfer_withdraw(self, amount: decimal.Decimal) -> None:
-        self.withdraw(amount)
+        if (self.balance - amount) < self.minimum_balance_value:
+            metrics.insufficient_balance_rejections.inc()
+            raise InsufficientBalance("Account doesn't have sufficient balance.")
+
+        self.update_balance(-amount)
+
+    @staticmethod
+    def lock_accounts(*accounts: Account) -> None:
+        """Lock the account rows in primary key order and refresh their balances and points.
+
+        Locking in a deterministic order keeps opposite transfers between the
+        same accounts from deadlocking each other.
+        """
+        locked_rows: dict[uuid.UUID, tuple[decimal.Decimal, int | None]] = {
+            pk: (balance, points)
+            for pk, balance, points in Account.objects.select_for_update(of=("self",)).filter(
+                pk__in=[account.pk for account in accounts],
+            ).order_by("pk").values_list("pk", "balance", "bonusaccount__points")
+        }
+
+        for account in accounts:
+            account.balance, points = locked_rows[account.pk]
+            account.mark_saved("balance")
+
+            if isinstance(account, BonusAccount):
+                account.points: int = points
+                account.mark_saved("points")
 
     @staticmethod
     def transfer(amount: decimal.Decimal, from_account: Account, to_account: Account) -> None:
@@ -97,8 +400,35 @@ class Account(models.Model):
         if amount < decimal.Decimal(0.0):
             raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
 
-        from_account.transfer_withdraw(amount)
-        to_account.transfer_deposit(amount)
+        with transaction.atomic():
+            Account.lock_accounts(from_account, to_account)
+
+            previous_values: dict[int, tuple[Account, decimal.Decimal, int]] = {
+                id(account): (account, account.balance, getattr(account, "points", 0))
+                for account in [from_account, to_account]
+            }
+
+            from_account.transfer_withdraw(amount)
+            to_account.transfer_deposit(amount)
+
+            changes: SummaryChanges = SummaryChanges()
+
+            for account, balance, points in previous_values.values():
+                changes.change_balance(account.type, balance, account.balance)
+                changes.add(account.type, total_points=getattr(account, "points", 0) - points)
+
+            changes.save()
+
+            correlation_id: uuid.UUID = uuid.uuid4()
+
+            entries: list[LedgerEntry] = LedgerEntry.objects.bulk_create([
+                from_account.build_entry(LedgerEntryKind.transfer_out, amount, correlation_id),
+                to_account.build_entry(LedgerEntryKind.transfer_in, amount, correlation_id),
+            ])
+
+            metrics.count_entries(entries)
+
+            account_cache.invalidate(from_account.number, to_account.number)
 
 
 class BonusAccount(Account):
@@ -117,31 +447,41 @@ class BonusAccount(Account):
     def verbose_type(self) -> str:
         return "Bonus Account"
     
-    def add_points(self, amount: decimal.Decimal, cutoff_amount: decimal.Decimal) -> None:
+    @staticmethod
+    def calculate_points(amount: decimal.Decimal, cutoff_amount: decimal.Decimal) -> int:
         if type(amount) is not decimal.Decimal:
             amount: decimal.Decimal = decimal.Decimal(amount)
 
         if type(cutoff_amount) is not decimal.Decimal:
             cutoff_amount: decimal.Decimal = decimal.Decimal(cutoff_amount)
 
-        points: int = int(amount // cutoff_amount)
-
-        self.points: decimal.Decimal = self.points + points
-        
-        self.save()
+        return int(amount // cutoff_amount)
 
     def deposit(self, amount: decimal.Decimal, cutoff_amount: decimal.Decimal = decimal.Decimal(100.00)) -> None:
         if type(amount) is not decimal.Decimal:
             amount: decimal.Decimal = decimal.Decimal(amount)
 
-        self.balance: decimal.Decimal = self.balance + amount
+        with transaction.atomic():
+            Account.lock_accounts(self)
+
+            self.balance: decimal.Decimal = self.balance + amount
+
+            self.points: int = self.points + self.calculate_points(amount, cutoff_amount)
 
-        self.add_points(amount, cutoff_amount)
+            self.save()
+            self.record_entry(LedgerEntryKind.deposit, amount)
 
-        self.save()
+            account_cache.invalidate(self.number)
 
     def transfer_deposit(self, amount: decimal.Decimal, cutoff_amount: decimal.Decimal = decimal.Decimal(150.00)) -> None:
-        self.deposit(amount, cutoff_amount)
+        super().transfer_deposit(amount)
+
+        points: int = self.calculate_points(amount, cutoff_amount)
+
+        BonusAccount.objects.filter(pk=self.pk).update(points=F("points") + points)
+
+        self.points: int = self.points + points
+        self.mark_saved("points")
     
 
 class SavingsAccount(Account):
@@ -158,12 +498,609 @@ class SavingsAccount(Account):
         return decimal.Decimal(0.0)
 
     @classmethod
-    def generate_yield_for_savings_accounts(cls, taxes: decimal.Decimal) -> None:
+    def generate_yield_for_savings_accounts(
+        cls,
+        taxes: decimal.Decimal,
+        reference: str | None = None,
+        chunk_size: int | None = None,
+        workers: int = 1,
+    ) -> YieldRun:
+        from accounts.yields import ParallelYieldEngine
+        from accounts.yields import YieldEngine
+
         if type(taxes) is not decimal.Decimal:
             taxes:decimal.Decimal = decimal.Decimal(taxes)
 
-        accounts = SavingsAccount.objects.all()
+        if workers > 1:
+            return ParallelYieldEngine.start(taxes, workers, reference=reference, chunk_size=chunk_size).run()
+
+        return YieldEngine.start(taxes, reference=reference, chunk_size=chunk_size).run()
+
+
+class AccountNumberSequence(models.Model):
+    name = models.CharField(
+        verbose_name="Sequence Name",
+        max_length=32,
+        primary_key=True,
+    )
+
+    first_number = models.PositiveBigIntegerField(
+        verbose_name="First Server-Assigned Number",
+        default=1,
+    )
+
+    next_number = models.PositiveBigIntegerField(
+        verbose_name="Next Unreserved Number",
+    )
+
+
+class PortfolioSummary(models.Model):
+    """Running totals of one account type, spread over ``ACCOUNTS_SUMMARY_SLOTS`` rows.
+
+    Every write adds its deltas to one slot picked at random, and readers sum
+    the slots, so the totals stay exact while concurrent writers seldom
+    contend on the same row.
+    """
+
+    account_type = models.CharField(
+        verbose_name="Account Type",
+        max_length=16,
+    )
+
+    slot = models.PositiveSmallIntegerField(
+        verbose_name="Slot",
+    )
+
+    accounts = models.BigIntegerField(
+        verbose_name="Accounts",
+        default=0,
+    )
+
+    total_balance = models.DecimalField(
+        verbose_name="Total Balance",
+        max_digits=20,
+        decimal_places=2,
+        default=decimal.Decimal(0),
+    )
+
+    overdrawn_accounts = models.BigIntegerField(
+        verbose_name="Overdrawn Accounts",
+        default=0,
+    )
+
+    total_points = models.BigIntegerField(
+        verbose_name="Total Points",
+        default=0,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["account_type", "slot"], name="summary_type_slot_unique"),
+        ]
+
+    @staticmethod
+    def get_slots() -> int:
+        return getattr(settings, "ACCOUNTS_SUMMARY_SLOTS", 1)
+
+    @classmethod
+    def create_slots(cls, account_type: str, **totals: Any) -> None:
+        """Create the missing slot rows of a type, the first one holding ``totals``."""
+        cls.objects.bulk_create(
+            [
+                cls(account_type=account_type, slot=slot, **(totals if slot == 0 else {}))
+                for slot in range(cls.get_slots())
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class SummaryChanges():
+    """Portfolio summary deltas collected by account type, then written with one update per type."""
+
+    fields: list[str] = ["accounts", "total_balance", "overdrawn_accounts", "total_points"]
+
+    def __init__(self) -> None:
+        self.changes: dict[str, dict[str, Any]] = {}
+
+    def add(self, account_type: str, **deltas: Any) -> None:
+        change: dict[str, Any] = self.changes.setdefault(
+            AccountType(account_type).value,
+            dict.fromkeys(self.fields, 0),
+        )
+
+        for field, delta in deltas.items():
+            change[field] += delta
+
+    def add_account(self, account: Account) -> None:
+        self.add(
+            account.type,
+            accounts=1,
+            total_balance=decimal.Decimal(account.balance),
+            overdrawn_accounts=int(account.balance < 0),
+            total_points=getattr(account, "points", 0),
+        )
+
+    def change_balance(self, account_type: str, previous: decimal.Decimal, current: decimal.Decimal) -> None:
+        self.add(
+            account_type,
+            total_balance=current - previous,
+            overdrawn_accounts=int(current < 0) - int(previous < 0),
+        )
+
+    def save(self) -> None:
+        """Apply the deltas to one random slot per type, in type order to keep lock order stable."""
+        slot: int = random.randrange(PortfolioSummary.get_slots())
+
+        for account_type, change in sorted(self.changes.items()):
+            updates: dict[str, F] = {field: F(field) + delta for field, delta in change.items() if delta}
+
+            if not updates:
+                continue
+
+            rows = PortfolioSummary.objects.filter(account_type=account_type, slot=slot)
+
+            if not rows.update(**updates):
+                PortfolioSummary.create_slots(account_type)
+                rows.update(**updates)
+
+        self.changes.clear()
+
+
+class YieldRunStatus(models.TextChoices):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class YieldRun(models.Model):
+    id = models.UUIDField(
+        verbose_name="Yield Run Identifier",
+        primary_key=True,
+        unique=True,
+        blank=False,
+        null=False,
+        default=uuid.uuid4,
+        editable=False,
+    )
+
+    reference = models.CharField(
+        verbose_name="Yield Run Reference",
+        max_length=64,
+        unique=True,
+        blank=False,
+        null=False,
+    )
+
+    tax = models.DecimalField(
+        verbose_name="Yield Tax",
+        max_digits=15,
+        decimal_places=2,
+        blank=False,
+        null=False,
+    )
+
+    status = models.CharField(
+        verbose_name="Yield Run Status",
+        max_length=16,
+        choices=YieldRunStatus.choices,
+        default=YieldRunStatus.pending,
+    )
+
+    last_account_id = models.UUIDField(
+        verbose_name="Last Processed Account Identifier",
+        blank=True,
+        null=True,
+    )
+
+    accounts_processed = models.PositiveIntegerField(
+        verbose_name="Accounts Processed",
+        default=0,
+    )
+
+    total_yield = models.DecimalField(
+        verbose_name="Total Yield",
+        max_digits=20,
+        decimal_places=2,
+        default=decimal.Decimal(0.0),
+    )
+
+    error = models.TextField(
+        verbose_name="Last Error",
+        blank=True,
+        default="",
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Created At",
+        auto_now_add=True,
+    )
+
+    updated_at = models.DateTimeField(
+        verbose_name="Updated At",
+        auto_now=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="yieldrun_queue_idx"),
+        ]
+
+
+class YieldRunPartition(models.Model):
+    """A disjoint primary-key range of a parallel yield run, with its own cursor.
+
+    The range covers savings accounts above ``lower_account_id`` up to and
+    including ``upper_account_id``, either bound left open when unset.
+    """
+
+    yield_run = models.ForeignKey(
+        YieldRun,
+        verbose_name="Yield Run",
+        related_name="partitions",
+        on_delete=models.CASCADE,
+    )
+
+    index = models.PositiveIntegerField(
+        verbose_name="Partition Index",
+    )
+
+    lower_account_id = models.UUIDField(
+        verbose_name="Lower Account Identifier (exclusive)",
+        blank=True,
+        null=True,
+    )
+
+    upper_account_id = models.UUIDField(
+        verbose_name="Upper Account Identifier (inclusive)",
+        blank=True,
+        null=True,
+    )
+
+    status = models.CharField(
+        verbose_name="Partition Status",
+        max_length=16,
+        choices=YieldRunStatus.choices,
+        default=YieldRunStatus.pending,
+    )
+
+    last_account_id = models.UUIDField(
+        verbose_name="Last Processed Account Identifier",
+        blank=True,
+        null=True,
+    )
+
+    accounts_processed = models.PositiveIntegerField(
+        verbose_name="Accounts Processed",
+        default=0,
+    )
+
+    total_yield = models.DecimalField(
+        verbose_name="Total Yield",
+        max_digits=20,
+        decimal_places=2,
+        default=decimal.Decimal(0.0),
+    )
+
+    updated_at = models.DateTimeField(
+        verbose_name="Updated At",
+        auto_now=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["yield_run", "index"], name="yieldrunpartition_run_index_unique"),
+        ]
+
+
+class LedgerEntryKind(models.TextChoices):
+    deposit = "deposit"
+    withdraw = "withdraw"
+    transfer_in = "transfer_in"
+    transfer_out = "transfer_out"
+    yields = "yield"
+
+
+class LedgerEntry(models.Model):
+    account = models.ForeignKey(
+        Account,
+        verbose_name="Account",
+        related_name="ledger_entries",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+
+    kind = models.CharField(
+        verbose_name="Entry Kind",
+        max_length=16,
+        choices=LedgerEntryKind.choices,
+    )
+
+    amount = models.DecimalField(
+        verbose_name="Entry Amount",
+        max_digits=15,
+        decimal_places=2,
+    )
+
+    balance = models.DecimalField(
+        verbose_name="Resulting Balance",
+        max_digits=15,
+        decimal_places=2,
+    )
+
+    correlation_id = models.UUIDField(
+        verbose_name="Correlation Identifier",
+        blank=True,
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Created At",
+        auto_now_add=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["account", "-id"], name="ledger_account_id_idx"),
+        ]
+
+
+class BalanceCheckpoint(models.Model):
+    account = models.ForeignKey(
+        Account,
+        verbose_name="Account",
+        related_name="balance_checkpoints",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+
+    period_end = models.DateTimeField(
+        verbose_name="Period End",
+    )
+
+    balance = models.DecimalField(
+        verbose_name="Balance At Period End",
+        max_digits=15,
+        decimal_places=2,
+    )
+
+    last_entry_id = models.BigIntegerField(
+        verbose_name="Last Ledger Entry Identifier",
+        blank=True,
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Created At",
+        auto_now_add=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["account", "period_end"], name="checkpoint_account_period_unique"),
+        ]
+
+
+class FlatAccountQuerySet(models.QuerySet):
+
+    def of_type(self, account_type: AccountType) -> FlatAccountQuerySet:
+        return self.filter(type=account_type.value)
+
+
+class FlatAccountManager(models.Manager.from_queryset(FlatAccountQuerySet)):
+    """Restrict a proxy model's queries to the rows of its own account type."""
+
+    def __init__(self, account_type: AccountType | None = None) -> None:
+        super().__init__()
+        self.account_type: AccountType | None = account_type
+
+    def get_queryset(self) -> FlatAccountQuerySet:
+        queryset: FlatAccountQuerySet = super().get_queryset()
+
+        if self.account_type is not None:
+            queryset = queryset.of_type(self.account_type)
+
+        return queryset
+
+
+class FlatAccount(models.Model):
+    """Single-table layout of the accounts, discriminated by an indexed ``type`` column.
+
+    Every account type lives in one row, subtype columns such as ``points``
+    are nullable, and rows are loaded straight into the proxy class of their
+    type, so reads never join and writes touch one table.
+    """
+
+    account_type: AccountType = AccountType.simple
+
+    id = models.UUIDField(
+        verbose_name="Account Identifier",
+        primary_key=True,
+        unique=True,
+        blank=False,
+        null=False,
+        default=uuid.uuid4,
+        editable=False,
+    )
+
+    number = models.PositiveIntegerField(
+        verbose_name="Account Number",
+        unique=True,
+        blank=False,
+        null=False,
+    )
+
+    balance = models.DecimalField(
+        verbose_name="Account Balance",
+        max_digits=15,
+        decimal_places=2,
+        blank=False,
+        null=False,
+        default=decimal.Decimal(0.0),
+        validators=[MinValueValidator(decimal.Decimal(-1000.0))]
+    )
+
+    type = models.CharField(
+        verbose_name="Account Type",
+        max_length=16,
+        choices=[
+            (account_type.value, account_type.value)
+            for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]
+        ],
+        default=AccountType.simple.value,
+        db_index=True,
+    )
+
+    points = models.PositiveIntegerField(
+        verbose_name="Account Points",
+        blank=True,
+        null=True,
+    )
+
+    objects = FlatAccountManager()
+
+    @property
+    def verbose_type(self) -> str:
+        return "Account"
+
+    @property
+    def minimum_balance_value(self) -> decimal.Decimal:
+        return decimal.Decimal(-1000.0)
+
+    @classmethod
+    def from_db(cls, db: str, field_names: list[str], values: list) -> FlatAccount:
+        instance: FlatAccount = super().from_db(db, field_names, values)
+        proxy_model: type[FlatAccount] | None = FLAT_ACCOUNT_MODELS.get(instance.__dict__.get("type"))
+
+        if proxy_model is not None:
+            instance.__class__ = proxy_model
+
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        if self._state.adding:
+            self.type: str = self.account_type.value
+
+        super().save(*args, **kwargs)
+
+    def deposit(self, amount: decimal.Decimal) -> None:
+        if type(amount) is not decimal.Decimal:
+            amount: decimal.Decimal = decimal.Decimal(amount)
+
+        if amount < decimal.Decimal(0.0):
+            raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
+
+        with transaction.atomic():
+            FlatAccount.lock_accounts(self)
+
+            self.transfer_deposit(amount)
+
+    def withdraw(self, amount: decimal.Decimal) -> None:
+        if type(amount) is not decimal.Decimal:
+            amount: decimal.Decimal = decimal.Decimal(amount)
+
+        if amount < decimal.Decimal(0.0):
+            raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
+
+        with transaction.atomic():
+            FlatAccount.lock_accounts(self)
+
+            self.transfer_withdraw(amount)
+
+    def update_balance(self, amount: decimal.Decimal, **updates: Any) -> None:
+        """Persist a balance change, plus any extra column expressions, in one UPDATE."""
+        FlatAccount.objects.filter(pk=self.pk).update(balance=F("balance") + amount, **updates)
+
+        self.balance: decimal.Decimal = self.balance + amount
+
+    def transfer_deposit(self, amount: decimal.Decimal) -> None:
+        self.update_balance(amount)
+
+    def transfer_withdraw(self, amount: decimal.Decimal) -> None:
+        if (self.balance - amount) < self.minimum_balance_value:
+            raise InsufficientBalance("Account doesn't have sufficient balance.")
+
+        self.update_balance(-amount)
+
+    @staticmethod
+    def lock_accounts(*accounts: FlatAccount) -> None:
+        locked_balances: dict[uuid.UUID, decimal.Decimal] = dict(
+            FlatAccount.objects.select_for_update().filter(
+                pk__in=[account.pk for account in accounts],
+            ).order_by("pk").values_list("pk", "balance")
+        )
 
         for account in accounts:
-            yields = (account.balance * taxes) / decimal.Decimal(100)
-            account.deposit(yields)
\ No newline at end of file
+            account.balance: decimal.Decimal = locked_balances[account.pk]
+
+    @staticmethod
+    def transfer(amount: decimal.Decimal, from_account: FlatAccount, to_account: FlatAccount) -> None:
+        if type(amount) is not decimal.Decimal:
+            amount: decimal.Decimal = decimal.Decimal(amount)
+
+        if amount < decimal.Decimal(0.0):
+            raise NegativeTransaction("Unable to process transaction. Please enter a non-negative value for the transaction amount.")
+
+        with transaction.atomic():
+            FlatAccount.lock_accounts(from_account, to_account)
+
+            from_account.transfer_withdraw(amount)
+            to_account.transfer_deposit(amount)
+
+
+class FlatBonusAccount(FlatAccount):
+    account_type: AccountType = AccountType.bonus
+
+    objects = FlatAccountManager(AccountType.bonus)
+
+    class Meta:
+        proxy = True
+
+    @property
+    def verbose_type(self) -> str:
+        return "Bonus Account"
+
+    def save(self, *args, **kwargs) -> None:
+        if self.points is None:
+            self.points: int = BonusAccount._meta.get_field("points").get_default()
+
+        super().save(*args, **kwargs)
+
+    def deposit(self, amount: decimal.Decimal, cutoff_amount: decimal.Decimal = decimal.Decimal(100.00)) -> None:
+        if type(amount) is not decimal.Decimal:
+            amount: decimal.Decimal = decimal.Decimal(amount)
+
+        with transaction.atomic():
+            FlatAccount.lock_accounts(self)
+
+            self.transfer_deposit(amount, cutoff_amount)
+
+    def transfer_deposit(self, amount: decimal.Decimal, cutoff_amount: decimal.Decimal = decimal.Decimal(150.00)) -> None:
+        points: int = BonusAccount.calculate_points(amount, cutoff_amount)
+
+        self.update_balance(amount, points=F("points") + points)
+
+        self.points: int = self.points + points
+
+
+class FlatSavingsAccount(FlatAccount):
+    account_type: AccountType = AccountType.savings
+
+    objects = FlatAccountManager(AccountType.savings)
+
+    class Meta:
+        proxy = True
+
+    @property
+    def verbose_type(self) -> str:
+        return "Savings Account"
+
+    @property
+    def minimum_balance_value(self) -> decimal.Decimal:
+        return decimal.Decimal(0.0)
+
+
+FLAT_ACCOUNT_MODELS: dict[str, type[FlatAccount]] = {
+    model.account_type.value: model
+    for model in [FlatAccount, FlatBonusAccount, FlatSavingsAccount]
+}
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Max
+
+from accounts.exceptions import AccountNumberUnavailable
+from accounts.models import Account
+from accounts.models import AccountNumberSequence
+
+
+class AccountNumberAllocator():
+    """Hand out server-assigned account numbers from blocks reserved in the database.
+
+    A block is reserved by bumping a sequence row, with ``UPDATE ... RETURNING``
+    where the backend supports it, so each worker pays one round trip per
+    ``block_size`` numbers and creators never race on the unique constraint.
+    Numbers of blocks left unused when a worker stops are skipped, and
+    blocks should be reserved outside of transactions that may roll back.
+
+    Every number from ``first_number`` up to the sequence belongs to some
+    block, so accounts created with a number of their own must ``claim`` it:
+    numbers in that range are refused, and numbers past it move the sequence
+    forward in the creating transaction.
+    """
+
+    def __init__(self, block_size: int = 100, sequence: str = "accounts") -> None:
+        self.block_size: int = block_size
+        self.sequence: str = sequence
+
+        self.next_number: int = 0
+        self.end_number: int = 0
+        self.issued: set[int] = set()
+        self.lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> AccountNumberAllocator:
+        return cls(block_size=getattr(settings, "ACCOUNT_NUMBER_BLOCK_SIZE", 100))
+
+    def create_sequence(self, using: str) -> None:
+        """Start the sequence right after the highest account number in use."""
+        last_number: int | None = Account.objects.using(using).aggregate(last=Max("number"))["last"]
+
+        AccountNumberSequence.objects.using(using).get_or_create(
+            name=self.sequence,
+            defaults={"first_number": (last_number or 0) + 1, "next_number": (last_number or 0) + 1},
+        )
+
+    def bump_sequence(self, using: str) -> int | None:
+        """Advance the sequence by one block and return its new value."""
+        connection = connections[using]
+
+        if connection.vendor in ("postgresql", "sqlite") and connection.features.can_return_columns_from_insert:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE {table} SET {column} = {column} + %s WHERE {name} = %s RETURNING {column}".format(
+                        table=connection.ops.quote_name(AccountNumberSequence._meta.db_table),
+                        column=connection.ops.quote_name("next_number"),
+                        name=connection.ops.quote_name("name"),
+                    ),
+                    [self.block_size, self.sequence],
+                )
+                row: tuple | None = cursor.fetchone()
+
+            return row[0] if row else None
+
+        with transaction.atomic(using=using):
+            sequences = AccountNumberSequence.objects.using(using).select_for_update().filter(name=self.sequence)
+
+            if not sequences.update(next_number=F("next_number") + self.block_size):
+                return None
+
+            return sequences.values_list("next_number", flat=True).get()
+
+    def reserve_block(self) -> tuple[int, int]:
+        using: str = router.db_for_write(AccountNumberSequence)
+        end_number: int | None = self.bump_sequence(using)
+
+        if end_number is None:
+            self.create_sequence(using)
+            end_number = self.bump_sequence(using)
+
+        return end_number - self.block_size, end_number
+
+    def reset(self) -> None:
+        """Forget the block in memory, the next allocation reserves a new one."""
+        with self.lock:
+            self.next_number = self.end_number = 0
+            self.issued.clear()
+
+    def allocate(self) -> int:
+        with self.lock:
+            if self.next_number >= self.end_number:
+                self.next_number, self.end_number = self.reserve_block()
+
+            number: int = self.next_number
+            self.next_number += 1
+            self.issued.add(number)
+
+        return number
+
+    def get_reserved_range(self, using: str | None = None) -> range:
+        """The numbers handed out, or about to be, by the blocks reserved so far."""
+        using: str = using or router.db_for_write(AccountNumberSequence)
+        bounds: tuple[int, int] | None = AccountNumberSequence.objects.using(using).filter(
+            name=self.sequence,
+        ).values_list("first_number", "next_number").first()
+
+        return range(*bounds) if bounds else range(0)
+
+    def claim(self, numbers: Iterable[int], using: str | None = None) -> None:
+        """Keep the numbers of new accounts out of the blocks, inside the creating transaction.
+
+        Numbers this allocator handed out need nothing. Others raise
+        ``AccountNumberUnavailable`` when a block may hand them out, and move
+        the sequence past them when they are beyond it.
+        """
+        with self.lock:
+            chosen: list[int] = [number for number in numbers if number not in self.issued]
+            self.issued.difference_update(numbers)
+
+        if not chosen:
+            return
+
+        using: str = using or router.db_for_write(AccountNumberSequence)
+        sequence: AccountNumberSequence | None = AccountNumberSequence.objects.using(using).select_for_update().filter(
+            name=self.sequence,
+        ).first()
+
+        if sequence is None:
+            return
+
+        reserved: list[int] = sorted(
+            number for number in chosen if sequence.first_number <= number < sequence.next_number
+        )
+
+        if reserved:
+            raise AccountNumberUnavailable(
+                f"Account number {reserved[0]} is reserved for server-assigned numbers, "
+                f"choose one from {sequence.next_number} on or leave it blank."
+            )
+
+        if max(chosen) >= sequence.next_number:
+            sequence.next_number = max(chosen) + 1
+            sequence.save(update_fields=["next_number"])
+
+
+account_number_allocator: AccountNumberAllocator = AccountNumberAllocator.from_settings()
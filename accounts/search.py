@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import decimal
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django import forms
+from django.db.models import Q
+
+from accounts.models import Account
+from accounts.models import AccountQuerySet
+from accounts.models import AccountType
+from accounts.models import BonusAccount
+from accounts.models import SavingsAccount
+
+
+MAX_ACCOUNT_NUMBER: int = 2147483647
+
+
+def number_prefix_ranges(prefix: str) -> List[tuple[int, int]]:
+    """Number ranges holding every account number that starts with ``prefix``.
+
+    A prefix of ``12`` covers 12, 120-129, 1200-1299 and so on, one range per
+    number of digits, so the lookup stays a set of index range scans instead
+    of a string match over every row.
+    """
+    if not prefix.isdigit():
+        return []
+
+    if prefix.startswith("0"):
+        return [(0, 0)] if prefix == "0" else []
+
+    ranges: List[tuple[int, int]] = []
+    start: int = int(prefix)
+    end: int = start
+
+    while start <= MAX_ACCOUNT_NUMBER:
+        ranges.append((start, min(end, MAX_ACCOUNT_NUMBER)))
+
+        start, end = start * 10, end * 10 + 9
+
+    return ranges
+
+
+class AccountSearch():
+    """Find accounts by number prefix or range, type and balance range, a keyset page at a time.
+
+    Pages are ordered by number and continue after the last number seen, so
+    every page costs the same however deep it is. Number filters use the
+    unique index on ``number``, types the ``(kind, number)`` index, and
+    overdrawn accounts the partial index on negative balances. A number
+    prefix is searched one digit-length range at a time, in number order,
+    until the page is full.
+
+    Balance ranges without number or type filters are ordered by balance,
+    then number, and continue after the last ``(balance, number)`` seen, so
+    they walk the ``(balance, number)`` index instead of sorting the range.
+    """
+
+    def __init__(
+        self,
+        number_prefix: str | None = None,
+        min_number: int | None = None,
+        max_number: int | None = None,
+        account_type: AccountType | None = None,
+        min_balance: decimal.Decimal | None = None,
+        max_balance: decimal.Decimal | None = None,
+        overdrawn: bool = False,
+    ) -> None:
+        self.number_prefix: str | None = number_prefix
+        self.min_number: int | None = min_number
+        self.max_number: int | None = max_number
+        self.account_type: AccountType | None = account_type
+        self.min_balance: decimal.Decimal | None = min_balance
+        self.max_balance: decimal.Decimal | None = max_balance
+        self.overdrawn: bool = overdrawn
+
+    @property
+    def uses_overdrawn_index(self) -> bool:
+        return self.overdrawn or (self.max_balance is not None and self.max_balance < 0)
+
+    @property
+    def orders_by_balance(self) -> bool:
+        return (
+            (self.min_balance is not None or self.max_balance is not None)
+            and self.number_prefix is None
+            and self.account_type is None
+            and self.min_number is None
+            and self.max_number is None
+            and not self.uses_overdrawn_index
+        )
+
+    def get_cursor(self, account: Account) -> Dict[str, Any]:
+        """Query parameters continuing the search after ``account``."""
+        if self.orders_by_balance:
+            return {"after": account.number, "after_balance": account.balance}
+
+        return {"after": account.number}
+
+    def get_queryset(self, after: int | None = None, after_balance: decimal.Decimal | None = None) -> AccountQuerySet:
+        """Accounts matching every filter but the number prefix, in page order."""
+        accounts: AccountQuerySet = Account.objects.polymorphic()
+
+        if self.orders_by_balance:
+            if after is not None and after_balance is not None:
+                accounts = accounts.filter(balance__gte=after_balance).filter(
+                    Q(balance__gt=after_balance) | Q(number__gt=after),
+                )
+        elif after is not None:
+            accounts = accounts.filter(number__gt=after)
+
+        if self.min_number is not None:
+            accounts = accounts.filter(number__gte=self.min_number)
+
+        if self.max_number is not None:
+            accounts = accounts.filter(number__lte=self.max_number)
+
+        if self.account_type is not None:
+            accounts = accounts.of_type(self.account_type)
+
+        if self.min_balance is not None:
+            accounts = accounts.filter(balance__gte=self.min_balance)
+
+        if self.max_balance is not None:
+            accounts = accounts.filter(balance__lte=self.max_balance)
+
+        # The partial index only applies when the query repeats its exact condition.
+        if self.uses_overdrawn_index:
+            accounts = accounts.filter(balance__lt=0)
+
+        if self.orders_by_balance:
+            return accounts.order_by("balance", "number")
+
+        return accounts.order_by("number")
+
+    def get_querysets(self, after: int | None = None, after_balance: decimal.Decimal | None = None) -> List[AccountQuerySet]:
+        """The queries to run in order, one per prefix range, or a single one without a prefix."""
+        accounts: AccountQuerySet = self.get_queryset(after, after_balance)
+
+        if self.number_prefix is None:
+            return [accounts]
+
+        return [
+            accounts.filter(number__range=(start, end))
+            for start, end in number_prefix_ranges(self.number_prefix)
+            if after is None or end > after
+        ]
+
+    def page(
+        self,
+        after: int | None = None,
+        limit: int = 50,
+        after_balance: decimal.Decimal | None = None,
+    ) -> List[Account | BonusAccount | SavingsAccount]:
+        """Up to ``limit + 1`` matching accounts, the extra one telling that another page follows."""
+        accounts: List[Account] = []
+
+        for queryset in self.get_querysets(after, after_balance):
+            accounts.extend(queryset[:limit + 1 - len(accounts)])
+
+            if len(accounts) > limit:
+                break
+
+        return [account.as_concrete() for account in accounts]
+
+
+class AccountSearchForm(forms.Form):
+    number_prefix = forms.RegexField(regex=r"^\d+$", max_length=10, required=False)
+    min_number = forms.IntegerField(min_value=0, required=False)
+    max_number = forms.IntegerField(min_value=0, required=False)
+    account_type = forms.ChoiceField(
+        choices=[("", "Any")] + [
+            (account_type.value, account_type.value.title())
+            for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]
+        ],
+        required=False,
+    )
+    min_balance = forms.DecimalField(max_digits=15, decimal_places=2, required=False)
+    max_balance = forms.DecimalField(max_digits=15, decimal_places=2, required=False)
+    overdrawn = forms.BooleanField(required=False)
+
+    def clean(self) -> dict:
+        cleaned_data: dict = super().clean()
+
+        for low, high in [("min_number", "max_number"), ("min_balance", "max_balance")]:
+            if cleaned_data.get(low) is not None and cleaned_data.get(high) is not None \
+                    and cleaned_data[low] > cleaned_data[high]:
+                self.add_error(high, f"Must be greater than or equal to {low}.")
+
+        return cleaned_data
+
+    def get_filters(self) -> dict:
+        """Keyword arguments for ``AccountSearch`` from the cleaned data."""
+        filters: dict = {
+            name: value for name, value in self.cleaned_data.items()
+            if value not in (None, "")
+        }
+
+        if "account_type" in filters:
+            filters["account_type"] = AccountType(filters["account_type"])
+
+        return filters
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import decimal
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Q
+from django.db.models import Sum
+
+from accounts.models import Account
+from accounts.models import AccountType
+from accounts.models import PortfolioSummary
+from accounts.models import SummaryChanges
+
+
+SUMMARY_TYPES: List[AccountType] = [AccountType.simple, AccountType.bonus, AccountType.savings]
+
+Summary = Dict[str, Dict[str, Any]]
+
+CENT: decimal.Decimal = decimal.Decimal("0.01")
+
+
+def empty_summary() -> Summary:
+    return {
+        account_type.value: {
+            "accounts": 0,
+            "total_balance": decimal.Decimal("0.00"),
+            "overdrawn_accounts": 0,
+            "total_points": 0,
+        }
+        for account_type in SUMMARY_TYPES
+    }
+
+
+def fill_summary(rows: List[Dict[str, Any]]) -> Summary:
+    summary: Summary = empty_summary()
+
+    for row in rows:
+        totals: Dict[str, Any] = summary[row["account_type"]]
+
+        for field in SummaryChanges.fields:
+            if row[field] is not None:
+                totals[field] = row[field]
+
+        totals["total_balance"] = decimal.Decimal(totals["total_balance"]).quantize(CENT)
+
+    return summary
+
+
+def read_summary() -> Summary:
+    """The maintained totals by account type, one aggregate over the summary slots."""
+    return fill_summary(list(
+        PortfolioSummary.objects.values("account_type").annotate(
+            accounts=Sum("accounts"),
+            total_balance=Sum("total_balance"),
+            overdrawn_accounts=Sum("overdrawn_accounts"),
+            total_points=Sum("total_points"),
+        ).values("account_type", *SummaryChanges.fields)
+    ))
+
+
+def compute_summary() -> Summary:
+    """The same totals recomputed from every account, a full scan."""
+    return fill_summary(list(
+        Account.objects.with_type().values("account_type").annotate(
+            accounts=Count("pk"),
+            total_balance=Sum("balance"),
+            overdrawn_accounts=Count("pk", filter=Q(balance__lt=0)),
+            total_points=Sum("bonusaccount__points"),
+        ).values("account_type", *SummaryChanges.fields)
+    ))
+
+
+def get_totals(summary: Summary) -> Dict[str, Any]:
+    return {
+        field: sum(totals[field] for totals in summary.values())
+        for field in SummaryChanges.fields
+    }
+
+
+def get_drift(maintained: Summary, actual: Summary) -> Dict[str, Dict[str, tuple]]:
+    """Fields whose maintained value differs from the recomputed one, as ``(maintained, actual)``."""
+    drift: Dict[str, Dict[str, tuple]] = {}
+
+    for account_type, totals in actual.items():
+        for field, value in totals.items():
+            if maintained[account_type][field] != value:
+                drift.setdefault(account_type, {})[field] = (maintained[account_type][field], value)
+
+    return drift
+
+
+def rebuild_summary() -> Dict[str, Dict[str, tuple]]:
+    """Replace the summary with totals recomputed from the accounts, returning the drift found.
+
+    The summary rows are locked first, so writers committing meanwhile wait
+    and apply their deltas on top of the rebuilt totals.
+    """
+    with transaction.atomic():
+        list(PortfolioSummary.objects.select_for_update())
+
+        maintained: Summary = read_summary()
+        actual: Summary = compute_summary()
+
+        PortfolioSummary.objects.all().delete()
+
+        for account_type, totals in actual.items():
+            PortfolioSummary.create_slots(account_type, **totals)
+
+    return get_drift(maintained, actual)
@@ -1,15 +1,89 @@
+import contextlib
+import datetime
 import decimal
+import importlib
+import io
+import json
+import os
+import pathlib
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+import threading
+import time
 import uuid
 
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.db.models import F
+from django.db.utils import ConnectionHandler
 from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from django.db.utils import IntegrityError
 from accounts.exceptions import NegativeTransaction
 from accounts.exceptions import InsufficientBalance
+from accounts.exceptions import AccountNumberUnavailable
+from accounts.exceptions import DuplicateYieldRun
 
+from accounts.batch import BatchMode
+from accounts.batch import BatchOperation
+from accounts.batch import BatchOperationType
+from accounts.batch import BatchProcessor
+from accounts.benchmarks.layouts import LayoutBenchmark
+from accounts.benchmarks.serialization import run_serialization_benchmark
+from accounts.benchmarks.suite import BenchmarkSuite
+from accounts.benchmarks.suite import compare_results
+from accounts.benchmarks.transfers import run_transfer_benchmark
+from accounts.benchmarks.yields import YieldScalingBenchmark
+from accounts.bulk import bulk_create_accounts
+from accounts.checkpoints import CheckpointPeriod
+from accounts.checkpoints import CheckpointWriter
+from accounts.checkpoints import get_balances_as_of
+from accounts.checkpoints import get_last_period_end
+from accounts.checkpoints import get_period_end
+from accounts.coalescing import CoalescedDeposit
+from accounts.coalescing import DepositCoalescer
+from accounts.imports import AccountImporter
+from accounts.imports import ImportRowError
+from accounts.jobs import YieldWorker
+from accounts.jobs import get_current_period
+from accounts.jobs import submit_yield_run
+from accounts.mixins import GetAccountMultipleTypesMixin
+from accounts.numbers import AccountNumberAllocator
+from accounts.numbers import account_number_allocator
 from accounts.models import AccountType
 from accounts.models import Account
+from accounts.models import BalanceCheckpoint
 from accounts.models import BonusAccount
 from accounts.models import SavingsAccount
+from accounts.models import FlatAccount
+from accounts.models import FlatBonusAccount
+from accounts.models import FlatSavingsAccount
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+from accounts.models import PortfolioSummary
+from accounts.models import YieldRun
+from accounts.models import YieldRunStatus
+from accounts.search import AccountSearch
+from accounts.search import number_prefix_ranges
+from accounts.views import SearchAccountsView
+from accounts.summary import compute_summary
+from accounts.summary import get_totals
+from accounts.summary import read_summary
+from accounts.summary import rebuild_summary
+from accounts.yields import ParallelYieldEngine
+from accounts.yields import YieldEngine
+from accounts.yields import run_partition
+from sysbanking.database import get_database
 
 
 class CreateAccountTestCase(TransactionTestCase):
@@ -121,6 +195,638 @@ class RetrieveAccountTestCase(TransactionTestCase):
             SavingsAccount.objects.get(number=0)
 
 
+class PolymorphicRetrieveAccountTestCase(TransactionTestCase):
+    def setUp(self):
+        self.dummy_simple_account = Account.objects.create(number=997, balance=100.0)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=998, balance=200.0, points=15)
+        self.dummy_savings_account = SavingsAccount.objects.create(number=999, balance=300.0)
+
+    def test_retrieve_concrete_account_by_number_in_one_query(self):
+        dummy_accounts = [
+            (self.dummy_simple_account, Account, AccountType.simple),
+            (self.dummy_bonus_account, BonusAccount, AccountType.bonus),
+            (self.dummy_savings_account, SavingsAccount, AccountType.savings),
+        ]
+
+        for dummy_account, model, account_type in dummy_accounts:
+            with self.assertNumQueries(1):
+                account = Account.objects.get_by_number(dummy_account.number)
+
+                self.assertIs(type(account), model)
+                self.assertEqual(account.pk, dummy_account.pk)
+                self.assertEqual(account.number, dummy_account.number)
+                self.assertEqual(account.balance, decimal.Decimal(dummy_account.balance))
+                self.assertEqual(account.type, account_type)
+
+    def test_retrieve_bonus_account_points_without_extra_queries(self):
+        account = Account.objects.get_by_number(self.dummy_bonus_account.number)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(account.points, self.dummy_bonus_account.points)
+
+    def test_mixin_retrieves_account_in_one_query(self):
+        mixin = GetAccountMultipleTypesMixin()
+
+        for dummy_account in [self.dummy_simple_account, self.dummy_bonus_account, self.dummy_savings_account]:
+            with self.assertNumQueries(1):
+                account = mixin.get_account_by_number(dummy_account.number)
+
+            self.assertEqual(account.type, dummy_account.type)
+
+    def test_polymorphic_account_does_not_exists(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(Account.DoesNotExist):
+                Account.objects.get_by_number(0)
+
+
+class BulkCreateAccountTestCase(TransactionTestCase):
+    def test_bulk_create_accounts_of_every_type(self):
+        rebuild_summary()
+
+        # One insert per table and one portfolio summary update per account type.
+        with self.assertNumQueries(9):
+            bulk_create_accounts([
+                Account(number=1, balance=10),
+                BonusAccount(number=2, balance=20, points=15),
+                SavingsAccount(number=3, balance=30),
+                BonusAccount(number=4),
+            ])
+
+        self.assertEqual(Account.objects.get_by_number(1).type, AccountType.simple)
+        self.assertEqual(Account.objects.get_by_number(2).points, 15)
+        self.assertEqual(Account.objects.get_by_number(3).balance, 30)
+        self.assertEqual(Account.objects.get_by_number(4).points, 10)
+        self.assertEqual(SavingsAccount.objects.count(), 1)
+
+
+class AccountNumberAllocatorTestCase(TransactionTestCase):
+    def setUp(self):
+        Account.objects.create(number=500)
+        account_number_allocator.reset()
+
+    def test_numbers_start_after_the_highest_account(self):
+        allocator = AccountNumberAllocator(block_size=10)
+
+        self.assertEqual([allocator.allocate() for _ in range(3)], [501, 502, 503])
+
+    def test_each_block_costs_one_query(self):
+        allocator = AccountNumberAllocator(block_size=10)
+        allocator.allocate()
+
+        with self.assertNumQueries(0):
+            for _ in range(9):
+                allocator.allocate()
+
+        with self.assertNumQueries(1):
+            allocator.allocate()
+
+    def test_workers_get_disjoint_blocks(self):
+        allocators = [AccountNumberAllocator(block_size=5) for _ in range(4)]
+
+        numbers = [allocator.allocate() for _ in range(12) for allocator in allocators]
+
+        self.assertEqual(len(set(numbers)), 48)
+        self.assertGreater(min(numbers), 500)
+
+    def test_chosen_numbers_never_collide_with_allocated_ones(self):
+        number = account_number_allocator.allocate()
+
+        with self.assertRaises(AccountNumberUnavailable):
+            Account.objects.create(number=number + 1)
+
+        Account.objects.create(number=number)
+
+        self.assertEqual(account_number_allocator.allocate(), number + 1)
+
+        Account.objects.create(number=number + 1)
+        Account.objects.create(number=10_000)
+
+        self.assertEqual(AccountNumberAllocator().allocate(), 10_001)
+
+    def test_numbers_below_the_sequence_start_stay_available(self):
+        account_number_allocator.allocate()
+
+        Account.objects.create(number=7)
+
+        report = AccountImporter().run([{"number": "8"}, {"number": "600"}])
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors[0].error, "Account number 600 is reserved for server-assigned numbers.")
+
+    def test_import_reports_numbers_reserved_after_the_check(self):
+        get_reserved_range = account_number_allocator.get_reserved_range
+        account_number_allocator.allocate()
+
+        # The first lookup, during validation, misses the block reserved by another worker.
+        with unittest.mock.patch.object(
+            account_number_allocator,
+            "get_reserved_range",
+            side_effect=[range(0), get_reserved_range()],
+        ):
+            report = AccountImporter().run([{"number": "8"}, {"number": "600"}, {"number": "9"}])
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.errors, [ImportRowError(2, "Account number 600 is reserved for server-assigned numbers.")])
+        self.assertEqual(sorted(Account.objects.values_list("number", flat=True)), [8, 9, 500])
+
+    def test_create_view_assigns_a_number(self):
+        response = self.client.post(reverse("accounts:create"), {"type": "bonus", "balance": "0"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(BonusAccount.objects.count(), 1)
+        self.assertGreater(BonusAccount.objects.get().number, 500)
+
+        number = BonusAccount.objects.get().number + 1
+        response = self.client.post(reverse("accounts:create"), {"type": "simple", "number": number, "balance": "0"})
+
+        self.assertContains(response, "is reserved for server-assigned numbers")
+        self.assertFalse(Account.objects.filter(number=number).exists())
+
+
+class AccountSearchTestCase(TransactionTestCase):
+    def setUp(self):
+        bulk_create_accounts([
+            Account(number=2, balance=100),
+            Account(number=12, balance=-50),
+            BonusAccount(number=13, balance=200),
+            BonusAccount(number=120, balance=40),
+            Account(number=121, balance=0),
+            SavingsAccount(number=125, balance=-10),
+            Account(number=1200, balance=5),
+            SavingsAccount(number=2120, balance=-300),
+        ])
+
+    def search(self, **filters):
+        return [account.number for account in AccountSearch(**filters).page(limit=100)]
+
+    def test_number_prefix_ranges(self):
+        self.assertEqual(number_prefix_ranges("12")[:3], [(12, 12), (120, 129), (1200, 1299)])
+        self.assertEqual(number_prefix_ranges("21474")[-1], (2147400000, 2147483647))
+        self.assertEqual(number_prefix_ranges("0"), [(0, 0)])
+        self.assertEqual(number_prefix_ranges("01"), [])
+
+    def test_filters(self):
+        self.assertEqual(self.search(number_prefix="12"), [12, 120, 121, 125, 1200])
+        self.assertEqual(self.search(min_number=13, max_number=125), [13, 120, 121, 125])
+        self.assertEqual(self.search(account_type=AccountType.bonus), [13, 120])
+        self.assertEqual(self.search(account_type=AccountType.simple, number_prefix="12"), [12, 121, 1200])
+        self.assertEqual(self.search(min_balance=0, max_balance=100), [121, 1200, 120, 2])
+        self.assertEqual(self.search(account_type=AccountType.bonus, min_balance=100), [13])
+        self.assertEqual(self.search(overdrawn=True), [12, 125, 2120])
+        self.assertEqual(self.search(max_balance=-20), [12, 2120])
+
+        page = AccountSearch(overdrawn=True).page(limit=2)
+
+        self.assertEqual([account.type for account in page], [AccountType.simple, AccountType.savings, AccountType.savings])
+
+    def test_keyset_pages_follow_the_prefix_ranges(self):
+        search = AccountSearch(number_prefix="12")
+
+        first_page = search.page(limit=2)
+        second_page = search.page(after=first_page[1].number, limit=2)
+        last_page = search.page(after=second_page[1].number, limit=2)
+
+        self.assertEqual([account.number for account in first_page], [12, 120, 121])
+        self.assertEqual([account.number for account in second_page], [121, 125, 1200])
+        self.assertEqual([account.number for account in last_page], [1200])
+
+    def test_keyset_pages_follow_the_balance_order(self):
+        bulk_create_accounts([Account(number=3, balance=5), Account(number=4, balance=5)])
+        search = AccountSearch(min_balance=0)
+
+        first_page = search.page(limit=3)
+        second_page = search.page(**search.get_cursor(first_page[2]), limit=3)
+        last_page = search.page(**search.get_cursor(second_page[2]), limit=3)
+
+        self.assertEqual([account.number for account in first_page], [121, 3, 4, 1200])
+        self.assertEqual([account.number for account in second_page], [1200, 120, 2, 13])
+        self.assertEqual([account.number for account in last_page], [13])
+        self.assertEqual(search.get_cursor(first_page[2]), {"after": 4, "after_balance": decimal.Decimal(5)})
+
+    def test_search_page(self):
+        response = self.client.get(reverse("accounts:search"), {"number_prefix": "12", "account_type": "simple"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([account.number for account in response.context["results"]], [12, 121, 1200])
+        self.assertNotIn("next_query", response.context)
+
+        response = self.client.get(reverse("accounts:search"), {"min_balance": "10", "max_balance": "5"})
+
+        self.assertIn("max_balance", response.context["form"].errors)
+        self.assertNotIn("results", response.context)
+
+    def test_search_page_continues_a_balance_range(self):
+        with unittest.mock.patch.object(SearchAccountsView, "page_size", 2):
+            response = self.client.get(reverse("accounts:search"), {"min_balance": "0"})
+            self.assertEqual([account.number for account in response.context["results"]], [121, 1200])
+
+            response = self.client.get(f'{reverse("accounts:search")}?{response.context["next_query"]}')
+            self.assertEqual([account.number for account in response.context["results"]], [120, 2])
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "Query plans are SQLite specific")
+    def test_searches_use_indexes(self):
+        expected_indexes = {
+            "number_prefix": ({"number_prefix": "12"}, "sqlite_autoindex_accounts_account"),
+            "number_range": ({"min_number": 10, "max_number": 200}, "sqlite_autoindex_accounts_account"),
+            "number_range_and_balance": ({"min_number": 10, "max_number": 200, "min_balance": 0}, "sqlite_autoindex_accounts_account"),
+            "balance_range": ({"min_balance": 0, "max_balance": 100}, "account_balance_idx"),
+            "min_balance": ({"min_balance": 0}, "account_balance_idx"),
+            "max_balance": ({"max_balance": 100}, "account_balance_idx"),
+            "overdrawn": ({"overdrawn": True}, "account_overdrawn_idx"),
+            "negative_balance_range": ({"max_balance": -20}, "account_overdrawn_idx"),
+            "type": ({"account_type": AccountType.savings}, "account_kind_number_idx"),
+            "type_and_prefix": ({"account_type": AccountType.savings, "number_prefix": "12"}, "account_kind_number_idx"),
+            "type_and_balance": ({"account_type": AccountType.savings, "min_balance": 0}, "account_kind_number_idx"),
+        }
+        cursors = {"first_page": {}, "next_page": {"after": 1, "after_balance": decimal.Decimal(5)}}
+
+        for name, (filters, index_name) in expected_indexes.items():
+            for page, cursor in cursors.items():
+                for queryset in AccountSearch(**filters).get_querysets(**cursor):
+                    with self.subTest(name, page=page):
+                        plan = queryset[:51].explain()
+
+                        # The overdrawn index is partial, so scanning it only reads the matching rows.
+                        self.assertNotRegex(plan, r"SCAN (?!accounts_account USING INDEX account_overdrawn_idx)")
+                        self.assertNotIn("TEMP B-TREE", plan)
+                        self.assertRegex(plan, rf"(SEARCH|SCAN) accounts_account USING (COVERING )?INDEX {index_name}")
+
+
+class BalanceCheckpointTestCase(TransactionTestCase):
+    def setUp(self):
+        self.dummy_regular_account = Account.objects.create(number=100, balance=100)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200)
+
+        self.dummy_regular_account.deposit(decimal.Decimal("50.10"))
+        self.dummy_regular_account.withdraw(decimal.Decimal("20.05"))
+        Account.transfer(30, self.dummy_regular_account, self.dummy_bonus_account)
+        self.dummy_regular_account.deposit(decimal.Decimal("0.33"))
+
+        days = [1, 2, 2, 2, 3]
+
+        for entry, day in zip(LedgerEntry.objects.order_by("id"), days):
+            LedgerEntry.objects.filter(pk=entry.pk).update(
+                created_at=datetime.datetime(2026, 1, day, 10, tzinfo=datetime.timezone.utc),
+            )
+
+        Account.objects.update(created_at=datetime.datetime(2025, 12, 31, tzinfo=datetime.timezone.utc))
+
+    def balances_at_end_of(self, day):
+        return get_balances_as_of([100, 200, 999], get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, day)))
+
+    def test_period_ends(self):
+        self.assertEqual(
+            get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 31)),
+            datetime.datetime(2026, 2, 1, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(
+            get_period_end(CheckpointPeriod.month, datetime.date(2026, 12, 15)),
+            datetime.datetime(2027, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(
+            get_last_period_end(CheckpointPeriod.month, datetime.datetime(2026, 3, 1, 5, tzinfo=datetime.timezone.utc)),
+            datetime.datetime(2026, 3, 1, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_balances_without_checkpoints_revert_later_entries(self):
+        self.assertEqual(
+            get_balances_as_of([100], datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)),
+            {100: 100},
+        )
+        self.assertEqual(self.balances_at_end_of(1), {100: decimal.Decimal("150.10"), 200: 0})
+        self.assertEqual(self.balances_at_end_of(2), {100: decimal.Decimal("100.05"), 200: 30})
+        self.assertEqual(self.balances_at_end_of(3), {100: decimal.Decimal("100.38"), 200: 30})
+
+    def test_balances_replay_entries_after_the_checkpoint(self):
+        stdout = io.StringIO()
+        call_command("create_balance_checkpoints", "--date", "2026-01-01", "--chunk-size", "1", stdout=stdout)
+        call_command("create_balance_checkpoints", "--date", "2026-01-01", stdout=stdout)
+
+        self.assertIn("Wrote 2 checkpoints", stdout.getvalue())
+        self.assertIn("Wrote 0 checkpoints", stdout.getvalue())
+        self.assertEqual(
+            sorted(BalanceCheckpoint.objects.values_list("account__number", "balance")),
+            [(100, decimal.Decimal("150.10")), (200, 0)],
+        )
+
+        self.assertEqual(self.balances_at_end_of(2), {100: decimal.Decimal("100.05"), 200: 30})
+
+        BalanceCheckpoint.objects.filter(account__number=100).update(balance=F("balance") + 1)
+
+        self.assertEqual(self.balances_at_end_of(2)[100], decimal.Decimal("101.05"))
+        self.assertEqual(self.balances_at_end_of(3)[100], decimal.Decimal("101.38"))
+
+    def test_accounts_opened_later_have_no_earlier_balance(self):
+        SavingsAccount.objects.create(number=300, balance=500)
+        Account.objects.filter(number=300).update(
+            created_at=datetime.datetime(2026, 1, 2, 9, tzinfo=datetime.timezone.utc),
+        )
+        Account.objects.filter(number=200).update(created_at=None)
+
+        self.assertEqual(
+            get_balances_as_of([100, 200, 300], get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 1))),
+            {100: decimal.Decimal("150.10"), 200: 0},
+        )
+        self.assertEqual(
+            get_balances_as_of([300], get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 2))),
+            {300: 500},
+        )
+
+        CheckpointWriter().write(get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 1)))
+        CheckpointWriter().write(get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 2)))
+
+        self.assertEqual(
+            sorted(BalanceCheckpoint.objects.filter(account__number=300).values_list("period_end__day", "balance")),
+            [(3, 500)],
+        )
+        self.assertEqual(BalanceCheckpoint.objects.filter(account__number=200).count(), 2)
+
+    def test_checkpoints_are_built_on_previous_checkpoints(self):
+        CheckpointWriter().write(get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 1)))
+        CheckpointWriter().write(get_period_end(CheckpointPeriod.day, datetime.date(2026, 1, 2)))
+
+        checkpoint = BalanceCheckpoint.objects.get(account__number=100, period_end__day=3)
+
+        self.assertEqual(checkpoint.balance, decimal.Decimal("100.05"))
+        self.assertEqual(checkpoint.last_entry_id, LedgerEntry.objects.get(kind=LedgerEntryKind.transfer_out).id)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.balances_at_end_of(3), {100: decimal.Decimal("100.38"), 200: 30})
+
+
+class PortfolioSummaryTestCase(TransactionTestCase):
+    def setUp(self):
+        self.dummy_regular_account = Account.objects.create(number=100, balance=50)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200, balance=500)
+        self.dummy_savings_account = SavingsAccount.objects.create(number=300, balance=1000)
+
+    def assertSummaryMatchesAccounts(self):
+        self.assertEqual(read_summary(), compute_summary())
+
+    def test_creation_is_counted(self):
+        self.assertEqual(read_summary(), {
+            "simple": {"accounts": 1, "total_balance": 50, "overdrawn_accounts": 0, "total_points": 0},
+            "bonus": {"accounts": 1, "total_balance": 500, "overdrawn_accounts": 0, "total_points": 10},
+            "savings": {"accounts": 1, "total_balance": 1000, "overdrawn_accounts": 0, "total_points": 0},
+        })
+
+        bulk_create_accounts([Account(number=101, balance=-20), BonusAccount(number=201, points=3)])
+
+        self.assertEqual(read_summary()["simple"]["overdrawn_accounts"], 1)
+        self.assertSummaryMatchesAccounts()
+
+    def test_balance_changes_are_applied_incrementally(self):
+        self.dummy_regular_account.withdraw(decimal.Decimal("80.25"))
+        self.assertEqual(read_summary()["simple"]["overdrawn_accounts"], 1)
+
+        self.dummy_bonus_account.deposit(250)
+        Account.transfer(300, self.dummy_bonus_account, self.dummy_regular_account)
+        Account.transfer(100, self.dummy_savings_account, self.dummy_bonus_account)
+        self.assertEqual(read_summary()["simple"]["overdrawn_accounts"], 0)
+
+        SavingsAccount.generate_yield_for_savings_accounts(decimal.Decimal("0.10"))
+        BatchProcessor([
+            BatchOperation(type=BatchOperationType.deposit, account=200, amount=decimal.Decimal("180.00")),
+            BatchOperation(type=BatchOperationType.withdraw, account=100, amount=decimal.Decimal("999.00")),
+            BatchOperation(type=BatchOperationType.transfer, account=300, to_account=100, amount=decimal.Decimal("10.00")),
+        ], mode=BatchMode.best_effort).run()
+        DepositCoalescer().flush(200, [CoalescedDeposit(200, decimal.Decimal(amount)) for amount in [120, 99]])
+
+        self.assertSummaryMatchesAccounts()
+        self.assertEqual(read_summary()["bonus"]["total_points"], compute_summary()["bonus"]["total_points"])
+
+    def test_failed_operations_leave_the_summary_untouched(self):
+        summary = read_summary()
+
+        with self.assertRaises(InsufficientBalance):
+            Account.transfer(5000, self.dummy_savings_account, self.dummy_regular_account)
+
+        self.assertEqual(read_summary(), summary)
+
+    def test_deletes_are_counted(self):
+        Account.objects.get_by_number(200).delete()
+        Account.objects.filter(number__in=[100, 300]).delete()
+
+        self.assertEqual(get_totals(read_summary()), {"accounts": 0, "total_balance": 0, "overdrawn_accounts": 0, "total_points": 0})
+
+    def test_command_reports_and_rebuilds_drift(self):
+        PortfolioSummary.objects.filter(account_type="bonus", slot=0).update(total_points=F("total_points") + 5)
+
+        stdout = io.StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command("portfolio_summary", stdout=stdout)
+
+        self.assertIn("bonus total_points: summary 15, accounts 10", stdout.getvalue())
+
+        call_command("portfolio_summary", "--rebuild", stdout=stdout)
+        call_command("portfolio_summary", stdout=stdout)
+
+        self.assertIn("Portfolio summary matches the accounts.", stdout.getvalue())
+        self.assertSummaryMatchesAccounts()
+
+
+class ExportAccountsTestCase(TransactionTestCase):
+    def setUp(self):
+        Account.objects.create(number=1, balance=10)
+        BonusAccount.objects.create(number=2, balance=20)
+        SavingsAccount.objects.create(number=3, balance=30)
+
+    def test_export_command_writes_filtered_ndjson(self):
+        stdout = io.StringIO()
+
+        call_command("export_accounts", "--format", "ndjson", "--type", "bonus", "--chunk-size", "1", stdout=stdout)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual(rows, [{
+            "id": str(BonusAccount.objects.get().id),
+            "number": 2,
+            "type": "bonus",
+            "balance": "20.00",
+            "points": 10,
+        }])
+
+    def test_export_command_writes_csv(self):
+        stdout = io.StringIO()
+
+        call_command("export_accounts", "--max-balance", "20", stdout=stdout)
+
+        self.assertEqual(
+            [line.split(",")[1:] for line in stdout.getvalue().splitlines()],
+            [["number", "type", "balance", "points"], ["1", "simple", "10.00", ""], ["2", "bonus", "20.00", "10"]],
+        )
+
+
+class ImportAccountsTestCase(TransactionTestCase):
+    def test_import_command_inserts_in_batches(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as source:
+            source.write("number,type,balance,points\n")
+            source.writelines(f"{number},{['simple', 'bonus', 'savings'][number % 3]},{number},\n" for number in range(1, 11))
+            source.write("4,simple,0,\n")
+            source.flush()
+
+            stdout, stderr = io.StringIO(), io.StringIO()
+
+            with CaptureQueriesContext(connection) as queries:
+                call_command("import_accounts", source.name, "--batch-size", "5", stdout=stdout, stderr=stderr)
+
+        inserts = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+
+        self.assertEqual(Account.objects.count(), 10)
+        self.assertEqual(BonusAccount.objects.count(), 4)
+        self.assertEqual(SavingsAccount.objects.count(), 3)
+        self.assertLessEqual(len(inserts), 3 * 3)
+        self.assertIn("Created 10 accounts, skipped 1 duplicates", stdout.getvalue())
+        self.assertIn("Duplicate account number 4.", stderr.getvalue())
+
+
+class BenchmarkSuiteTestCase(TransactionTestCase):
+    def test_suite_reports_every_scenario_and_cleans_up(self):
+        report = BenchmarkSuite(size=30, iterations=3).run()
+
+        self.assertEqual(set(report["results"]), set(BenchmarkSuite(size=0).get_scenarios()))
+        self.assertEqual(report["results"]["get_account_by_number"]["queries_per_op"], 1)
+        self.assertFalse(Account.objects.exists())
+
+        comparison = compare_results(report, report)
+
+        self.assertEqual(comparison["get_account_by_number"]["p50_ms"], 1)
+
+    def test_yield_scenarios_leave_existing_accounts_and_runs_alone(self):
+        savings_account = SavingsAccount.objects.create(number=1, balance=100)
+        queued_run = YieldRun.objects.create(reference="2026-10", tax=decimal.Decimal("10"))
+
+        with self.assertRaises(RuntimeError):
+            BenchmarkSuite(size=30, iterations=1).run(["api_yields"])
+
+        report = BenchmarkSuite(size=30, iterations=1).run(["get_account_by_number"])
+
+        self.assertEqual(set(report["results"]), {"get_account_by_number"})
+
+        BenchmarkSuite(size=30, iterations=1, force=True).run(["api_yields"])
+
+        queued_run.refresh_from_db()
+
+        self.assertEqual(queued_run.status, YieldRunStatus.pending)
+        self.assertEqual(list(YieldRun.objects.all()), [queued_run])
+        self.assertEqual(list(Account.objects.all()), [savings_account.account_ptr])
+
+    def test_serialization_benchmark_times_both_paths_and_cleans_up(self):
+        results = run_serialization_benchmark(accounts=30)
+
+        self.assertEqual(
+            [(result.payload, result.path, result.rows) for result in results],
+            [
+                ("list", "model_serializer", 30),
+                ("list", "values_rows", 30),
+                ("detail", "model_serializer", 30),
+                ("detail", "values_rows", 30),
+            ],
+        )
+        self.assertFalse(Account.objects.exists())
+
+
+class FlatAccountLayoutTestCase(TransactionTestCase):
+    def setUp(self):
+        FlatAccount.objects.create(number=100, balance=500)
+        FlatBonusAccount.objects.create(number=200, balance=500)
+        FlatSavingsAccount.objects.create(number=300, balance=500)
+
+    def test_rows_load_as_the_proxy_of_their_type(self):
+        accounts = {account.number: account for account in FlatAccount.objects.all()}
+
+        self.assertIs(type(accounts[100]), FlatAccount)
+        self.assertIs(type(accounts[200]), FlatBonusAccount)
+        self.assertIs(type(accounts[300]), FlatSavingsAccount)
+        self.assertEqual(accounts[200].points, 10)
+        self.assertIsNone(accounts[300].points)
+        self.assertEqual(list(FlatBonusAccount.objects.values_list("number", flat=True)), [200])
+
+    def test_bonus_deposit_locks_and_updates_one_row(self):
+        account = FlatAccount.objects.get(number=200)
+
+        with CaptureQueriesContext(connection) as queries:
+            account.deposit(250)
+
+        statements = [
+            query["sql"] for query in queries.captured_queries
+            if not query["sql"].startswith("BEGIN") and query["sql"] != "COMMIT"
+        ]
+
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(statements[1].startswith('UPDATE "accounts_flataccount"'))
+        self.assertEqual(FlatAccount.objects.get(number=200).points, 12)
+
+    def test_writes_from_stale_instances_are_not_lost(self):
+        first = FlatAccount.objects.get(number=300)
+        second = FlatAccount.objects.get(number=300)
+
+        first.deposit(100)
+        second.withdraw(50)
+        first.deposit(25)
+
+        self.assertEqual(second.balance, 550)
+        self.assertEqual(first.balance, 575)
+        self.assertEqual(FlatAccount.objects.get(number=300).balance, 575)
+
+        with self.assertRaises(InsufficientBalance):
+            second.withdraw(576)
+
+    def test_withdraw_keeps_the_minimum_balance_rules(self):
+        FlatAccount.objects.get(number=100).withdraw(1500)
+
+        with self.assertRaises(InsufficientBalance):
+            FlatAccount.objects.get(number=300).withdraw(501)
+
+        with self.assertRaises(NegativeTransaction):
+            FlatAccount.objects.get(number=300).withdraw(-1)
+
+        self.assertEqual(FlatAccount.objects.get(number=100).balance, -1000)
+
+    def test_transfer_credits_bonus_points(self):
+        FlatAccount.transfer(300, FlatAccount.objects.get(number=300), FlatAccount.objects.get(number=200))
+
+        self.assertEqual(FlatAccount.objects.get(number=300).balance, 200)
+        self.assertEqual(FlatAccount.objects.get(number=200).balance, 800)
+        self.assertEqual(FlatAccount.objects.get(number=200).points, 12)
+
+        with self.assertRaises(InsufficientBalance):
+            FlatAccount.transfer(201, FlatAccount.objects.get(number=300), FlatAccount.objects.get(number=200))
+
+    def test_data_migration_copies_the_multi_table_accounts(self):
+        FlatAccount.objects.all().delete()
+        bulk_create_accounts([
+            Account(number=1, balance=10),
+            BonusAccount(number=2, balance=20, points=15),
+            SavingsAccount(number=3, balance=30),
+        ])
+
+        migration = importlib.import_module("accounts.migrations.0009_copy_accounts_to_flataccount")
+
+        with connection.schema_editor() as schema_editor:
+            migration.copy_accounts_to_flataccount(apps, schema_editor)
+
+        self.assertEqual(
+            list(FlatAccount.objects.order_by("number").values_list("id", "number", "balance", "type", "points")),
+            [
+                (Account.objects.get(number=1).id, 1, 10, "simple", None),
+                (Account.objects.get(number=2).id, 2, 20, "bonus", 15),
+                (Account.objects.get(number=3).id, 3, 30, "savings", None),
+            ],
+        )
+
+    def test_layout_benchmark_measures_both_layouts_and_cleans_up(self):
+        results = LayoutBenchmark(size=30, iterations=3).run()
+
+        self.assertEqual(set(results), {"multi_table", "single_table"})
+        self.assertEqual(results["single_table"]["lookup_by_number"].queries, 3)
+        self.assertEqual(Account.objects.count(), 0)
+        self.assertEqual(FlatAccount.objects.count(), 3)
+        self.assertFalse(LedgerEntry.objects.exists())
+        self.assertEqual(read_summary(), compute_summary())
+
+
 class DepositTestCase(TransactionTestCase):
     def setUp(self):
         self.dummy_regular_account = Account.objects.create(number=100)
@@ -148,6 +854,85 @@ class DepositTestCase(TransactionTestCase):
             self.dummy_bonus_account.deposit(test_list[i][2])
 
 
+class SingleWriteTransactionTestCase(TransactionTestCase):
+    def setUp(self):
+        Account.objects.create(number=100, balance=500)
+        BonusAccount.objects.create(number=200, balance=500)
+        SavingsAccount.objects.create(number=300, balance=500)
+
+    def get_statements(self, queries):
+        return [
+            query["sql"] for query in queries.captured_queries
+            if not query["sql"].startswith("BEGIN") and query["sql"] != "COMMIT"
+        ]
+
+    def get_updated_tables(self, queries):
+        return [
+            statement.split()[1].strip('"')
+            for statement in self.get_statements(queries)
+            if statement.startswith("UPDATE")
+        ]
+
+    def test_deposit_writes_each_changed_table_once(self):
+        expected_updated_tables = {
+            100: ["accounts_account", "accounts_portfoliosummary"],
+            200: ["accounts_account", "accounts_bonusaccount", "accounts_portfoliosummary"],
+            300: ["accounts_account", "accounts_portfoliosummary"],
+        }
+
+        for number, updated_tables in expected_updated_tables.items():
+            account = Account.objects.get_by_number(number)
+
+            with CaptureQueriesContext(connection) as queries:
+                account.deposit(150)
+
+            self.assertEqual(self.get_updated_tables(queries), updated_tables)
+            # The locking read, one UPDATE per changed table, including the summary, and the ledger entry.
+            self.assertEqual(len(self.get_statements(queries)), len(updated_tables) + 2)
+
+    def test_withdraw_writes_only_balance(self):
+        for number in [100, 200, 300]:
+            account = Account.objects.get_by_number(number)
+
+            with CaptureQueriesContext(connection) as queries:
+                account.withdraw(100)
+
+            self.assertEqual(self.get_updated_tables(queries), ["accounts_account", "accounts_portfoliosummary"])
+            self.assertEqual(len(self.get_statements(queries)), 4)
+            self.assertNotIn('"number"', self.get_statements(queries)[1])
+
+    def test_bonus_deposit_persists_balance_and_points(self):
+        account = Account.objects.get_by_number(200)
+        account.deposit(250)
+
+        account = Account.objects.get_by_number(200)
+
+        self.assertEqual(account.balance, 750)
+        self.assertEqual(account.points, 12)
+
+    def test_unchanged_account_save_does_not_write(self):
+        account = Account.objects.get_by_number(200)
+
+        with self.assertNumQueries(0):
+            account.save()
+
+    def test_save_after_refresh_compares_with_the_refreshed_values(self):
+        account = Account.objects.get(number=100)
+        account.balance = 250
+        account.save()
+
+        Account.objects.get(number=100).deposit(100)
+        account.refresh_from_db()
+
+        self.assertEqual(account.balance, 350)
+
+        account.balance = 250
+        account.save()
+
+        self.assertEqual(Account.objects.get(number=100).balance, 250)
+        self.assertEqual(read_summary(), compute_summary())
+
+
 class WithdrawTestCase(TransactionTestCase):
     def setUp(self):
         self.dummy_regular_account = Account.objects.create(number=100)
@@ -207,6 +992,182 @@ class TransferTestCase(TransactionTestCase):
             self.dummy_regular_account.transfer(test_list[i][2], self.dummy_regular_account, self.dummy_bonus_account)
 
 
+class AtomicTransferTestCase(TransactionTestCase):
+    def setUp(self):
+        self.dummy_regular_account = Account.objects.create(number=100, balance=500)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200)
+
+    def test_transfer_does_not_lose_concurrent_updates(self):
+        stale_account = Account.objects.get(number=100)
+
+        Account.objects.get(number=100).deposit(100)
+
+        Account.transfer(50, stale_account, self.dummy_bonus_account)
+
+        self.assertEqual(stale_account.balance, 550)
+        self.assertEqual(Account.objects.get(number=100).balance, 550)
+        self.assertEqual(BonusAccount.objects.get(number=200).balance, 50)
+
+    def test_failed_transfer_rolls_back_both_accounts(self):
+        with self.assertRaises(InsufficientBalance):
+            Account.transfer(2000, self.dummy_regular_account, self.dummy_bonus_account)
+
+        self.assertEqual(Account.objects.get(number=100).balance, 500)
+        self.assertEqual(BonusAccount.objects.get(number=200).balance, 0)
+        self.assertEqual(BonusAccount.objects.get(number=200).points, 10)
+        self.assertFalse(LedgerEntry.objects.exists())
+
+    def test_transfer_benchmark_conserves_balances(self):
+        result = run_transfer_benchmark(accounts=10, threads=1, transfers_per_thread=50)
+
+        self.assertEqual(result.completed + result.rejected + result.failed, 50)
+        self.assertTrue(result.conserved)
+        self.assertEqual(Account.objects.count(), 2)
+        self.assertEqual(read_summary(), compute_summary())
+
+    def test_deposit_and_withdraw_do_not_lose_concurrent_updates(self):
+        stale_account = Account.objects.get_by_number(200)
+
+        Account.objects.get_by_number(200).deposit(300)
+        stale_account.deposit(100)
+
+        self.assertEqual(stale_account.balance, 400)
+        self.assertEqual(stale_account.points, 14)
+
+        stale_account = Account.objects.get_by_number(100)
+        Account.objects.get_by_number(100).withdraw(400)
+
+        with self.assertRaises(InsufficientBalance):
+            stale_account.withdraw(1200)
+
+        account = Account.objects.get_by_number(200)
+
+        self.assertEqual((account.balance, account.points), (400, 14))
+        self.assertEqual(Account.objects.get(number=100).balance, 100)
+
+    def test_deposit_benchmark_accounts_for_every_deposit(self):
+        result = run_transfer_benchmark(accounts=10, threads=1, transfers_per_thread=20, operation="deposit")
+
+        self.assertEqual(result.completed, 20)
+        self.assertTrue(result.conserved)
+        self.assertEqual(read_summary(), compute_summary())
+
+
+class DepositCoalescingTestCase(TransactionTestCase):
+    def setUp(self):
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200)
+
+    def deposit_concurrently(self, coalescer, number, amounts):
+        results = [None] * len(amounts)
+
+        def deposit(index, amount):
+            try:
+                results[index] = coalescer.deposit(number, amount)
+            except Exception as err:
+                results[index] = err
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=deposit, args=(index, amount)) for index, amount in enumerate(amounts)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_concurrent_deposits_are_combined_and_acknowledged_individually(self):
+        coalescer = DepositCoalescer(window=5, max_batch=5)
+
+        acknowledgements = self.deposit_concurrently(coalescer, 200, [60, 60, 60, 60, 60])
+
+        self.assertEqual([acknowledgement.batch_size for acknowledgement in acknowledgements], [5] * 5)
+        self.assertEqual(
+            sorted(acknowledgement.balance for acknowledgement in acknowledgements),
+            [60, 120, 180, 240, 300],
+        )
+
+        account = Account.objects.get_by_number(200)
+
+        self.assertEqual((account.balance, account.points), (300, 10))
+        self.assertEqual(
+            sorted(LedgerEntry.objects.filter(kind=LedgerEntryKind.deposit).values_list("balance", flat=True)),
+            [60, 120, 180, 240, 300],
+        )
+
+    def test_batch_is_written_with_one_update_per_table(self):
+        deposits = [CoalescedDeposit(200, decimal.Decimal(amount)) for amount in [150, 250, 99]]
+
+        with CaptureQueriesContext(connection) as queries:
+            DepositCoalescer().flush(200, deposits)
+
+        statements = [query["sql"].split()[0] for query in queries.captured_queries]
+
+        # The account and bonus account tables, and the portfolio summary.
+        self.assertEqual(statements.count("UPDATE"), 3)
+        self.assertEqual(statements.count("INSERT"), 1)
+
+        account = Account.objects.get_by_number(200)
+
+        self.assertEqual(account.balance, 499)
+        self.assertEqual(account.points, 10 + 1 + 2 + 0)
+        self.assertEqual([deposit.balance for deposit in deposits], [150, 400, 499])
+
+    def test_deposit_inside_a_transaction_is_written_immediately(self):
+        with transaction.atomic():
+            acknowledgement = DepositCoalescer(window=5).deposit(200, 100)
+
+        self.assertEqual((acknowledgement.balance, acknowledgement.batch_size), (100, 1))
+        self.assertEqual(Account.objects.get_by_number(200).points, 11)
+
+    def test_errors_reach_every_caller(self):
+        coalescer = DepositCoalescer(window=5, max_batch=3)
+
+        results = self.deposit_concurrently(coalescer, 999, [10, 20, 30])
+
+        self.assertTrue(all(isinstance(result, Account.DoesNotExist) for result in results))
+
+        with self.assertRaises(NegativeTransaction):
+            coalescer.deposit(200, -10)
+
+        self.assertFalse(LedgerEntry.objects.exists())
+
+
+class DatabaseProfileTestCase(TransactionTestCase):
+    def test_tuned_sqlite_profile_applies_pragmas_on_connect(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = get_database(pathlib.Path(directory), "sqlite-tuned")
+
+            self.assertTrue(database["CONN_HEALTH_CHECKS"])
+            self.assertGreater(database["CONN_MAX_AGE"], 0)
+
+            tuned_connection = ConnectionHandler({"default": database})["default"]
+
+            try:
+                with tuned_connection.cursor() as cursor:
+                    pragmas = {}
+
+                    for pragma in ["journal_mode", "synchronous", "busy_timeout", "cache_size"]:
+                        cursor.execute(f"PRAGMA {pragma}")
+                        pragmas[pragma] = cursor.fetchone()[0]
+
+                with CaptureQueriesContext(tuned_connection) as queries:
+                    tuned_connection.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+                    tuned_connection.rollback()
+                    tuned_connection.set_autocommit(True)
+            finally:
+                tuned_connection.close()
+
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "cache_size": -65536})
+        self.assertEqual(queries.captured_queries[0]["sql"], "BEGIN IMMEDIATE")
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_database(pathlib.Path("."), "oracle")
+
+
 class YieldsTestCase(TransactionTestCase):
     def setUp(self):
         self.number_balance_mapping = [
@@ -258,10 +1219,308 @@ class YieldsTestCase(TransactionTestCase):
             
             self.assertEqual(account.balance, initial_balance)
     
+    def test_generate_yields_reports_accounts_and_total_yield(self):
+        for number, initial_balance in self.number_balance_mapping:
+            SavingsAccount.objects.create(number=number, balance=initial_balance)
+
+        Account.objects.create(number=4, balance=decimal.Decimal(400.0))
+
+        yield_run = SavingsAccount.generate_yield_for_savings_accounts(taxes=10, chunk_size=2)
+
+        self.assertEqual(yield_run.status, YieldRunStatus.completed)
+        self.assertEqual(yield_run.accounts_processed, 3)
+        self.assertEqual(yield_run.total_yield, decimal.Decimal(60.0))
+
+    def test_interrupted_yield_run_resumes_from_last_chunk(self):
+        for number, initial_balance in self.number_balance_mapping:
+            SavingsAccount.objects.create(number=number, balance=initial_balance)
+
+        engine = YieldEngine.start(decimal.Decimal(10.0), reference="2026-10", chunk_size=2)
+        engine.process_next_chunk()
+
+        self.assertEqual(engine.yield_run.accounts_processed, 2)
+
+        yield_run = SavingsAccount.generate_yield_for_savings_accounts(taxes=10, reference="2026-10", chunk_size=2)
+
+        self.assertEqual(yield_run.accounts_processed, 3)
+        self.assertEqual(yield_run.total_yield, decimal.Decimal(60.0))
+
+        for number, initial_balance in self.number_balance_mapping:
+            account = SavingsAccount.objects.get(number=number)
+
+            self.assertEqual(account.balance, initial_balance * decimal.Decimal("1.1"))
+
+        yield_run = SavingsAccount.generate_yield_for_savings_accounts(taxes=10, reference="2026-10")
+
+        self.assertEqual(yield_run.accounts_processed, 3)
+        self.assertEqual(SavingsAccount.objects.get(number=1).balance, decimal.Decimal(110.0))
+        self.assertEqual(LedgerEntry.objects.filter(kind=LedgerEntryKind.yields).count(), 3)
+
+    def test_yield_run_only_resumes_with_its_tax(self):
+        SavingsAccount.objects.create(number=1, balance=100)
+        SavingsAccount.objects.create(number=2, balance=100)
+
+        YieldEngine.start(decimal.Decimal("10.00"), reference="2026-10", chunk_size=1).process_next_chunk()
+
+        with self.assertRaises(DuplicateYieldRun):
+            SavingsAccount.generate_yield_for_savings_accounts(taxes=20, reference="2026-10")
+
+        with self.assertRaises(CommandError):
+            call_command("generate_yields", "20", "--reference", "2026-10", stdout=io.StringIO())
+
+        yield_run = SavingsAccount.generate_yield_for_savings_accounts(taxes=10, reference="2026-10")
+
+        self.assertEqual(yield_run.accounts_processed, 2)
+        self.assertEqual(
+            list(SavingsAccount.objects.order_by("number").values_list("balance", flat=True)),
+            [decimal.Decimal(110), decimal.Decimal(110)],
+        )
+
     def test_simple_account_does_not_have_yields_feature(self):
         with self.assertRaises(AttributeError):
             Account.generate_yield_for_savings_accounts(taxes=10)
 
     def test_bonus_account_does_not_have_yields_feature(self):
         with self.assertRaises(AttributeError):
-            BonusAccount.generate_yield_for_savings_accounts(taxes=10)
\ No newline at end of file
+            BonusAccount.generate_yield_for_savings_accounts(taxes=10)
+
+
+class ParallelYieldTestCase(TransactionTestCase):
+    def setUp(self):
+        for number in range(1, 12):
+            SavingsAccount.objects.create(number=number, balance=decimal.Decimal(number * 137) / 7)
+
+        Account.objects.create(number=100, balance=100)
+
+    def get_balances(self):
+        return list(Account.objects.order_by("number").values_list("number", "balance"))
+
+    def run_and_reset(self, run):
+        initial_balances = self.get_balances()
+        yield_run = run()
+        balances = self.get_balances()
+
+        for number, balance in initial_balances:
+            Account.objects.filter(number=number).update(balance=balance)
+
+        return yield_run, balances
+
+    def test_parallel_run_matches_sequential_run_to_the_cent(self):
+        sequential, sequential_balances = self.run_and_reset(
+            lambda: SavingsAccount.generate_yield_for_savings_accounts(taxes=decimal.Decimal("3.33"), chunk_size=2)
+        )
+
+        for workers in [2, 3, 5]:
+            parallel, parallel_balances = self.run_and_reset(
+                lambda: ParallelYieldEngine.start(decimal.Decimal("3.33"), workers, chunk_size=2).run()
+            )
+
+            self.assertEqual(parallel.status, YieldRunStatus.completed)
+            self.assertEqual(parallel.accounts_processed, 11)
+            self.assertEqual(parallel.total_yield, sequential.total_yield)
+            self.assertEqual(parallel_balances, sequential_balances)
+            self.assertEqual(parallel.partitions.count(), workers)
+
+        self.assertEqual(LedgerEntry.objects.filter(kind=LedgerEntryKind.yields).count(), 11 * 4)
+
+    def test_partitions_are_disjoint_and_cover_every_savings_account(self):
+        engine = ParallelYieldEngine.start(decimal.Decimal("1.00"), 4, reference="2026-10")
+        partitions = engine.create_partitions()
+        ids = list(SavingsAccount.objects.order_by("pk").values_list("pk", flat=True))
+
+        self.assertIsNone(partitions[0].lower_account_id)
+        self.assertIsNone(partitions[-1].upper_account_id)
+
+        for previous, partition in zip(partitions, partitions[1:]):
+            self.assertEqual(partition.lower_account_id, previous.upper_account_id)
+
+        self.assertEqual([ids.index(partition.upper_account_id) for partition in partitions[:-1]], [1, 4, 7])
+        self.assertEqual(engine.create_partitions(), partitions)
+
+    def test_interrupted_parallel_run_resumes_without_crediting_twice(self):
+        engine = YieldEngine.start(decimal.Decimal("10.00"), reference="2026-10", chunk_size=3)
+        engine.process_next_chunk()
+
+        engine = ParallelYieldEngine(engine.yield_run, 3, chunk_size=2)
+        partitions = engine.create_partitions()
+        run_partition(partitions[1].pk, chunk_size=2)
+
+        self.assertEqual(partitions[0].status, YieldRunStatus.completed)
+        self.assertEqual(partitions[0].accounts_processed, 3)
+
+        yield_run = SavingsAccount.generate_yield_for_savings_accounts(taxes=10, reference="2026-10")
+
+        self.assertEqual(yield_run.status, YieldRunStatus.completed)
+        self.assertEqual(yield_run.accounts_processed, 11)
+        self.assertEqual(LedgerEntry.objects.filter(kind=LedgerEntryKind.yields).count(), 11)
+        self.assertEqual(SavingsAccount.objects.get(number=7).balance, decimal.Decimal("150.70"))
+
+    def test_generate_yields_command_with_workers(self):
+        output = io.StringIO()
+        call_command("generate_yields", "10", "--workers", "3", "--reference", "2026-10", stdout=output)
+
+        self.assertIn("completed: 11 accounts", output.getvalue())
+        self.assertEqual(YieldRun.objects.get().partitions.count(), 3)
+
+    def test_yield_scaling_benchmark_matches_sequential_run_and_cleans_up(self):
+        SavingsAccount.objects.all().delete()
+
+        results = YieldScalingBenchmark(accounts=12, workers=[1, 3], chunk_size=5).run()
+
+        self.assertEqual([result.workers for result in results], [0, 1, 3])
+        self.assertTrue(all(result.matches_sequential and result.accounts == 12 for result in results))
+        self.assertFalse(SavingsAccount.objects.exists())
+        self.assertFalse(YieldRun.objects.exists())
+
+
+class YieldJobTestCase(TransactionTestCase):
+    def setUp(self):
+        SavingsAccount.objects.create(number=1, balance=100)
+        SavingsAccount.objects.create(number=2, balance=200)
+
+    def test_submitted_run_is_queued_until_a_worker_runs_it(self):
+        yield_run = submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+
+        self.assertEqual(yield_run.status, YieldRunStatus.pending)
+        self.assertEqual(SavingsAccount.objects.get(number=1).balance, 100)
+
+        with self.assertRaises(DuplicateYieldRun):
+            submit_yield_run(decimal.Decimal("5.00"), reference="2026-10")
+
+        self.assertEqual(YieldWorker(chunk_size=1).run_pending(), 1)
+
+        yield_run.refresh_from_db()
+
+        self.assertEqual(yield_run.status, YieldRunStatus.completed)
+        self.assertEqual(yield_run.accounts_processed, 2)
+        self.assertEqual(yield_run.total_yield, decimal.Decimal("30.00"))
+        self.assertEqual(YieldWorker().run_pending(), 0)
+
+    def test_reference_defaults_to_the_current_period(self):
+        self.assertEqual(submit_yield_run(decimal.Decimal("1.00")).reference, get_current_period())
+
+    def test_failed_run_is_recorded_and_can_be_resubmitted(self):
+        submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+
+        with unittest.mock.patch.object(YieldEngine, "process_next_chunk", side_effect=RuntimeError("disk full")):
+            YieldWorker().run_pending()
+
+        yield_run = YieldRun.objects.get(reference="2026-10")
+
+        self.assertEqual(yield_run.status, YieldRunStatus.failed)
+        self.assertEqual(yield_run.error, "RuntimeError: disk full")
+
+        with self.assertRaisesMessage(DuplicateYieldRun, "used a tax of 10.00%"):
+            submit_yield_run(decimal.Decimal("12.00"), reference="2026-10")
+
+        yield_run.refresh_from_db()
+
+        self.assertEqual(yield_run.status, YieldRunStatus.failed)
+        self.assertEqual(yield_run.tax, decimal.Decimal("10.00"))
+
+        submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+        YieldWorker().run_pending()
+
+        yield_run.refresh_from_db()
+
+        self.assertEqual(yield_run.status, YieldRunStatus.completed)
+        self.assertEqual(yield_run.error, "")
+        self.assertEqual(SavingsAccount.objects.get(number=2).balance, 220)
+
+    def test_stale_running_run_is_claimed_again(self):
+        yield_run = submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+        YieldRun.objects.filter(pk=yield_run.pk).update(status=YieldRunStatus.running)
+
+        self.assertIsNone(YieldWorker().claim())
+
+        YieldRun.objects.filter(pk=yield_run.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(seconds=600),
+        )
+
+        self.assertEqual(YieldWorker(lease=300).claim().pk, yield_run.pk)
+        self.assertIsNone(YieldWorker(lease=300).claim())
+
+    def test_parallel_run_keeps_its_lease_while_partitions_progress(self):
+        for number in range(3, 12):
+            SavingsAccount.objects.create(number=number, balance=100)
+
+        yield_run = submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+        worker = YieldWorker(chunk_size=1, lease=0.3, processes=2)
+        process_next_chunk = YieldEngine.process_next_chunk
+        reclaimed = []
+
+        def process_after_the_lease(engine):
+            reclaimed.append(YieldWorker(lease=300).claim())
+            YieldRun.objects.filter(pk=yield_run.pk).update(
+                updated_at=timezone.now() - datetime.timedelta(seconds=600),
+            )
+            time.sleep(0.1)
+
+            return process_next_chunk(engine)
+
+        with unittest.mock.patch.object(YieldEngine, "process_next_chunk", process_after_the_lease):
+            self.assertEqual(worker.run_pending(), 1)
+
+        yield_run.refresh_from_db()
+
+        self.assertEqual(yield_run.status, YieldRunStatus.completed)
+        self.assertEqual(yield_run.accounts_processed, 11)
+        self.assertGreater(len(reclaimed), 11)
+        self.assertEqual(reclaimed, [None] * len(reclaimed))
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "the run is submitted against a scratch SQLite file")
+    def test_default_configuration_completes_a_queued_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = pathlib.Path(directory) / "db.sqlite3"
+            environment = {**os.environ, "SYSBANKING_DB_NAME": str(database)}
+            manage = [sys.executable, str(settings.BASE_DIR / "manage.py")]
+
+            subprocess.run([*manage, "migrate"], env=environment, check=True, capture_output=True)
+            subprocess.run(
+                [
+                    *manage, "shell", "-c",
+                    "import decimal\n"
+                    "from accounts.jobs import submit_yield_run\n"
+                    "from accounts.models import SavingsAccount\n"
+                    "SavingsAccount.objects.create(number=1, balance=100)\n"
+                    "submit_yield_run(decimal.Decimal('10.00'), reference='2026-10')\n",
+                ],
+                env=environment,
+                check=True,
+                capture_output=True,
+            )
+
+            deadline = time.monotonic() + 60
+            run_status = None
+
+            with contextlib.closing(sqlite3.connect(database)) as scratch:
+                while run_status != YieldRunStatus.completed and time.monotonic() < deadline:
+                    time.sleep(0.2)
+                    run_status = scratch.execute("SELECT status FROM accounts_yieldrun").fetchone()[0]
+
+                balance = scratch.execute("SELECT balance FROM accounts_account").fetchone()[0]
+
+        self.assertEqual(run_status, YieldRunStatus.completed)
+        self.assertEqual(decimal.Decimal(str(balance)), 110)
+
+    def test_worker_command_runs_until_the_queue_is_empty(self):
+        submit_yield_run(decimal.Decimal("10.00"), reference="2026-10")
+        submit_yield_run(decimal.Decimal("10.00"), reference="2026-11")
+
+        output = io.StringIO()
+        call_command("run_yield_worker", "--until-empty", stdout=output)
+
+        self.assertIn("Ran 2 yield runs.", output.getvalue())
+        self.assertEqual(SavingsAccount.objects.get(number=1).balance, decimal.Decimal("121.00"))
+
+    def test_form_queues_a_run_and_rejects_duplicates(self):
+        response = self.client.post(reverse("accounts:yields"), {"tax": "10", "reference": "2026-10"})
+
+        self.assertRedirects(response, reverse("accounts:yields"))
+        self.assertEqual(YieldRun.objects.get().status, YieldRunStatus.pending)
+
+        response = self.client.post(reverse("accounts:yields"), {"tax": "10", "reference": "2026-10"})
+
+        self.assertContains(response, "already submitted")
+        self.assertContains(response, "2026-10")
+
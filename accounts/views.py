@@ -1,16 +1,21 @@
+import decimal
+
 from typing import Any
 from typing import Dict
 from typing import List
-from typing import Set
 from typing import Union
 from typing import Callable
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ValidationError
+from django.db.models.query import QuerySet
+from django.forms import BaseModelForm
 from django.http import HttpRequest
 from django.http import HttpResponse
 from django.http import HttpResponseRedirect
+from django.http import QueryDict
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import CreateView
@@ -18,6 +23,11 @@ from django.views.generic import DetailView
 from django.views.generic import ListView
 from django.views.generic import TemplateView
 
+from accounts.cache import account_cache
+from accounts.exceptions import AccountNumberUnavailable
+from accounts.exceptions import DuplicateYieldRun
+from accounts.jobs import get_current_period
+from accounts.jobs import submit_yield_run
 from accounts.mixins import CurrentYearMixin
 from accounts.mixins import GetAccountMultipleTypesMixin
 from accounts.mixins import TemplateTitleMixin
@@ -25,6 +35,10 @@ from accounts.mixins import TransactionValidationMixin
 from accounts.models import Account
 from accounts.models import BonusAccount
 from accounts.models import SavingsAccount
+from accounts.models import YieldRun
+from accounts.numbers import account_number_allocator
+from accounts.search import AccountSearch
+from accounts.search import AccountSearchForm
 
 
 class ListAccountView(CurrentYearMixin, TemplateTitleMixin, ListView):
@@ -33,27 +47,30 @@ class ListAccountView(CurrentYearMixin, TemplateTitleMixin, ListView):
     template_name: str = "accounts/list.html"
     template_title: str = "Account List"
 
-    def get_queryset(self) -> Set[Account | BonusAccount | SavingsAccount]:
-        simple_accounts: List[Account] = [
-            account for account in self.model.objects.filter(
-                bonusaccount__isnull=True,
-                savingsaccount__isnull=True,
-            )
-        ]
+    page_size: int = settings.ACCOUNTS_PAGE_SIZE
 
-        bonus_accounts: List[BonusAccount] = [
-            account for account in BonusAccount.objects.all()
-        ]
+    def get_queryset(self) -> List[Account | BonusAccount | SavingsAccount]:
+        accounts: QuerySet[Account] = self.model.objects.polymorphic().order_by("number")
 
-        savings_accounts: List[SavingsAccount] = [
-            account for account in SavingsAccount.objects.all()
-        ]
+        after: str | None = self.request.GET.get("after")
 
-        all_accounts: Set[Account | BonusAccount | SavingsAccount] = {
-            account for account in simple_accounts + bonus_accounts + savings_accounts
-        }
+        if after and after.isdigit():
+            accounts = accounts.filter(number__gt=after)
+
+        return [account.as_concrete() for account in accounts[:self.page_size + 1]]
+
+    def get_context_data(self, **kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        accounts: List[Account | BonusAccount | SavingsAccount] = self.object_list
+
+        context_data: Dict[str, Any] = super().get_context_data(
+            object_list=accounts[:self.page_size],
+            **kwargs,
+        )
 
-        return all_accounts
+        if len(accounts) > self.page_size:
+            context_data["next_after"] = accounts[self.page_size - 1].number
+
+        return context_data
 
 
 class DetailAccountView(CurrentYearMixin, GetAccountMultipleTypesMixin, TemplateTitleMixin, DetailView):
@@ -64,6 +81,9 @@ class DetailAccountView(CurrentYearMixin, GetAccountMultipleTypesMixin, Template
     template_name: str = "accounts/detail.html"
     template_title: str = "Account Details"
 
+    def get_object(self) -> Account | BonusAccount | SavingsAccount:
+        return account_cache.get_account(self.kwargs.get(self.slug_url_kwarg))
+
     def get_context_data(self: View, **kwargs: Dict[str, Any]) -> Dict[str, Any]:
         context_data: Dict[str, Any] = super().get_context_data(**kwargs)
 
@@ -90,6 +110,23 @@ class CreateAccountView(SuccessMessageMixin, CurrentYearMixin, TemplateTitleMixi
     def get_success_message(self, cleaned_data: Dict[str, str]) -> str:
         account: Account = self.object
         return f"Account Nº {account.number} was successfully created."
+
+    def get_form(self, form_class: type[BaseModelForm] | None = None) -> BaseModelForm:
+        form: BaseModelForm = super().get_form(form_class)
+        form.fields["number"].required = False
+
+        return form
+
+    def form_valid(self, form: BaseModelForm) -> HttpResponse:
+        if form.instance.number is None:
+            form.instance.number = account_number_allocator.allocate()
+
+        try:
+            return super().form_valid(form)
+        except AccountNumberUnavailable as err:
+            form.add_error("number", err.message)
+
+            return self.form_invalid(form)
     
     def post(self, request: HttpRequest, *args: str, **kwargs: Any) -> HttpResponse:
         type: str = request.POST.get("type")
@@ -202,19 +239,83 @@ class GenerateYieldsView(TemplateTitleMixin, CurrentYearMixin, TemplateView):
     template_title: str = "Generate Yields"
     template_name: str = "accounts/yields.html"
 
+    recent_runs: int = 10
+
+    def get_context_data(self, **kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        context_data: Dict[str, Any] = super().get_context_data(**kwargs)
+        context_data["current_period"] = get_current_period()
+        context_data["yield_runs"] = YieldRun.objects.order_by("-created_at")[:self.recent_runs]
+
+        return context_data
+
     def post(self, request, *args, **kwargs):
-        tax = request.POST.get("tax")
-        SavingsAccount.generate_yield_for_savings_accounts(tax)
+        try:
+            tax: decimal.Decimal = decimal.Decimal(request.POST.get("tax", ""))
+        except decimal.InvalidOperation:
+            messages.error(request, "Tax must be a number.", extra_tags="danger")
+
+            return self.render_to_response(self.get_context_data())
+
+        try:
+            yield_run: YieldRun = submit_yield_run(tax, reference=request.POST.get("reference") or None)
+        except DuplicateYieldRun as err:
+            messages.error(request, err.message, extra_tags="danger")
+
+            return self.render_to_response(self.get_context_data())
+
+        messages.success(request, f"Yield run {yield_run.reference} queued.", extra_tags="success")
+
         return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self) -> str:
-        return reverse_lazy('accounts:list')
+        return reverse_lazy('accounts:yields')
 
 class SearchAccountsView(TemplateTitleMixin, CurrentYearMixin, GetAccountMultipleTypesMixin, TemplateView):
     template_title: str = "Search Accounts"
     template_name: str = "accounts/search.html"
     model : Account
-    
+
+    page_size: int = settings.ACCOUNTS_PAGE_SIZE
+
+    def get_context_data(self, **kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        context_data: Dict[str, Any] = super().get_context_data(**kwargs)
+
+        params: QueryDict = self.request.GET.copy()
+        after: str | None = params.pop("after", [None])[0]
+        after_balance: str | None = params.pop("after_balance", [None])[0]
+
+        if not params:
+            context_data["form"] = AccountSearchForm()
+            return context_data
+
+        form: AccountSearchForm = AccountSearchForm(params)
+        context_data["form"] = form
+
+        if not form.is_valid():
+            return context_data
+
+        search: AccountSearch = AccountSearch(**form.get_filters())
+
+        try:
+            after_balance_value: decimal.Decimal | None = decimal.Decimal(after_balance) if after_balance else None
+        except decimal.InvalidOperation:
+            after_balance_value = None
+
+        accounts: List[Account | BonusAccount | SavingsAccount] = search.page(
+            after=int(after) if after and after.isdigit() else None,
+            limit=self.page_size,
+            after_balance=after_balance_value,
+        )
+
+        context_data["results"] = accounts[:self.page_size]
+
+        if len(accounts) > self.page_size:
+            for key, value in search.get_cursor(accounts[self.page_size - 1]).items():
+                params[key] = value
+            context_data["next_query"] = params.urlencode()
+
+        return context_data
+
     def post(self, request, *args, **kwargs):
         account_number = request.POST["account_number"]
         try:
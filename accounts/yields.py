@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import decimal
+import multiprocessing
+import random
+import time
+import uuid
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Callable
+
+import django
+
+from django.conf import settings
+from django.db import connection
+from django.db import OperationalError
+from django.db import connections
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models.functions import Round
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from accounts import metrics
+from accounts.cache import account_cache
+from accounts.exceptions import DuplicateYieldRun
+from accounts.models import Account
+from accounts.models import AccountType
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+from accounts.models import SavingsAccount
+from accounts.models import SummaryChanges
+from accounts.models import YieldRun
+from accounts.models import YieldRunPartition
+from accounts.models import YieldRunStatus
+
+
+DEFAULT_YIELD_CHUNK_SIZE: int = 1000
+
+CENT: decimal.Decimal = decimal.Decimal("0.01")
+
+PARTITION_CHUNK_RETRIES: int = 8
+
+
+class YieldEngine():
+    """Apply yields to savings accounts in bounded primary-key ranges.
+
+    Every chunk is committed in its own transaction together with the run
+    cursor, so an interrupted run resumes right after the last committed chunk.
+    Given a ``partition``, only its range is processed and the cursor is the
+    partition's, so engines for different partitions never wait on each other.
+    """
+
+    def __init__(
+        self,
+        yield_run: YieldRun,
+        chunk_size: int | None = None,
+        partition: YieldRunPartition | None = None,
+    ) -> None:
+        self.yield_run: YieldRun = yield_run
+        self.partition: YieldRunPartition | None = partition
+        self.chunk_size: int = chunk_size or getattr(
+            settings, "YIELD_CHUNK_SIZE", DEFAULT_YIELD_CHUNK_SIZE,
+        )
+
+    @classmethod
+    def start(
+        cls,
+        tax: decimal.Decimal,
+        reference: str | None = None,
+        chunk_size: int | None = None,
+    ) -> YieldEngine:
+        """Create the run for ``reference`` or pick up the existing one to resume it.
+
+        Part of an existing run may already be applied, so it only resumes with
+        the tax it was started with, and ``DuplicateYieldRun`` is raised otherwise.
+        """
+        if reference is None:
+            reference: str = uuid.uuid4().hex
+
+        yield_run, created = YieldRun.objects.get_or_create(
+            reference=reference,
+            defaults={"tax": tax},
+        )
+
+        if not created and yield_run.tax != tax:
+            raise DuplicateYieldRun(
+                f"The yield run for {reference} used a tax of {yield_run.tax}% and can only be resumed with it"
+            )
+
+        return cls(yield_run, chunk_size)
+
+    @staticmethod
+    def yield_expression(tax: decimal.Decimal) -> Round:
+        # The rate is divided in Python: SQLite casts decimals to NUMERIC, which
+        # turns whole balances and taxes into integers and truncates a SQL division.
+        return Round(F("balance") * (tax / decimal.Decimal(100)), 2)
+
+    def run(self) -> YieldRun:
+        if self.partition is None and self.yield_run.partitions.exists():
+            return ParallelYieldEngine(self.yield_run, workers=1, chunk_size=self.chunk_size).run()
+
+        while self.process_next_chunk():
+            pass
+
+        return self.yield_run
+
+    def lock_cursor(self) -> YieldRun | YieldRunPartition:
+        """Lock the row tracking progress, the partition when running one, else the run."""
+        if self.partition is not None:
+            self.partition = YieldRunPartition.objects.select_for_update().get(pk=self.partition.pk)
+
+            return self.partition
+
+        self.yield_run = YieldRun.objects.select_for_update().get(pk=self.yield_run.pk)
+
+        return self.yield_run
+
+    def get_pending_range(self, cursor: YieldRun | YieldRunPartition) -> Q:
+        lower_bound: uuid.UUID | None = cursor.last_account_id
+        pending_range: Q = Q()
+
+        if self.partition is not None:
+            lower_bound = lower_bound or self.partition.lower_account_id
+
+            if self.partition.upper_account_id is not None:
+                pending_range &= Q(pk__lte=self.partition.upper_account_id)
+
+        if lower_bound is not None:
+            pending_range &= Q(pk__gt=lower_bound)
+
+        return pending_range
+
+    def get_chunk_upper_bound(self, cursor: YieldRun | YieldRunPartition) -> uuid.UUID | None:
+        pending_ids: QuerySet[SavingsAccount] = SavingsAccount.objects.filter(
+            self.get_pending_range(cursor),
+        ).order_by("pk")
+
+        upper_bound: list[uuid.UUID] = list(
+            pending_ids.values_list("pk", flat=True)[self.chunk_size - 1:self.chunk_size]
+        ) or list(
+            pending_ids.reverse().values_list("pk", flat=True)[:1]
+        )
+
+        return upper_bound[0] if upper_bound else None
+
+    def process_next_chunk(self) -> bool:
+        """Apply the yield to the next chunk, returning ``False`` once the run is complete."""
+        with transaction.atomic():
+            cursor: YieldRun | YieldRunPartition = self.lock_cursor()
+
+            if cursor.status == YieldRunStatus.completed:
+                return False
+
+            upper_bound: uuid.UUID | None = self.get_chunk_upper_bound(cursor)
+
+            if upper_bound is None:
+                cursor.status = YieldRunStatus.completed
+                cursor.save(update_fields=["status", "updated_at"])
+
+                if self.partition is None:
+                    transaction.on_commit(metrics.yield_runs.inc)
+
+                return False
+
+            chunk: QuerySet[Account] = Account.objects.filter(
+                self.get_pending_range(cursor),
+                savingsaccount__isnull=False,
+                pk__lte=upper_bound,
+            )
+
+            yield_expression: Round = self.yield_expression(self.yield_run.tax)
+            chunk_yields: list[tuple[uuid.UUID, decimal.Decimal, decimal.Decimal]] = list(
+                chunk.select_for_update().annotate(
+                    yielded=yield_expression,
+                ).values_list("pk", "balance", "yielded")
+            )
+
+            chunk.update(balance=F("balance") + yield_expression)
+
+            entries: list[LedgerEntry] = LedgerEntry.objects.bulk_create(
+                [
+                    LedgerEntry(
+                        account_id=account_id,
+                        kind=LedgerEntryKind.yields,
+                        amount=yielded,
+                        balance=balance + yielded,
+                    )
+                    for account_id, balance, yielded in chunk_yields
+                ],
+                batch_size=self.chunk_size,
+            )
+
+            metrics.count_entries(entries)
+
+            changes: SummaryChanges = SummaryChanges()
+
+            for _, balance, yielded in chunk_yields:
+                changes.change_balance(AccountType.savings, balance, balance + yielded)
+
+            changes.save()
+
+            cursor.status = YieldRunStatus.running
+            cursor.last_account_id = upper_bound
+            cursor.accounts_processed += len(chunk_yields)
+            cursor.total_yield += sum(
+                (yielded for _, _, yielded in chunk_yields),
+                decimal.Decimal(0),
+            )
+            cursor.save(update_fields=[
+                "status",
+                "last_account_id",
+                "accounts_processed",
+                "total_yield",
+                "updated_at",
+            ])
+
+            account_cache.invalidate_all()
+
+        return True
+
+
+def run_partition(
+    partition_id: int,
+    chunk_size: int | None = None,
+    on_chunk: Callable[[], Any] | None = None,
+) -> int:
+    """Apply the yield to one partition of a run, committing chunk by chunk.
+
+    A chunk that fails on a database error, such as SQLite refusing a
+    concurrent writer, was rolled back together with its cursor, so it is
+    retried after a short backoff, up to ``PARTITION_CHUNK_RETRIES`` times in a row.
+    ``on_chunk`` is called after every committed chunk.
+    """
+    partition: YieldRunPartition = YieldRunPartition.objects.select_related("yield_run").get(pk=partition_id)
+    engine: YieldEngine = YieldEngine(partition.yield_run, chunk_size, partition)
+    failures: int = 0
+
+    while True:
+        try:
+            if not engine.process_next_chunk():
+                return partition_id
+        except OperationalError:
+            failures += 1
+
+            if failures > PARTITION_CHUNK_RETRIES:
+                raise
+
+            time.sleep(random.uniform(0.01, 0.05) * 2 ** failures)
+        else:
+            failures = 0
+
+            if on_chunk is not None:
+                on_chunk()
+
+
+def run_partition_in_worker(partition_id: int, chunk_size: int | None = None) -> int:
+    """Process pool entry point, the worker's connections are closed once the partition is done."""
+    try:
+        return run_partition(partition_id, chunk_size)
+    finally:
+        connections.close_all()
+
+
+class ParallelYieldEngine():
+    """Apply a yield run over disjoint primary-key ranges of savings accounts in a process pool.
+
+    The pending accounts are split into ``workers`` ranges of about the same
+    size, stored as ``YieldRunPartition`` rows, and each worker process runs
+    a ``YieldEngine`` over its own range, committing its own chunks. Every
+    account's yield is rounded on its own, so the result matches a
+    sequential run to the cent. Partitions already completed are skipped
+    when an interrupted run is started again.
+
+    In-memory SQLite databases are not visible to other processes, so with
+    them, or with a single worker, the partitions run in this process.
+
+    The run's ``updated_at`` is touched at least every ``heartbeat_interval``
+    seconds while partitions are in progress, so a ``YieldWorker`` does not
+    take a healthy run for an abandoned one when its lease runs out.
+    """
+
+    def __init__(
+        self,
+        yield_run: YieldRun,
+        workers: int,
+        chunk_size: int | None = None,
+        heartbeat_interval: float = 30.0,
+    ) -> None:
+        self.yield_run: YieldRun = yield_run
+        self.workers: int = workers
+        self.chunk_size: int | None = chunk_size
+        self.heartbeat_interval: float = heartbeat_interval
+        self.last_heartbeat: float = time.monotonic()
+
+    @classmethod
+    def start(
+        cls,
+        tax: decimal.Decimal,
+        workers: int,
+        reference: str | None = None,
+        chunk_size: int | None = None,
+        **kwargs: Any,
+    ) -> ParallelYieldEngine:
+        yield_run: YieldRun = YieldEngine.start(tax, reference=reference, chunk_size=chunk_size).yield_run
+
+        return cls(yield_run, workers, chunk_size, **kwargs)
+
+    def heartbeat(self) -> None:
+        if time.monotonic() - self.last_heartbeat < self.heartbeat_interval:
+            return
+
+        YieldRun.objects.filter(pk=self.yield_run.pk, status=YieldRunStatus.running).update(
+            updated_at=timezone.now(),
+        )
+        self.last_heartbeat = time.monotonic()
+
+    def runs_in_process(self) -> bool:
+        return self.workers <= 1 or (connection.vendor == "sqlite" and connection.is_in_memory_db())
+
+    def get_boundaries(self, lower_bound: uuid.UUID | None) -> list[uuid.UUID]:
+        """The inclusive upper bound of every range but the last, which is left open."""
+        pending_ids: QuerySet[SavingsAccount] = SavingsAccount.objects.order_by("pk")
+
+        if lower_bound is not None:
+            pending_ids = pending_ids.filter(pk__gt=lower_bound)
+
+        pending: int = pending_ids.count()
+        offsets: set[int] = {pending * index // self.workers for index in range(1, self.workers)} - {0}
+
+        return [pending_ids.values_list("pk", flat=True)[offset - 1] for offset in sorted(offsets)]
+
+    def create_partitions(self) -> list[YieldRunPartition]:
+        """Split the accounts the run has not reached yet, once per run.
+
+        Progress a sequential engine already made becomes a completed first
+        partition, so the run totals are always the sum of its partitions.
+        """
+        with transaction.atomic():
+            yield_run: YieldRun = YieldRun.objects.select_for_update().get(pk=self.yield_run.pk)
+            partitions: list[YieldRunPartition] = list(yield_run.partitions.order_by("index"))
+
+            if partitions:
+                return partitions
+
+            lower_bound: uuid.UUID | None = yield_run.last_account_id
+
+            if lower_bound is not None:
+                partitions.append(YieldRunPartition(
+                    yield_run=yield_run,
+                    index=0,
+                    upper_account_id=lower_bound,
+                    status=YieldRunStatus.completed,
+                    last_account_id=lower_bound,
+                    accounts_processed=yield_run.accounts_processed,
+                    total_yield=yield_run.total_yield,
+                ))
+
+            boundaries: list[uuid.UUID] = self.get_boundaries(lower_bound)
+
+            for lower, upper in zip([lower_bound, *boundaries], [*boundaries, None]):
+                partitions.append(YieldRunPartition(
+                    yield_run=yield_run,
+                    index=len(partitions),
+                    lower_account_id=lower,
+                    upper_account_id=upper,
+                ))
+
+            return YieldRunPartition.objects.bulk_create(partitions)
+
+    def record_progress(self, status: YieldRunStatus = YieldRunStatus.running) -> YieldRun:
+        """Roll the partition cursors up into the run."""
+        with transaction.atomic():
+            yield_run: YieldRun = YieldRun.objects.select_for_update().get(pk=self.yield_run.pk)
+            self.yield_run = yield_run
+
+            if yield_run.status == YieldRunStatus.completed:
+                return yield_run
+
+            totals: dict = yield_run.partitions.aggregate(
+                accounts_processed=Sum("accounts_processed"),
+                total_yield=Sum("total_yield"),
+            )
+
+            yield_run.status = status
+            yield_run.accounts_processed = totals["accounts_processed"] or 0
+            yield_run.total_yield = (totals["total_yield"] or decimal.Decimal(0)).quantize(CENT)
+            yield_run.save(update_fields=["status", "accounts_processed", "total_yield", "updated_at"])
+
+            if status == YieldRunStatus.completed:
+                transaction.on_commit(metrics.yield_runs.inc)
+
+        return yield_run
+
+    def run(self) -> YieldRun:
+        self.yield_run.refresh_from_db()
+
+        if self.yield_run.status == YieldRunStatus.completed:
+            return self.yield_run
+
+        partitions: list[YieldRunPartition] = self.create_partitions()
+        self.record_progress()
+
+        pending: list[int] = [
+            partition.pk for partition in partitions if partition.status != YieldRunStatus.completed
+        ]
+
+        if self.runs_in_process():
+            for partition_id in pending:
+                run_partition(partition_id, self.chunk_size, on_chunk=self.heartbeat)
+                self.record_progress()
+        elif pending:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(pending)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            ) as pool:
+                futures: set[Future] = {
+                    pool.submit(run_partition_in_worker, partition_id, self.chunk_size)
+                    for partition_id in pending
+                }
+
+                while futures:
+                    done, futures = wait(futures, timeout=self.heartbeat_interval, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        future.result()
+                        self.record_progress()
+
+                    self.heartbeat()
+
+        account_cache.invalidate_all()
+
+        return self.record_progress(YieldRunStatus.completed)
+
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class RestAPIConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'restapi'
+
+    def ready(self) -> None:
+        from restapi.middleware import install_query_timing
+
+        connection_created.connect(install_query_timing)
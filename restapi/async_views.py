@@ -0,0 +1,208 @@
+import abc
+import decimal
+import functools
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpRequest
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authentication import CSRFCheck
+from rest_framework.response import Response
+from rest_framework.serializers import Serializer
+
+from accounts.coalescing import DepositCoalescer
+from accounts.coalescing import deposit_coalescer
+from accounts.exceptions import InsufficientBalance
+from accounts.exceptions import NegativeTransaction
+from accounts.models import Account
+from restapi.idempotency import IDEMPOTENCY_HEADER
+from restapi.idempotency import REPLAYED_HEADER
+from restapi.idempotency import build_fingerprint
+from restapi.idempotency import run_idempotent
+from restapi.rows import detail_rows
+from restapi.rows import list_rows
+from restapi.rows import serialize_detail_row
+from restapi.rows import serialize_list_row
+from restapi.serializers import TransactionSerializer
+from restapi.serializers import TransferSerializer
+
+
+write_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_WRITE_WORKERS,
+    thread_name_prefix="sysbanking-writes",
+)
+
+
+def run_write(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """Run a blocking ORM write on the bounded write pool instead of the event loop."""
+    def run_with_fresh_connections(*args: Any, **kwargs: Any) -> Any:
+        close_old_connections()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run_with_fresh_connections, thread_sensitive=False, executor=write_executor)
+
+
+def parse_number(value: str | None) -> int | None:
+    return int(value) if value is not None and value.isdigit() else None
+
+
+class AsyncAccountListView(View):
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        limit: int = min(
+            parse_number(request.GET.get("limit")) or settings.ACCOUNTS_PAGE_SIZE,
+            settings.ACCOUNTS_MAX_PAGE_SIZE,
+        )
+        after: int | None = parse_number(request.GET.get("after"))
+
+        accounts = Account.objects.order_by("number")
+
+        if after is not None:
+            accounts = accounts.filter(number__gt=after)
+
+        page: List[Dict[str, Any]] = [row async for row in list_rows(accounts)[:limit + 1]]
+        results: List[Dict[str, Any]] = [serialize_list_row(row) for row in page[:limit]]
+
+        next_url: str | None = None
+
+        if len(page) > limit:
+            next_url = request.build_absolute_uri(
+                f"{request.path}?after={page[limit - 1]['number']}&limit={limit}"
+            )
+
+        return JsonResponse({"next": next_url, "results": results})
+
+
+class AsyncAccountDetailView(View):
+
+    async def get(self, request: HttpRequest, number: int) -> JsonResponse:
+        try:
+            row: tuple = await detail_rows(Account.objects.filter(number=number)).aget()
+        except Account.DoesNotExist:
+            return JsonResponse("Account not found", status=status.HTTP_404_NOT_FOUND, safe=False)
+
+        return JsonResponse(serialize_detail_row(*row))
+
+
+class AsyncAccountSearchView(View):
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        number: int | None = parse_number(request.GET.get("number"))
+
+        if number is None:
+            return JsonResponse("Account number is required", status=status.HTTP_400_BAD_REQUEST, safe=False)
+
+        results: List[Dict[str, Any]] = [
+            serialize_detail_row(*row)
+            async for row in detail_rows(Account.objects.filter(number=number))
+        ]
+
+        return JsonResponse({"results": results})
+
+
+class AsyncTransactionView(View, abc.ABC):
+    """Apply a balance change on the write pool, with the write policy of the sync API views.
+
+    Like DRF's ``APIView``, CSRF is only enforced for requests of a logged
+    in session, and a repeated ``Idempotency-Key`` header replays the
+    stored response instead of applying the change again.
+    """
+
+    serializer_class: type[Serializer] = TransactionSerializer
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Callable[..., Any]:
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def put(self, request: HttpRequest, number: int) -> JsonResponse:
+        user: Any = await request.auser()
+
+        if user.is_authenticated:
+            csrf_check: CSRFCheck = CSRFCheck(lambda request: None)
+            csrf_check.process_request(request)
+            reason: str | None = csrf_check.process_view(request, None, (), {})
+
+            if reason:
+                return JsonResponse(f"CSRF Failed: {reason}", status=status.HTTP_403_FORBIDDEN, safe=False)
+
+        try:
+            data: Dict[str, Any] = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse("Malformed JSON body", status=status.HTTP_400_BAD_REQUEST, safe=False)
+
+        serializer: Serializer = self.serializer_class(data=data)
+
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        key: str | None = request.headers.get(IDEMPOTENCY_HEADER)
+        write: Callable[[], Response] = functools.partial(self.write, number, serializer)
+
+        if key is None:
+            response: Response = await run_write(write)()
+        else:
+            fingerprint: str = build_fingerprint(request.method, request.path, data)
+            response: Response = await run_write(run_idempotent)(key, fingerprint, write)
+
+        json_response: JsonResponse = JsonResponse(response.data, status=response.status_code, safe=False)
+
+        if response.has_header(REPLAYED_HEADER):
+            json_response[REPLAYED_HEADER] = response[REPLAYED_HEADER]
+
+        return json_response
+
+    def write(self, number: int, serializer: Serializer) -> Response:
+        try:
+            self.apply(number, **serializer.validated_data)
+        except Account.DoesNotExist:
+            return Response("Account not found", status.HTTP_404_NOT_FOUND)
+        except (NegativeTransaction, InsufficientBalance) as err:
+            return Response(err.message, status.HTTP_403_FORBIDDEN)
+
+        return Response(serializer.data, status.HTTP_202_ACCEPTED)
+
+    @abc.abstractmethod
+    def apply(self, number: int, amount: decimal.Decimal) -> None:
+        ...
+
+
+class AsyncAccountDepositView(AsyncTransactionView):
+
+    def apply(self, number: int, amount: decimal.Decimal) -> None:
+        if DepositCoalescer.is_enabled():
+            deposit_coalescer.deposit(number, amount)
+        else:
+            Account.objects.get_by_number(number).deposit(amount=amount)
+
+
+class AsyncAccountWithdrawView(AsyncTransactionView):
+
+    def apply(self, number: int, amount: decimal.Decimal) -> None:
+        Account.objects.get_by_number(number).withdraw(amount=amount)
+
+
+class AsyncAccountTransferView(AsyncTransactionView):
+    serializer_class: type[Serializer] = TransferSerializer
+
+    def apply(self, number: int, amount: decimal.Decimal, to_account: int) -> None:
+        Account.transfer(
+            amount=amount,
+            from_account=Account.objects.get_by_number(number),
+            to_account=Account.objects.get_by_number(to_account),
+        )
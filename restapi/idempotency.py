@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import contextlib
+import datetime
+import functools
+import hashlib
+import json
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from restapi.models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER: str = "Idempotency-Key"
+
+REPLAYED_HEADER: str = "Idempotent-Replayed"
+
+
+class IdempotencyStore():
+    """Database-backed record of the responses sent for each idempotency key.
+
+    A key is claimed with a single insert before the request is handled and
+    completed with its response afterwards. Completed responses are also
+    kept in the cache, so replays are answered without a query. Completed
+    records expire after ``ttl`` seconds and are then treated as unused.
+
+    A claim still in flight only holds the key for ``processing_lease``
+    seconds, so a key left behind by a process that died while handling
+    the request can be claimed again by a retry. The lease must outlast
+    the slowest request, or a retry may run alongside the original.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        ttl: int = 24 * 60 * 60,
+        prefix: str = "idempotency",
+        processing_lease: int = 60,
+    ) -> None:
+        self.alias: str = alias
+        self.ttl: int = ttl
+        self.prefix: str = prefix
+        self.processing_lease: int = processing_lease
+
+    @classmethod
+    def from_settings(cls) -> IdempotencyStore:
+        options: Dict[str, Any] = getattr(settings, "IDEMPOTENCY", {})
+
+        return cls(
+            alias=options.get("CACHE_ALIAS", "default"),
+            ttl=options.get("TTL", 24 * 60 * 60),
+            prefix=options.get("PREFIX", "idempotency"),
+            processing_lease=options.get("PROCESSING_LEASE", 60),
+        )
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def get_cache_key(self, key: str) -> str:
+        return f"{self.prefix}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def claim(self, key: str, fingerprint: str) -> IdempotencyKey | None:
+        """Claim an unused key, or return the record already holding it.
+
+        Expired records, completed or abandoned in flight, are deleted and
+        the key is claimed again.
+        """
+        cached: Dict[str, Any] | None = self.cache.get(self.get_cache_key(key))
+
+        if cached is not None:
+            return IdempotencyKey(key=key, **cached)
+
+        now: datetime.datetime = timezone.now()
+
+        try:
+            IdempotencyKey.objects.create(
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + datetime.timedelta(seconds=self.processing_lease),
+            )
+        except IntegrityError:
+            record: IdempotencyKey | None = IdempotencyKey.objects.filter(key=key).first()
+
+            if record is not None and record.expires_at > now:
+                return record
+
+            IdempotencyKey.objects.filter(key=key, expires_at__lte=now).delete()
+
+            return self.claim(key, fingerprint)
+
+        return None
+
+    def complete(self, key: str, fingerprint: str, status_code: int, response: Any) -> None:
+        record: Dict[str, Any] = {
+            "status_code": status_code,
+            "response": response,
+        }
+
+        IdempotencyKey.objects.filter(key=key).update(
+            expires_at=timezone.now() + datetime.timedelta(seconds=self.ttl),
+            **record,
+        )
+
+        transaction.on_commit(lambda: self.cache.set(
+            self.get_cache_key(key),
+            {**record, "fingerprint": fingerprint},
+            self.ttl,
+        ))
+
+    def release(self, key: str) -> None:
+        IdempotencyKey.objects.filter(key=key, status_code__isnull=True).delete()
+
+    def purge(self) -> int:
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+
+        return deleted
+
+
+idempotency_store: IdempotencyStore = IdempotencyStore.from_settings()
+
+
+def build_fingerprint(method: str, path: str, data: Any) -> str:
+    payload: str = json.dumps(data, sort_keys=True, default=str)
+
+    return hashlib.sha256(f"{method} {path}\n{payload}".encode()).hexdigest()
+
+
+def get_fingerprint(request: Request) -> str:
+    return build_fingerprint(request.method, request.path, request.data)
+
+
+def run_idempotent(key: str, fingerprint: str, handler: Callable[[], Response], atomic: bool = True) -> Response:
+    """Run ``handler`` once for ``key`` and store its response, or answer with the stored one.
+
+    With ``atomic`` the handler and the stored response commit together, so
+    a request is either applied and recorded or neither. Server errors
+    release the key.
+    """
+    if not 0 < len(key) <= IdempotencyKey._meta.get_field("key").max_length:
+        return Response(f"{IDEMPOTENCY_HEADER} must be 1 to 255 characters long", status.HTTP_400_BAD_REQUEST)
+
+    record: IdempotencyKey | None = idempotency_store.claim(key, fingerprint)
+
+    if record is not None:
+        if record.fingerprint != fingerprint:
+            return Response(
+                f"{IDEMPOTENCY_HEADER} was already used for a different request",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        if not record.is_completed:
+            return Response(
+                f"A request with this {IDEMPOTENCY_HEADER} is still being processed",
+                status.HTTP_409_CONFLICT,
+            )
+
+        return Response(record.response, record.status_code, headers={REPLAYED_HEADER: "true"})
+
+    try:
+        with transaction.atomic() if atomic else contextlib.nullcontext():
+            response: Response = handler()
+
+            if response.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                idempotency_store.complete(
+                    key,
+                    fingerprint,
+                    response.status_code,
+                    json.loads(JSONRenderer().render(response.data)),
+                )
+    except BaseException:
+        idempotency_store.release(key)
+        raise
+
+    if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+        idempotency_store.release(key)
+
+    return response
+
+
+def idempotent(handler: Callable[..., Response] | None = None, *, atomic: bool = True) -> Callable[..., Any]:
+    """Replay the stored response when a request repeats its ``Idempotency-Key`` header.
+
+    Handlers that manage their own transactions, such as chunked yield
+    runs, opt out of ``atomic``, see ``run_idempotent``.
+    """
+    if handler is None:
+        return functools.partial(idempotent, atomic=atomic)
+
+    @functools.wraps(handler)
+    def handle(view: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+        key: str | None = request.headers.get(IDEMPOTENCY_HEADER)
+
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+
+        return run_idempotent(
+            key,
+            get_fingerprint(request),
+            functools.partial(handler, view, request, *args, **kwargs),
+            atomic,
+        )
+
+    return handle
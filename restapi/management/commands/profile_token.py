@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from restapi.profiling import PROFILE_HEADER
+from restapi.profiling import create_profile_token
+
+
+class Command(BaseCommand):
+    help = "Print a signed X-Profile header value that asks for the request to be profiled."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(f"{PROFILE_HEADER}: {create_profile_token()}")
@@ -0,0 +1,14 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from restapi.idempotency import idempotency_store
+
+
+class Command(BaseCommand):
+    help = "Delete the idempotency keys whose TTL or processing lease has expired."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted: int = idempotency_store.purge()
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys."))
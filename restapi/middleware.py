@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import cProfile
+import time
+
+from contextvars import ContextVar
+from contextvars import Token
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+from accounts import metrics
+from restapi.profiling import PROFILE_HEADER
+from restapi.profiling import PROFILE_ID_HEADER
+from restapi.profiling import ProfileWriter
+from restapi.profiling import ProfilingOptions
+from restapi.profiling import QueryRecorder
+from restapi.profiling import is_valid_profile_token
+
+
+class QueryTimer():
+    """Database execute wrapper counting the queries of a request and their time."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.elapsed: float = 0.0
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict) -> Any:
+        started_at: float = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.elapsed += time.perf_counter() - started_at
+            self.count += 1
+
+
+current_query_timer: ContextVar[QueryTimer | None] = ContextVar("current_query_timer", default=None)
+
+
+def time_queries(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict) -> Any:
+    """Execute wrapper of every connection, timing queries for the async request being served."""
+    query_timer: QueryTimer | None = current_query_timer.get()
+
+    if query_timer is None:
+        return execute(sql, params, many, context)
+
+    return query_timer(execute, sql, params, many, context)
+
+
+def install_query_timing(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+class RequestMetricsMiddleware():
+    """Record latency, status, errors and database usage of every request by route.
+
+    Routes are labelled by their URL pattern, not the requested path, so
+    the number of series stays bounded. Sync requests time the queries of
+    the request thread's connection. Async views run their queries on other
+    threads, so async requests publish their timer in a context variable
+    that ``sync_to_async`` carries over to those threads, where
+    ``time_queries`` picks it up.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]]) -> None:
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        query_timer: QueryTimer = QueryTimer()
+        started_at: float = time.perf_counter()
+
+        with connection.execute_wrapper(query_timer):
+            response: HttpResponse = self.get_response(request)
+
+        self.record(request, response, time.perf_counter() - started_at, query_timer)
+
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        query_timer: QueryTimer = QueryTimer()
+        token: Token = current_query_timer.set(query_timer)
+        started_at: float = time.perf_counter()
+
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            current_query_timer.reset(token)
+
+        self.record(request, response, time.perf_counter() - started_at, query_timer)
+
+        return response
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> None:
+        request.metrics_exception = True
+
+    @staticmethod
+    def get_route(request: HttpRequest) -> str:
+        resolver_match = getattr(request, "resolver_match", None)
+
+        return "/" + resolver_match.route if resolver_match is not None else "unmatched"
+
+    def record(self, request: HttpRequest, response: HttpResponse, elapsed: float, query_timer: QueryTimer) -> None:
+        labels: dict[str, str] = {"method": request.method, "route": self.get_route(request)}
+
+        metrics.request_latency.observe(elapsed, **labels)
+        metrics.requests_total.inc(status=str(response.status_code), **labels)
+
+        if response.status_code >= 500 or getattr(request, "metrics_exception", False):
+            metrics.request_errors.inc(**labels)
+
+        metrics.request_queries.observe(query_timer.count, **labels)
+        metrics.request_query_time.inc(query_timer.elapsed, **labels)
+
+
+class ProfilingMiddleware():
+    """Profile selected requests with cProfile and record their SQL statements.
+
+    Requests are profiled when ``PROFILING["ENABLED"]`` is set and their path
+    starts with one of ``PROFILING["PATHS"]`` (every path when empty), or
+    when ``PROFILING["ALLOW_HEADER"]`` is set and they carry a valid signed
+    ``X-Profile`` header. With both off the middleware removes itself from
+    the chain at startup and costs nothing.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.options: ProfilingOptions = ProfilingOptions.from_settings()
+
+        if not self.options.is_active:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.writer: ProfileWriter = ProfileWriter(self.options.directory, self.options.max_profiles)
+
+    def should_profile(self, request: HttpRequest) -> bool:
+        if self.options.enabled and (
+            not self.options.paths
+            or any(request.path.startswith(path) for path in self.options.paths)
+        ):
+            return True
+
+        token: str | None = request.headers.get(PROFILE_HEADER)
+
+        return bool(self.options.allow_header and token and is_valid_profile_token(token, self.options.token_max_age))
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler: cProfile.Profile = cProfile.Profile()
+        query_recorder: QueryRecorder = QueryRecorder()
+        started_at: float = time.perf_counter()
+
+        with connection.execute_wrapper(query_recorder):
+            profiler.enable()
+
+            try:
+                response: HttpResponse = self.get_response(request)
+            finally:
+                profiler.disable()
+
+        response[PROFILE_ID_HEADER] = self.writer.write(
+            request,
+            response.status_code,
+            time.perf_counter() - started_at,
+            profiler,
+            query_recorder.queries,
+        )
+
+        return response
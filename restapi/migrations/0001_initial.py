@@ -0,0 +1,25 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Idempotency Key')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Request Fingerprint')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Response Status Code')),
+                ('response', models.JSONField(blank=True, null=True, verbose_name='Response Body')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Expires At')),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(
+        verbose_name="Idempotency Key",
+        max_length=255,
+        primary_key=True,
+    )
+
+    fingerprint = models.CharField(
+        verbose_name="Request Fingerprint",
+        max_length=64,
+    )
+
+    status_code = models.PositiveSmallIntegerField(
+        verbose_name="Response Status Code",
+        blank=True,
+        null=True,
+    )
+
+    response = models.JSONField(
+        verbose_name="Response Body",
+        blank=True,
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Created At",
+        auto_now_add=True,
+    )
+
+    expires_at = models.DateTimeField(
+        verbose_name="Expires At",
+        db_index=True,
+    )
+
+    @property
+    def is_completed(self) -> bool:
+        return self.status_code is not None
@@ -0,0 +1,16 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class LedgerEntryCursorPagination(CursorPagination):
+    ordering: str = "-id"
+    page_size: int = 50
+    page_size_query_param: str = "limit"
+    max_page_size: int = 500
+
+
+class AccountCursorPagination(CursorPagination):
+    ordering: str = "number"
+    page_size: int = settings.ACCOUNTS_PAGE_SIZE
+    page_size_query_param: str = "limit"
+    max_page_size: int = settings.ACCOUNTS_MAX_PAGE_SIZE
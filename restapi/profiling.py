@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import cProfile
+import dataclasses
+import datetime
+import json
+import pathlib
+import re
+import time
+import uuid
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from django.conf import settings
+from django.core import signing
+from django.http import HttpRequest
+
+
+PROFILE_HEADER: str = "X-Profile"
+
+PROFILE_ID_HEADER: str = "X-Profile-Id"
+
+PROFILE_SALT: str = "sysbanking.profiling"
+
+
+def create_profile_token() -> str:
+    """Signed value for the profiling header, valid for ``PROFILING["TOKEN_MAX_AGE"]`` seconds."""
+    return signing.TimestampSigner(salt=PROFILE_SALT).sign("profile")
+
+
+def is_valid_profile_token(token: str, max_age: int) -> bool:
+    try:
+        return signing.TimestampSigner(salt=PROFILE_SALT).unsign(token, max_age=max_age) == "profile"
+    except signing.BadSignature:
+        return False
+
+
+@dataclasses.dataclass
+class ProfilingOptions():
+    enabled: bool = False
+    allow_header: bool = False
+    paths: List[str] = dataclasses.field(default_factory=list)
+    directory: pathlib.Path = pathlib.Path("profiles")
+    max_profiles: int = 100
+    token_max_age: int = 300
+
+    @classmethod
+    def from_settings(cls) -> ProfilingOptions:
+        options: Dict[str, Any] = getattr(settings, "PROFILING", {})
+
+        return cls(
+            enabled=options.get("ENABLED", False),
+            allow_header=options.get("ALLOW_HEADER", False),
+            paths=list(options.get("PATHS", [])),
+            directory=pathlib.Path(options.get("DIRECTORY", "profiles")),
+            max_profiles=options.get("MAX_PROFILES", 100),
+            token_max_age=options.get("TOKEN_MAX_AGE", 300),
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.enabled or self.allow_header
+
+
+class QueryRecorder():
+    """Database execute wrapper keeping every statement of a request with its duration."""
+
+    def __init__(self) -> None:
+        self.queries: List[Dict[str, Any]] = []
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict) -> Any:
+        started_at: float = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "sql": sql,
+                "many": many,
+                "duration_ms": (time.perf_counter() - started_at) * 1000,
+            })
+
+
+class ProfileWriter():
+    """Write request profiles to a directory, keeping only the newest ``max_profiles``.
+
+    Each profile is a ``.prof`` file readable by ``pstats`` or snakeviz and a
+    ``.json`` file with the request, its duration and its SQL statements.
+    """
+
+    def __init__(self, directory: pathlib.Path, max_profiles: int = 100) -> None:
+        self.directory: pathlib.Path = directory
+        self.max_profiles: int = max_profiles
+
+    def get_profile_id(self, request: HttpRequest) -> str:
+        timestamp: str = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug: str = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-")[:60] or "root"
+
+        return f"{timestamp}-{request.method.lower()}-{slug}-{uuid.uuid4().hex[:8]}"
+
+    def write(
+        self,
+        request: HttpRequest,
+        status_code: int,
+        elapsed: float,
+        profiler: cProfile.Profile,
+        queries: List[Dict[str, Any]],
+    ) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id: str = self.get_profile_id(request)
+
+        profiler.dump_stats(self.directory / f"{profile_id}.prof")
+
+        with open(self.directory / f"{profile_id}.json", "w") as report_file:
+            json.dump({
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": status_code,
+                "duration_ms": elapsed * 1000,
+                "query_count": len(queries),
+                "query_duration_ms": sum(query["duration_ms"] for query in queries),
+                "queries": queries,
+            }, report_file, indent=2)
+
+        self.rotate()
+
+        return profile_id
+
+    def rotate(self) -> None:
+        reports: List[pathlib.Path] = sorted(self.directory.glob("*.json"), reverse=True)
+
+        for report in reports[self.max_profiles:]:
+            report.unlink(missing_ok=True)
+            report.with_suffix(".prof").unlink(missing_ok=True)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import decimal
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from accounts.models import AccountQuerySet
+from accounts.models import AccountType
+
+
+LIST_FIELDS: List[str] = ["id", "number", "account_type"]
+
+DETAIL_FIELDS: List[str] = ["id", "number", "balance", "bonusaccount__points", "account_type"]
+
+CENT: decimal.Decimal = decimal.Decimal("0.01")
+
+
+def list_rows(accounts: AccountQuerySet) -> AccountQuerySet:
+    """``values()`` rows holding what the list payload needs, the type resolved by the database."""
+    return accounts.with_type().values(*LIST_FIELDS)
+
+
+def detail_rows(accounts: AccountQuerySet) -> AccountQuerySet:
+    """``values_list()`` tuples holding what the detail payload needs, in ``DETAIL_FIELDS`` order."""
+    return accounts.with_type().values_list(*DETAIL_FIELDS)
+
+
+def format_balance(balance: decimal.Decimal) -> str:
+    """Render a balance the way ``serializers.DecimalField(decimal_places=2)`` does."""
+    return "{:f}".format(balance.quantize(CENT))
+
+
+def serialize_list_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``AccountSerializer`` payload built from a list row, no model or serializer fields involved."""
+    return {"id": str(row["id"]), "number": row["number"], "type": row["account_type"]}
+
+
+def serialize_detail_row(
+    id: Any,
+    number: int,
+    balance: decimal.Decimal,
+    points: int | None,
+    account_type: str,
+) -> Dict[str, Any]:
+    """The ``Detail*AccountSerializer`` payload built from a detail tuple."""
+    payload: Dict[str, Any] = {"id": str(id), "number": number, "balance": format_balance(balance)}
+
+    if account_type == AccountType.bonus.value:
+        payload["points"] = points
+
+    payload["type"] = account_type
+
+    return payload
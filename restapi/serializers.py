@@ -1,18 +1,32 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from accounts.batch import BatchMode
+from accounts.batch import BatchOperationType
+from accounts.checkpoints import CheckpointPeriod
+from accounts.checkpoints import get_period_end
+from accounts.export import EXPORT_FORMATS
 from accounts.models import Account
+from accounts.models import AccountType
 from accounts.models import BonusAccount
+from accounts.models import LedgerEntry
 from accounts.models import SavingsAccount
+from accounts.models import YieldRun
+from accounts.numbers import account_number_allocator
 
 
 class AccountSerializer(serializers.ModelSerializer):
     
     def create(self) -> Account | BonusAccount | SavingsAccount:
+        if self.validated_data.get("number") is None:
+            self.validated_data["number"] = account_number_allocator.allocate()
+
         return self.Meta.model.objects.create(**self.validated_data)
 
     class Meta:
         model = Account
         fields = ['id', 'number', 'type']
+        extra_kwargs = {'number': {'required': False}}
 
 
 class BonusAccountSerializer(AccountSerializer):
@@ -20,6 +34,7 @@ class BonusAccountSerializer(AccountSerializer):
     class Meta:
         model = BonusAccount
         fields = ['id', 'number', 'type']
+        extra_kwargs = {'number': {'required': False}}
 
 
 class SavingsAccountSerializer(AccountSerializer):
@@ -27,6 +42,7 @@ class SavingsAccountSerializer(AccountSerializer):
     class Meta:
         model = SavingsAccount
         fields = ['id', 'number', 'type']
+        extra_kwargs = {'number': {'required': False}}
 
 
 class DetailAccountSerializer(serializers.ModelSerializer):
@@ -60,3 +76,127 @@ class TransferSerializer(TransactionSerializer):
 
 class GenerateYieldsSerializer(serializers.Serializer):
     tax = serializers.DecimalField(max_digits=15, decimal_places=2)
+    reference = serializers.CharField(max_length=64, required=False)
+
+
+class YieldRunSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = YieldRun
+        fields = ['id', 'reference', 'tax', 'status', 'accounts_processed', 'total_yield', 'error']
+
+
+class LedgerEntrySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = LedgerEntry
+        fields = ['id', 'kind', 'amount', 'balance', 'correlation_id', 'created_at']
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=[operation.value for operation in BatchOperationType])
+    account = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=15, decimal_places=2)
+    to_account = serializers.IntegerField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["type"] == BatchOperationType.transfer and "to_account" not in attrs:
+            raise serializers.ValidationError({"to_account": "This field is required for transfers."})
+
+        return attrs
+
+
+class BatchSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(
+        choices=[mode.value for mode in BatchMode],
+        default=BatchMode.atomic.value,
+    )
+    operations = BatchOperationSerializer(many=True, allow_empty=False, max_length=10000)
+
+
+class BatchOperationResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.CharField(source="status.value")
+    balance = serializers.DecimalField(max_digits=15, decimal_places=2, allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
+class AccountExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+    type = serializers.ChoiceField(
+        choices=[account_type.value for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]],
+        required=False,
+    )
+    min_balance = serializers.DecimalField(max_digits=15, decimal_places=2, required=False)
+    max_balance = serializers.DecimalField(max_digits=15, decimal_places=2, required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if "min_balance" in attrs and "max_balance" in attrs and attrs["min_balance"] > attrs["max_balance"]:
+            raise serializers.ValidationError({"max_balance": "Must be greater than or equal to min_balance."})
+
+        return attrs
+
+
+class AccountSearchSerializer(serializers.Serializer):
+    number_prefix = serializers.RegexField(regex=r"^\d+$", max_length=10, required=False)
+    min_number = serializers.IntegerField(min_value=0, required=False)
+    max_number = serializers.IntegerField(min_value=0, required=False)
+    type = serializers.ChoiceField(
+        choices=[account_type.value for account_type in [AccountType.simple, AccountType.bonus, AccountType.savings]],
+        required=False,
+    )
+    min_balance = serializers.DecimalField(max_digits=15, decimal_places=2, required=False)
+    max_balance = serializers.DecimalField(max_digits=15, decimal_places=2, required=False)
+    overdrawn = serializers.BooleanField(default=False)
+    after = serializers.IntegerField(min_value=0, required=False)
+    after_balance = serializers.DecimalField(max_digits=15, decimal_places=2, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=settings.ACCOUNTS_MAX_PAGE_SIZE, default=settings.ACCOUNTS_PAGE_SIZE)
+
+    def validate(self, attrs: dict) -> dict:
+        for low, high in [("min_number", "max_number"), ("min_balance", "max_balance")]:
+            if low in attrs and high in attrs and attrs[low] > attrs[high]:
+                raise serializers.ValidationError({high: f"Must be greater than or equal to {low}."})
+
+        return attrs
+
+
+class BalancesAsOfSerializer(serializers.Serializer):
+    numbers = serializers.ListField(
+        child=serializers.IntegerField(min_value=0),
+        allow_empty=False,
+        max_length=10000,
+    )
+    at = serializers.DateTimeField(required=False)
+    date = serializers.DateField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if ("at" in attrs) == ("date" in attrs):
+            raise serializers.ValidationError("Provide either at or date.")
+
+        if "date" in attrs:
+            attrs["at"] = get_period_end(CheckpointPeriod.day, attrs.pop("date"))
+
+        return attrs
+
+
+class BalanceAsOfSerializer(serializers.Serializer):
+    number = serializers.IntegerField()
+    balance = serializers.DecimalField(max_digits=15, decimal_places=2)
+
+
+class PortfolioTotalsSerializer(serializers.Serializer):
+    accounts = serializers.IntegerField()
+    total_balance = serializers.DecimalField(max_digits=20, decimal_places=2)
+    overdrawn_accounts = serializers.IntegerField()
+    total_points = serializers.IntegerField()
+
+
+class ImportRowErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    error = serializers.CharField()
+
+
+class ImportReportSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    duplicates = serializers.ListField(child=serializers.IntegerField())
+    errors = ImportRowErrorSerializer(many=True)
@@ -0,0 +1,24 @@
+from typing import Any
+from typing import Dict
+from typing import Iterable
+
+from django.http import StreamingHttpResponse
+
+from accounts.export import EXPORT_FORMATS
+from accounts.export import iter_ndjson
+
+
+NDJSON_CONTENT_TYPE: str = EXPORT_FORMATS["ndjson"][1]
+
+
+def ndjson_response(rows: Iterable[Dict[str, Any]]) -> StreamingHttpResponse:
+    return StreamingHttpResponse(iter_ndjson(rows), content_type=NDJSON_CONTENT_TYPE)
+
+
+def export_response(rows: Iterable[Dict[str, Any]], export_format: str, filename: str) -> StreamingHttpResponse:
+    render, content_type = EXPORT_FORMATS[export_format]
+
+    response: StreamingHttpResponse = StreamingHttpResponse(render(rows), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+
+    return response
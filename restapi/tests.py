@@ -0,0 +1,907 @@
+import csv
+import datetime
+import decimal
+import io
+import json
+import pathlib
+import tempfile
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient
+from django.test import TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+
+from accounts import metrics
+from accounts.cache import account_cache
+from accounts.jobs import YieldWorker
+from accounts.models import Account
+from accounts.models import BonusAccount
+from accounts.models import LedgerEntry
+from accounts.models import LedgerEntryKind
+from accounts.models import SavingsAccount
+from accounts.numbers import account_number_allocator
+from restapi.async_views import AsyncTransactionView
+from restapi.idempotency import get_fingerprint
+from restapi.idempotency import idempotency_store
+from restapi.middleware import ProfilingMiddleware
+from restapi.models import IdempotencyKey
+from restapi.profiling import create_profile_token
+from restapi.rows import detail_rows
+from restapi.rows import list_rows
+from restapi.rows import serialize_detail_row
+from restapi.rows import serialize_list_row
+from restapi.serializers import AccountSerializer
+from restapi.serializers import DetailAccountSerializer
+from restapi.serializers import DetailBonusAccountSerializer
+from restapi.serializers import DetailSavingsAccountSerializer
+
+
+class AccountHistoryAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dummy_regular_account = Account.objects.create(number=100)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200)
+
+        for amount in [10, 20, 30, 40, 50]:
+            self.dummy_regular_account.deposit(amount)
+
+        Account.transfer(15, self.dummy_regular_account, self.dummy_bonus_account)
+
+    def test_history_pages_with_keyset_cursor(self):
+        response = self.client.get("/api/accounts/100/history", {"limit": 4})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry["kind"] for entry in response.data["results"]],
+            [LedgerEntryKind.transfer_out, LedgerEntryKind.deposit, LedgerEntryKind.deposit, LedgerEntryKind.deposit],
+        )
+        self.assertEqual(response.data["results"][0]["balance"], "135.00")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [decimal.Decimal(entry["amount"]) for entry in response.data["results"]],
+            [decimal.Decimal(20), decimal.Decimal(10)],
+        )
+        self.assertIsNone(response.data["next"])
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries.captured_queries))
+
+    def test_transfer_legs_share_correlation_id(self):
+        response = self.client.get("/api/accounts/200/history")
+
+        transfer_in = response.data["results"][0]
+
+        self.assertEqual(transfer_in["kind"], LedgerEntryKind.transfer_in)
+        self.assertEqual(
+            transfer_in["correlation_id"],
+            self.client.get("/api/accounts/100/history").data["results"][0]["correlation_id"],
+        )
+
+    def test_history_of_unknown_account(self):
+        response = self.client.get("/api/accounts/0/history")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AccountListAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        for number in [5, 3, 1]:
+            Account.objects.create(number=number)
+
+        BonusAccount.objects.create(number=2)
+        SavingsAccount.objects.create(number=4)
+
+    def test_list_is_ordered_and_keyset_paginated(self):
+        response = self.client.get("/api/accounts", {"limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([account["number"] for account in response.data["results"]], [1, 2])
+        self.assertEqual([account["type"] for account in response.data["results"]], ["simple", "bonus"])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [3, 4])
+        self.assertEqual(response.data["results"][1]["type"], "savings")
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [5])
+        self.assertIsNone(response.data["next"])
+
+    def test_create_assigns_a_number_when_missing(self):
+        account_number_allocator.reset()
+
+        response = self.client.post("/api/accounts", {"type": "savings"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(response.data["number"], 5)
+        self.assertEqual(Account.objects.get_by_number(response.data["number"]).type, "savings")
+
+        response = self.client.post("/api/accounts", {"type": "simple", "number": response.data["number"] + 1}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        response = self.client.post("/api/accounts", {"type": "simple", "number": 100_000}, format="json")
+
+        self.assertEqual(response.data["number"], 100_000)
+
+    def test_list_streams_ndjson(self):
+        response = self.client.get("/api/accounts", {"stream": "ndjson"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+        self.assertEqual([row["number"] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual([row["type"] for row in rows], ["simple", "bonus", "simple", "savings", "simple"])
+
+
+class AccountExportAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=1, balance=-50)
+        BonusAccount.objects.create(number=2, balance=200, points=12)
+        SavingsAccount.objects.create(number=3, balance=300)
+        Account.objects.create(number=4, balance=400)
+
+    def get_rows(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_streams_csv(self):
+        response = self.client.get("/api/accounts/export", {"output": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="accounts.csv"', response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(self.get_rows(response))))
+
+        self.assertEqual([row["number"] for row in rows], ["1", "2", "3", "4"])
+        self.assertEqual(rows[1], {"id": rows[1]["id"], "number": "2", "type": "bonus", "balance": "200.00", "points": "12"})
+        self.assertEqual(rows[0]["points"], "")
+
+    def test_export_filters_by_type_and_balance(self):
+        response = self.client.get("/api/accounts/export", {"type": "simple", "min_balance": "0"})
+
+        rows = [json.loads(line) for line in self.get_rows(response).splitlines()]
+
+        self.assertEqual([(row["number"], row["type"], row["balance"]) for row in rows], [(4, "simple", "400.00")])
+
+        response = self.client.get("/api/accounts/export", {"min_balance": "100", "max_balance": "300"})
+
+        self.assertEqual([json.loads(line)["number"] for line in self.get_rows(response).splitlines()], [2, 3])
+
+    def test_export_rejects_invalid_filters(self):
+        response = self.client.get("/api/accounts/export", {"min_balance": "10", "max_balance": "5"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AccountSearchAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=12, balance=-50)
+        BonusAccount.objects.create(number=120, balance=200, points=12)
+        SavingsAccount.objects.create(number=125, balance=-10)
+        Account.objects.create(number=1200, balance=400)
+        Account.objects.create(number=300, balance=-20)
+
+    def test_search_pages_through_a_number_prefix(self):
+        response = self.client.get("/api/accounts/search", {"number_prefix": "12", "limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([account["number"] for account in response.data["results"]], [12, 120])
+        self.assertEqual(response.data["results"][1]["points"], 12)
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [125, 1200])
+        self.assertIsNone(response.data["next"])
+
+    def test_search_filters_by_type_and_balance(self):
+        response = self.client.get("/api/accounts/search", {"overdrawn": "true"})
+
+        self.assertEqual(
+            [(account["number"], account["type"]) for account in response.data["results"]],
+            [(12, "simple"), (125, "savings"), (300, "simple")],
+        )
+
+        response = self.client.get("/api/accounts/search", {"type": "simple", "max_balance": "-30"})
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [12])
+
+    def test_search_pages_through_a_balance_range(self):
+        response = self.client.get("/api/accounts/search", {"min_balance": "-20", "limit": 2})
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [300, 125])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([account["number"] for account in response.data["results"]], [120, 1200])
+        self.assertIsNone(response.data["next"])
+
+    def test_search_rejects_invalid_filters(self):
+        for params in [{"min_number": 10, "max_number": 5}, {"number_prefix": "1a"}, {"type": "gold"}, {"after_balance": "x"}]:
+            response = self.client.get("/api/accounts/search", params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AccountBalancesAsOfAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=100, balance=100).deposit(decimal.Decimal("25.50"))
+        SavingsAccount.objects.create(number=300, balance=40)
+
+        LedgerEntry.objects.update(created_at=datetime.datetime(2026, 1, 2, 12, tzinfo=datetime.timezone.utc))
+        Account.objects.update(created_at=datetime.datetime(2025, 12, 31, tzinfo=datetime.timezone.utc))
+
+    def test_balances_at_end_of_day(self):
+        response = self.client.post(
+            "/api/accounts/balances",
+            {"numbers": [300, 100, 999], "date": "2026-01-01"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["balances"],
+            [{"number": 100, "balance": "100.00"}, {"number": 300, "balance": "40.00"}],
+        )
+        self.assertEqual(response.data["missing"], [999])
+
+        response = self.client.post(
+            "/api/accounts/balances",
+            {"numbers": [100], "at": "2026-01-02T13:00:00Z"},
+            format="json",
+        )
+
+        self.assertEqual(response.data["balances"], [{"number": 100, "balance": "125.50"}])
+
+    def test_requires_either_a_date_or_a_moment(self):
+        for data in [{"numbers": [100]}, {"numbers": [100], "date": "2026-01-01", "at": "2026-01-01T00:00:00Z"}]:
+            response = self.client.post("/api/accounts/balances", data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AccountSummaryAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=100, balance=-25)
+        BonusAccount.objects.create(number=200, balance=200, points=12)
+        SavingsAccount.objects.create(number=300, balance=300)
+
+    def test_summary_is_read_in_one_query(self):
+        self.client.put("/api/accounts/200/deposit", {"amount": "150.00"}, format="json")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/accounts/summary")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["types"]["bonus"],
+            {"accounts": 1, "total_balance": "350.00", "overdrawn_accounts": 0, "total_points": 13},
+        )
+        self.assertEqual(
+            response.data["total"],
+            {"accounts": 3, "total_balance": "625.00", "overdrawn_accounts": 1, "total_points": 13},
+        )
+
+
+class AccountImportAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=1)
+
+    def test_import_csv_creates_every_type_and_reports_duplicates(self):
+        body = (
+            "number,type,balance,points\n"
+            "1,simple,10,\n"
+            "2,bonus,20,15\n"
+            "3,savings,30,\n"
+            "3,simple,40,\n"
+            "4,,50,\n"
+            "5,savings,-10,\n"
+            "x,simple,0,\n"
+        )
+
+        response = self.client.post("/api/accounts/import", body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(sorted(response.data["duplicates"]), [1, 3])
+        self.assertEqual([error["row"] for error in response.data["errors"]], [6, 7])
+
+        self.assertEqual(Account.objects.get_by_number(2).points, 15)
+        self.assertEqual(Account.objects.get_by_number(3).type, "savings")
+        self.assertEqual(Account.objects.get_by_number(4).balance, 50)
+
+    def test_import_ndjson(self):
+        body = "\n".join([
+            json.dumps({"number": 10, "type": "bonus"}),
+            "{broken",
+            json.dumps({"number": 11, "type": "simple", "points": 3}),
+            json.dumps({"number": 12, "balance": "12.50"}),
+        ])
+
+        response = self.client.post("/api/accounts/import", body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3])
+        self.assertEqual(Account.objects.get_by_number(10).points, 10)
+
+    def test_import_rejects_unknown_content_type(self):
+        response = self.client.post("/api/accounts/import", {"number": 10}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+class AccountBatchAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dummy_regular_account = Account.objects.create(number=100, balance=500)
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200)
+        self.dummy_savings_account = SavingsAccount.objects.create(number=300)
+
+        self.operations = [
+            {"type": "deposit", "account": 200, "amount": "250.00"},
+            {"type": "transfer", "account": 100, "to_account": 200, "amount": "300.00"},
+            {"type": "withdraw", "account": 300, "amount": "10.00"},
+            {"type": "deposit", "account": 999, "amount": "10.00"},
+            {"type": "withdraw", "account": 100, "amount": "100.00"},
+        ]
+
+    def test_best_effort_batch_applies_valid_operations(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/accounts/batch",
+                {"mode": "best_effort", "operations": self.operations},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["applied", "applied", "rejected", "rejected", "applied"],
+        )
+        self.assertEqual(response.data["results"][3]["error"], "Account 999 not found.")
+
+        self.assertEqual(Account.objects.get(number=100).balance, 100)
+        self.assertEqual(BonusAccount.objects.get(number=200).balance, 550)
+        self.assertEqual(BonusAccount.objects.get(number=200).points, 14)
+        self.assertEqual(SavingsAccount.objects.get(number=300).balance, 0)
+        self.assertEqual(LedgerEntry.objects.count(), 4)
+        # Plus one portfolio summary update per account type touched.
+        self.assertLessEqual(len(queries.captured_queries), 6 + 3)
+
+    def test_atomic_batch_rolls_back_on_rejection(self):
+        response = self.client.post(
+            "/api/accounts/batch",
+            {"operations": self.operations},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["results"][0]["status"], "rolled_back")
+        self.assertEqual(Account.objects.get(number=100).balance, 500)
+        self.assertEqual(BonusAccount.objects.get(number=200).balance, 0)
+        self.assertFalse(LedgerEntry.objects.exists())
+
+    def test_transfer_operation_requires_target_account(self):
+        response = self.client.post(
+            "/api/accounts/batch",
+            {"operations": [{"type": "transfer", "account": 100, "amount": "1.00"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(ACCOUNTS_DEPOSIT_COALESCING={"ENABLED": True})
+class DepositCoalescingAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        BonusAccount.objects.create(number=200)
+
+    def test_deposit_goes_through_the_coalescer(self):
+        response = self.client.put("/api/accounts/200/deposit", {"amount": "150.00"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        account = Account.objects.get_by_number(200)
+
+        self.assertEqual((account.balance, account.points), (150, 11))
+        self.assertEqual(LedgerEntry.objects.get().balance, 150)
+
+    def test_unknown_account_and_negative_amount(self):
+        response = self.client.put("/api/accounts/999/deposit", {"amount": "10.00"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.put("/api/accounts/200/deposit", {"amount": "-10.00"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class IdempotencyKeyAPITestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.dummy_regular_account = Account.objects.create(number=100, balance=100)
+        SavingsAccount.objects.create(number=300, balance=100)
+
+    def put(self, path, data, key):
+        return self.client.put(path, data, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_repeated_deposit_is_applied_once(self):
+        first = self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-1")
+
+        with self.assertNumQueries(0):
+            second = self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-1")
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Account.objects.get(number=100).balance, 110)
+
+    def test_replay_from_the_database_does_not_touch_accounts(self):
+        self.put("/api/accounts/100/withdraw", {"amount": "5000.00"}, "withdraw-1")
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.put("/api/accounts/100/withdraw", {"amount": "5000.00"}, "withdraw-1")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(any("accounts_account" in query["sql"] for query in queries.captured_queries))
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.put("/api/accounts/100/transfer", {"amount": "10.00", "to_account": 300}, "transfer-1")
+
+        response = self.put("/api/accounts/100/transfer", {"amount": "20.00", "to_account": 300}, "transfer-1")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Account.objects.get(number=300).balance, 110)
+
+    def test_invalid_request_releases_the_key(self):
+        response = self.put("/api/accounts/100/deposit", {}, "deposit-2")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_yield_run_is_not_repeated(self):
+        first = self.put("/api/accounts/yields", {"tax": "10.00"}, "yields-1")
+        YieldWorker().run_pending()
+        second = self.put("/api/accounts/yields", {"tax": "10.00"}, "yields-1")
+        YieldWorker().run_pending()
+
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data["reference"], first.data["reference"])
+        self.assertEqual(Account.objects.get(number=300).balance, 110)
+
+    def test_expired_keys_are_reusable_and_purged(self):
+        self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-3")
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        cache.clear()
+
+        self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-3")
+
+        self.assertEqual(Account.objects.get(number=100).balance, 120)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        call_command("purge_idempotency_keys", stdout=io.StringIO())
+
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+    def test_abandoned_claim_is_taken_over_after_the_processing_lease(self):
+        request = Request(
+            APIRequestFactory().put("/api/accounts/100/deposit", {"amount": "10.00"}, format="json"),
+            parsers=[JSONParser()],
+        )
+        idempotency_store.claim("deposit-4", get_fingerprint(request))
+
+        response = self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-4")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        record = IdempotencyKey.objects.get()
+
+        self.assertLessEqual(
+            record.expires_at - record.created_at,
+            datetime.timedelta(seconds=idempotency_store.processing_lease + 1),
+        )
+
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+
+        response = self.put("/api/accounts/100/deposit", {"amount": "10.00"}, "deposit-4")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Account.objects.get(number=100).balance, 110)
+
+        record = IdempotencyKey.objects.get()
+
+        self.assertTrue(record.is_completed)
+        self.assertGreater(record.expires_at, timezone.now() + datetime.timedelta(hours=23))
+
+
+class YieldJobAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        SavingsAccount.objects.create(number=300, balance=100)
+
+    def test_submit_returns_a_job_and_status_reports_progress(self):
+        response = self.client.put("/api/accounts/yields", {"tax": "10.00", "reference": "2026-10"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(response["Location"], f"/api/accounts/yields/{response.data['id']}")
+        self.assertEqual(Account.objects.get(number=300).balance, 100)
+
+        status_url = response["Location"]
+
+        YieldWorker().run_pending()
+
+        response = self.client.get(status_url)
+
+        self.assertEqual(response.data["status"], "completed")
+        self.assertEqual(response.data["accounts_processed"], 1)
+        self.assertEqual(response.data["total_yield"], "10.00")
+
+    def test_duplicate_period_is_rejected(self):
+        self.client.put("/api/accounts/yields", {"tax": "10.00", "reference": "2026-10"}, format="json")
+
+        response = self.client.put("/api/accounts/yields", {"tax": "10.00", "reference": "2026-10"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_unknown_job(self):
+        response = self.client.get(f"/api/accounts/yields/{uuid.uuid4()}")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class MetricsAPITestCase(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        Account.objects.create(number=100, balance=100)
+        SavingsAccount.objects.create(number=300, balance=100)
+
+    def test_domain_counters(self):
+        before = {kind: metrics.ledger_entries.get(kind=kind) for kind in LedgerEntryKind.values}
+        rejections = metrics.insufficient_balance_rejections.get()
+        yield_runs = metrics.yield_runs.get()
+
+        self.client.put("/api/accounts/100/deposit", {"amount": "10.00"}, format="json")
+        self.client.put("/api/accounts/100/withdraw", {"amount": "5.00"}, format="json")
+        self.client.put("/api/accounts/300/withdraw", {"amount": "500.00"}, format="json")
+        self.client.put("/api/accounts/100/transfer", {"amount": "5.00", "to_account": 300}, format="json")
+        self.client.put("/api/accounts/yields", {"tax": "1.00"}, format="json")
+        YieldWorker().run_pending()
+
+        self.assertEqual(
+            {kind: metrics.ledger_entries.get(kind=kind) - count for kind, count in before.items()},
+            {"deposit": 1, "withdraw": 1, "transfer_in": 1, "transfer_out": 1, "yield": 1},
+        )
+        self.assertEqual(metrics.insufficient_balance_rejections.get() - rejections, 1)
+        self.assertEqual(metrics.yield_runs.get() - yield_runs, 1)
+
+    def test_requests_are_recorded_by_route(self):
+        labels = {"method": "GET", "route": "/api/accounts/<int:number>"}
+        requests = metrics.request_latency.get_count(**labels)
+        queries = metrics.request_queries.get_sum(**labels)
+
+        cache.clear()
+        self.client.get("/api/accounts/100")
+        self.client.get("/api/accounts/999")
+
+        self.assertEqual(metrics.request_latency.get_count(**labels) - requests, 2)
+        self.assertEqual(metrics.request_queries.get_sum(**labels) - queries, 2)
+        self.assertGreaterEqual(metrics.requests_total.get(status="404", **labels), 1)
+
+    async def test_async_requests_record_their_queries(self):
+        list_labels = {"method": "GET", "route": "/api/async/accounts"}
+        deposit_labels = {"method": "PUT", "route": "/api/async/accounts/<int:number>/deposit"}
+        queries = metrics.request_queries.get_sum(**list_labels)
+        query_time = metrics.request_query_time.get(**list_labels)
+        deposit_queries = metrics.request_queries.get_sum(**deposit_labels)
+
+        await self.async_client.get("/api/async/accounts")
+        await self.async_client.put(
+            "/api/async/accounts/100/deposit",
+            {"amount": "10.00"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(metrics.request_queries.get_sum(**list_labels) - queries, 1)
+        self.assertGreater(metrics.request_query_time.get(**list_labels), query_time)
+        self.assertGreater(metrics.request_queries.get_sum(**deposit_labels), deposit_queries)
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.get("/api/accounts/100")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+        body = response.content.decode()
+
+        self.assertIn("# TYPE sysbanking_request_duration_seconds histogram", body)
+        self.assertIn('sysbanking_request_duration_seconds_bucket{method="GET",route="/api/accounts/<int:number>",le="+Inf"}', body)
+        self.assertIn('sysbanking_account_cache_lookups{result="hits"}', body)
+
+
+class ProfilingMiddlewareTestCase(TransactionTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        cache.clear()
+        Account.objects.create(number=100)
+
+    def get_profiling_settings(self, **options):
+        return {"DIRECTORY": self.directory.name, "MAX_PROFILES": 100, **options}
+
+    def get_reports(self):
+        return sorted(pathlib.Path(self.directory.name).glob("*.json"))
+
+    def test_disabled_profiling_removes_the_middleware(self):
+        with self.settings(PROFILING=self.get_profiling_settings()):
+            with self.assertRaises(MiddlewareNotUsed):
+                ProfilingMiddleware(lambda request: None)
+
+    def test_enabled_profiling_captures_selected_paths(self):
+        with self.settings(PROFILING=self.get_profiling_settings(ENABLED=True, PATHS=["/api/accounts"])):
+            client = APIClient()
+
+            response = client.get("/api/accounts/100")
+            client.get("/metrics")
+
+        reports = self.get_reports()
+
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].stem, response["X-Profile-Id"])
+        self.assertTrue(reports[0].with_suffix(".prof").exists())
+
+        report = json.loads(reports[0].read_text())
+
+        self.assertEqual(report["path"], "/api/accounts/100")
+        self.assertEqual(report["query_count"], len(report["queries"]))
+        self.assertTrue(any("accounts_account" in query["sql"] for query in report["queries"]))
+
+    def test_signed_header_enables_profiling(self):
+        with self.settings(PROFILING=self.get_profiling_settings(ALLOW_HEADER=True)):
+            client = APIClient()
+
+            client.get("/api/accounts/100")
+            client.get("/api/accounts/100", HTTP_X_PROFILE="forged")
+            response = client.get("/api/accounts/100", HTTP_X_PROFILE=create_profile_token())
+
+        self.assertEqual([report.stem for report in self.get_reports()], [response["X-Profile-Id"]])
+
+    def test_profiles_rotate(self):
+        with self.settings(PROFILING=self.get_profiling_settings(ENABLED=True, MAX_PROFILES=2)):
+            client = APIClient()
+            profile_ids = [client.get("/api/accounts/100")["X-Profile-Id"] for _ in range(3)]
+
+        self.assertEqual([report.stem for report in self.get_reports()], profile_ids[1:])
+        self.assertEqual(len(list(pathlib.Path(self.directory.name).glob("*.prof"))), 2)
+
+
+class AccountDetailCacheAPITestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.dummy_bonus_account = BonusAccount.objects.create(number=200, balance=100)
+        self.dummy_savings_account = SavingsAccount.objects.create(number=300, balance=100)
+
+    def test_detail_is_served_from_cache(self):
+        hits = account_cache.hits
+
+        self.client.get("/api/accounts/200")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/accounts/200")
+
+        self.assertEqual(response.data["points"], 10)
+        self.assertEqual(account_cache.hits, hits + 1)
+
+    def test_balance_changes_invalidate_cached_detail(self):
+        self.client.get("/api/accounts/200")
+        self.client.put("/api/accounts/200/deposit", {"amount": "150.00"}, format="json")
+
+        response = self.client.get("/api/accounts/200")
+
+        self.assertEqual(response.data["balance"], "250.00")
+        self.assertEqual(response.data["points"], 11)
+
+        self.client.put("/api/accounts/200/transfer", {"amount": "50.00", "to_account": 300}, format="json")
+        self.client.get("/api/accounts/300")
+        self.client.put("/api/accounts/yields", {"tax": "10.00"}, format="json")
+        YieldWorker().run_pending()
+
+        self.assertEqual(self.client.get("/api/accounts/200").data["balance"], "200.00")
+        self.assertEqual(self.client.get("/api/accounts/300").data["balance"], "165.00")
+
+    def test_deleted_accounts_are_not_served_from_cache(self):
+        self.client.get("/api/accounts/200")
+        self.client.get("/api/accounts/300")
+
+        Account.objects.get(number=200).delete()
+        Account.objects.filter(number=300).delete()
+
+        self.assertEqual(self.client.get("/api/accounts/200").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get("/api/accounts/300").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_missing_account_is_not_cached(self):
+        self.assertEqual(self.client.get("/api/accounts/400").status_code, status.HTTP_404_NOT_FOUND)
+
+        Account.objects.create(number=400)
+
+        self.assertEqual(self.client.get("/api/accounts/400").status_code, status.HTTP_200_OK)
+
+
+class AccountRowSerializationTestCase(TransactionTestCase):
+    def setUp(self):
+        Account.objects.create(number=1, balance=decimal.Decimal("0"))
+        Account.objects.create(number=2, balance=decimal.Decimal("-12.5"))
+        BonusAccount.objects.create(number=3, balance=decimal.Decimal("1234567.89"), points=42)
+        SavingsAccount.objects.create(number=4, balance=decimal.Decimal("0.1"))
+
+    def render(self, data):
+        return json.loads(JSONRenderer().render(data))
+
+    def test_rows_match_the_model_serializers(self):
+        detail_serializers = {
+            Account: DetailAccountSerializer,
+            BonusAccount: DetailBonusAccountSerializer,
+            SavingsAccount: DetailSavingsAccountSerializer,
+        }
+        accounts = [account.as_concrete() for account in Account.objects.polymorphic().order_by("number")]
+
+        self.assertEqual(
+            self.render([serialize_list_row(row) for row in list_rows(Account.objects.order_by("number"))]),
+            self.render(AccountSerializer(accounts, many=True).data),
+        )
+
+        for account in accounts:
+            row = detail_rows(Account.objects.filter(number=account.number)).get()
+
+            self.assertEqual(
+                list(self.render(serialize_detail_row(*row)).items()),
+                list(self.render(detail_serializers[type(account)](account).data).items()),
+            )
+
+    def test_list_and_detail_endpoints_serve_rows(self):
+        client = APIClient()
+
+        with self.assertNumQueries(1):
+            response = client.get("/api/accounts", {"limit": 10})
+
+        self.assertEqual([account["type"] for account in response.data["results"]], ["simple", "simple", "bonus", "savings"])
+        self.assertEqual(client.get("/api/accounts/2").data["balance"], "-12.50")
+
+
+class AsyncAccountAPITestCase(TransactionTestCase):
+    def setUp(self):
+        Account.objects.create(number=1, balance=100)
+        BonusAccount.objects.create(number=2, balance=100)
+        SavingsAccount.objects.create(number=3, balance=100)
+
+    async def test_async_list_is_keyset_paginated(self):
+        response = await self.async_client.get("/api/async/accounts", {"limit": 2})
+        data = response.json()
+
+        self.assertEqual([account["type"] for account in data["results"]], ["simple", "bonus"])
+
+        data = (await self.async_client.get(data["next"])).json()
+
+        self.assertEqual([account["number"] for account in data["results"]], [3])
+        self.assertIsNone(data["next"])
+
+    async def test_async_detail_and_search(self):
+        response = await self.async_client.get("/api/async/accounts/2")
+
+        self.assertEqual(response.json()["points"], 10)
+        self.assertEqual(response.json()["balance"], "100.00")
+
+        response = await self.async_client.get("/api/async/accounts/search", {"number": 3})
+
+        self.assertEqual(response.json()["results"][0]["type"], "savings")
+
+        response = await self.async_client.get("/api/async/accounts/4")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_writes_run_on_write_pool(self):
+        response = await self.async_client.put(
+            "/api/async/accounts/1/transfer",
+            {"amount": "60.00", "to_account": 3},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = await self.async_client.put(
+            "/api/async/accounts/3/withdraw",
+            {"amount": "500.00"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = await self.async_client.get("/api/async/accounts/3")
+
+        self.assertEqual(response.json()["balance"], "160.00")
+
+    async def test_async_writes_replay_a_repeated_idempotency_key(self):
+        async def deposit(amount, key):
+            return await self.async_client.put(
+                "/api/async/accounts/1/deposit",
+                {"amount": amount},
+                content_type="application/json",
+                headers={"Idempotency-Key": key},
+            )
+
+        first = await deposit("10.00", "async-deposit-1")
+        second = await deposit("10.00", "async-deposit-1")
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+
+        response = await deposit("20.00", "async-deposit-1")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        response = await self.async_client.get("/api/async/accounts/1")
+
+        self.assertEqual(response.json()["balance"], "110.00")
+
+    async def test_async_writes_enforce_csrf_for_logged_in_sessions(self):
+        user = await User.objects.acreate(username="teller")
+        client = AsyncClient(enforce_csrf_checks=True)
+
+        response = await client.put("/api/async/accounts/1/deposit", {"amount": "10.00"}, content_type="application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        await client.aforce_login(user)
+
+        response = await client.put("/api/async/accounts/1/deposit", {"amount": "10.00"}, content_type="application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("CSRF Failed", response.json())
+
+    def test_async_transaction_views_must_define_apply(self):
+        with self.assertRaises(TypeError):
+            AsyncTransactionView()
@@ -1,20 +1,50 @@
 from django.urls import path
 
 from restapi.apps import RestAPIConfig
+from restapi.async_views import AsyncAccountDepositView
+from restapi.async_views import AsyncAccountDetailView
+from restapi.async_views import AsyncAccountListView
+from restapi.async_views import AsyncAccountSearchView
+from restapi.async_views import AsyncAccountTransferView
+from restapi.async_views import AsyncAccountWithdrawView
 from restapi.views import AccountListAPIView
+from restapi.views import AccountBatchAPIView
+from restapi.views import AccountBalancesAsOfAPIView
+from restapi.views import AccountExportAPIView
+from restapi.views import AccountImportAPIView
+from restapi.views import AccountSearchAPIView
+from restapi.views import AccountSummaryAPIView
+from restapi.views import AccountCacheStatsAPIView
 from restapi.views import AccountDetailAPIView
+from restapi.views import AccountHistoryAPIView
 from restapi.views import AccountDepositAPIView
 from restapi.views import AccountWithdrawAPIView
 from restapi.views import AccountTransferAPIView
 from restapi.views import GenerateYieldAPIView
+from restapi.views import YieldRunStatusAPIView
 
 app_name = RestAPIConfig.name
 
 urlpatterns = [
     path("accounts", AccountListAPIView.as_view()),
+    path("accounts/batch", AccountBatchAPIView.as_view()),
+    path("accounts/balances", AccountBalancesAsOfAPIView.as_view()),
+    path("accounts/export", AccountExportAPIView.as_view()),
+    path("accounts/import", AccountImportAPIView.as_view()),
+    path("accounts/search", AccountSearchAPIView.as_view()),
+    path("accounts/summary", AccountSummaryAPIView.as_view()),
     path("accounts/<int:number>", AccountDetailAPIView.as_view()),
+    path("accounts/<int:number>/history", AccountHistoryAPIView.as_view()),
     path("accounts/<int:number>/deposit", AccountDepositAPIView.as_view()),
     path("accounts/<int:number>/transfer", AccountTransferAPIView.as_view()),
     path("accounts/<int:number>/withdraw", AccountWithdrawAPIView.as_view()),
     path("accounts/yields", GenerateYieldAPIView.as_view()),
+    path("accounts/yields/<uuid:id>", YieldRunStatusAPIView.as_view()),
+    path("cache/stats", AccountCacheStatsAPIView.as_view()),
+    path("async/accounts", AsyncAccountListView.as_view()),
+    path("async/accounts/search", AsyncAccountSearchView.as_view()),
+    path("async/accounts/<int:number>", AsyncAccountDetailView.as_view()),
+    path("async/accounts/<int:number>/deposit", AsyncAccountDepositView.as_view()),
+    path("async/accounts/<int:number>/transfer", AsyncAccountTransferView.as_view()),
+    path("async/accounts/<int:number>/withdraw", AsyncAccountWithdrawView.as_view()),
 ]
\ No newline at end of file
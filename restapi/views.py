@@ -1,6 +1,16 @@
+import codecs
+import decimal
+import uuid
+
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
-from typing import Set
+
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.views import View
 
 from rest_framework import status
 from rest_framework.request import Request
@@ -8,14 +18,46 @@ from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
 from rest_framework.views import APIView
 
+from accounts import metrics
+from accounts.batch import BatchMode
+from accounts.batch import BatchOperation
+from accounts.batch import BatchOperationResult
+from accounts.batch import BatchProcessor
+from accounts.cache import account_cache
+from accounts.checkpoints import get_balances_as_of
+from accounts.coalescing import DepositCoalescer
+from accounts.coalescing import deposit_coalescer
+from accounts.export import export_accounts
+from accounts.imports import IMPORT_FORMATS
+from accounts.imports import AccountImporter
+from accounts.imports import ImportReport
+from accounts.jobs import submit_yield_run
 from accounts.models import AccountType
+from accounts.search import AccountSearch
+from accounts.summary import get_totals
+from accounts.summary import read_summary
 from accounts.models import Account
-from accounts.models import BonusAccount
-from accounts.models import SavingsAccount
+from accounts.models import LedgerEntry
+from accounts.models import YieldRun
+from accounts.exceptions import AccountNumberUnavailable
+from accounts.exceptions import DuplicateYieldRun
 from accounts.exceptions import InsufficientBalance
 from accounts.exceptions import NegativeTransaction
+from restapi.idempotency import idempotent
 from restapi.mixins import GetAccountMultipleTypesMixin
+from restapi.pagination import AccountCursorPagination
+from restapi.pagination import LedgerEntryCursorPagination
+from restapi.rows import detail_rows
+from restapi.rows import list_rows
+from restapi.rows import serialize_detail_row
+from restapi.rows import serialize_list_row
+from restapi.serializers import AccountExportSerializer
+from restapi.serializers import AccountSearchSerializer
+from restapi.serializers import BalanceAsOfSerializer
+from restapi.serializers import BalancesAsOfSerializer
 from restapi.serializers import AccountSerializer
+from restapi.serializers import BatchOperationResultSerializer
+from restapi.serializers import BatchSerializer
 from restapi.serializers import BonusAccountSerializer
 from restapi.serializers import SavingsAccountSerializer
 from restapi.serializers import DetailAccountSerializer
@@ -24,6 +66,13 @@ from restapi.serializers import DetailSavingsAccountSerializer
 from restapi.serializers import TransactionSerializer
 from restapi.serializers import TransferSerializer
 from restapi.serializers import GenerateYieldsSerializer
+from restapi.serializers import ImportReportSerializer
+from restapi.serializers import LedgerEntrySerializer
+from restapi.serializers import PortfolioTotalsSerializer
+from restapi.serializers import YieldRunSerializer
+from restapi.streaming import NDJSON_CONTENT_TYPE
+from restapi.streaming import export_response
+from restapi.streaming import ndjson_response
 
 
 class AccountListAPIView(APIView):
@@ -33,11 +82,21 @@ class AccountListAPIView(APIView):
         AccountType.savings.value: SavingsAccountSerializer,
     }
 
-    def get(self, request: Request, format=None) -> Response:
-        accounts: Set[Account] = self.get_all_accounts()
-        serializer: ModelSerializer = AccountSerializer(accounts, many=True)
+    pagination_class: AccountCursorPagination = AccountCursorPagination
+    stream_chunk_size: int = 2000
 
-        return Response(serializer.data, status.HTTP_200_OK)
+    def get(self, request: Request, format=None) -> Response | StreamingHttpResponse:
+        if request.query_params.get("stream") == "ndjson":
+            return ndjson_response(self.stream_all_accounts())
+
+        paginator: AccountCursorPagination = self.pagination_class()
+        rows: List[Dict[str, Any]] = paginator.paginate_queryset(
+            list_rows(Account.objects.all()),
+            request,
+            view=self,
+        )
+
+        return paginator.get_paginated_response([serialize_list_row(row) for row in rows])
 
     def post(self, request: Request, format=None) -> Response:
         account_type: str = request.data.get("type", AccountType.simple.value)
@@ -48,33 +107,158 @@ class AccountListAPIView(APIView):
         serializer: ModelSerializer = serializer_cls(data=request.data)
 
         serializer.is_valid(raise_exception=True)
-        account: Account = serializer.create()
+
+        try:
+            account: Account = serializer.create()
+        except AccountNumberUnavailable as err:
+            return Response(err.message, status.HTTP_409_CONFLICT)
 
         serializer: AccountSerializer = serializer_cls(account)
 
         return Response(serializer.data, status.HTTP_201_CREATED)
 
-    def get_all_accounts(self) -> Set[Account | BonusAccount | SavingsAccount]:
-        simple_accounts: List[Account] = [
-            account for account in Account.objects.filter(
-                bonusaccount__isnull=True,
-                savingsaccount__isnull=True,
+    def stream_all_accounts(self) -> Iterator[Dict[str, Any]]:
+        rows: Iterator[Dict[str, Any]] = Account.objects.with_type().order_by("number").values(
+            "id", "number", "account_type",
+        ).iterator(chunk_size=self.stream_chunk_size)
+
+        for row in rows:
+            yield {"id": row["id"], "number": row["number"], "type": row["account_type"]}
+
+
+class AccountExportAPIView(APIView):
+
+    def get(self, request: Request, format=None) -> StreamingHttpResponse:
+        serializer: AccountExportSerializer = AccountExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        account_type: str | None = serializer.validated_data.get("type")
+
+        rows: Iterator[Dict[str, Any]] = export_accounts(
+            account_type=AccountType(account_type) if account_type else None,
+            min_balance=serializer.validated_data.get("min_balance"),
+            max_balance=serializer.validated_data.get("max_balance"),
+        )
+
+        return export_response(rows, serializer.validated_data["output"], filename="accounts")
+
+
+class AccountSearchAPIView(APIView):
+
+    def get(self, request: Request, format=None) -> Response:
+        serializer: AccountSearchSerializer = AccountSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        filters: Dict[str, Any] = dict(serializer.validated_data)
+        after: int | None = filters.pop("after", None)
+        after_balance: decimal.Decimal | None = filters.pop("after_balance", None)
+        limit: int = filters.pop("limit")
+
+        if "type" in filters:
+            filters["account_type"] = AccountType(filters.pop("type"))
+
+        search: AccountSearch = AccountSearch(**filters)
+        accounts: List[Account] = search.page(after=after, limit=limit, after_balance=after_balance)
+
+        next_url: str | None = None
+
+        if len(accounts) > limit:
+            params = request.query_params.copy()
+            for key, value in search.get_cursor(accounts[limit - 1]).items():
+                params[key] = value
+
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        return Response({
+            "next": next_url,
+            "results": [
+                AccountDetailAPIView.serializer_class_map[account.type](account).data
+                for account in accounts[:limit]
+            ],
+        })
+
+
+class AccountBalancesAsOfAPIView(APIView):
+
+    def post(self, request: Request, format=None) -> Response:
+        serializer: BalancesAsOfSerializer = BalancesAsOfSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        numbers: List[int] = serializer.validated_data["numbers"]
+        balances: Dict[int, decimal.Decimal] = get_balances_as_of(numbers, serializer.validated_data["at"])
+
+        return Response({
+            "at": serializer.validated_data["at"],
+            "balances": BalanceAsOfSerializer(
+                [{"number": number, "balance": balance} for number, balance in sorted(balances.items())],
+                many=True,
+            ).data,
+            "missing": sorted(set(numbers) - set(balances)),
+        })
+
+
+class AccountSummaryAPIView(APIView):
+
+    def get(self, request: Request, format=None) -> Response:
+        summary: Dict[str, Dict[str, Any]] = read_summary()
+
+        return Response({
+            "types": {
+                account_type: PortfolioTotalsSerializer(totals).data
+                for account_type, totals in summary.items()
+            },
+            "total": PortfolioTotalsSerializer(get_totals(summary)).data,
+        })
+
+
+class AccountImportAPIView(APIView):
+    import_format_map: Dict[str, str] = {
+        "text/csv": "csv",
+        NDJSON_CONTENT_TYPE: "ndjson",
+    }
+
+    def post(self, request: Request, format=None) -> Response:
+        import_format: str | None = self.import_format_map.get(request.content_type.split(";")[0].strip())
+
+        if import_format is None:
+            return Response(
+                f"Send the accounts as {' or '.join(self.import_format_map)}",
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             )
-        ]
 
-        bonus_accounts: List[BonusAccount] = [
-            account for account in BonusAccount.objects.all()
-        ]
+        lines: Iterator[str] = codecs.iterdecode(request.stream or [], "utf-8")
+        report: ImportReport = AccountImporter().run(IMPORT_FORMATS[import_format](lines))
+
+        return Response(ImportReportSerializer(report).data, status.HTTP_201_CREATED)
+
 
-        savings_accounts: List[SavingsAccount] = [
-            account for account in SavingsAccount.objects.all()
-        ]
+class AccountBatchAPIView(APIView):
+
+    def post(self, request: Request, format=None) -> Response:
+        serializer: BatchSerializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        all_accounts: Set[Account | BonusAccount | SavingsAccount] = {
-            account for account in simple_accounts + bonus_accounts + savings_accounts
-        }
+        processor: BatchProcessor = BatchProcessor(
+            operations=[
+                BatchOperation(**operation)
+                for operation in serializer.validated_data["operations"]
+            ],
+            mode=BatchMode(serializer.validated_data["mode"]),
+        )
+        results: List[BatchOperationResult] = processor.run()
 
-        return all_accounts
+        response_status: int = status.HTTP_202_ACCEPTED
+
+        if processor.mode == BatchMode.atomic and processor.has_rejections(results):
+            response_status = status.HTTP_403_FORBIDDEN
+
+        return Response(
+            {
+                "mode": processor.mode.value,
+                "results": BatchOperationResultSerializer(results, many=True).data,
+            },
+            status=response_status,
+        )
 
 
 class AccountDetailAPIView(APIView, GetAccountMultipleTypesMixin):
@@ -86,20 +270,58 @@ class AccountDetailAPIView(APIView, GetAccountMultipleTypesMixin):
 
     def get(self, request: Request, number: int, format=None) -> Response:
         try:
-            account: Account = self.get_account_by_number(number)
-        except:
+            payload: Dict[str, Any] = account_cache.get_payload(number, self.serialize_account)
+        except Account.DoesNotExist:
             return Response("Account not found", status.HTTP_404_NOT_FOUND)
 
-        serializer_cls: AccountSerializer = self.serializer_class_map[account.type]
+        return Response(payload, status.HTTP_200_OK)
+
+    def serialize_account(self, number: int) -> Dict[str, Any]:
+        return serialize_detail_row(*detail_rows(Account.objects.filter(number=number)).get())
 
-        serializer: ModelSerializer = serializer_cls(account)
 
-        return Response(serializer.data, status.HTTP_200_OK)
+class AccountCacheStatsAPIView(APIView):
+
+    def get(self, request: Request, format=None) -> Response:
+        return Response(account_cache.stats(), status.HTTP_200_OK)
+
+
+class MetricsView(View):
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(metrics.registry.render(), content_type=metrics.registry.content_type)
+
+
+class AccountHistoryAPIView(APIView):
+    pagination_class: LedgerEntryCursorPagination = LedgerEntryCursorPagination
+
+    def get(self, request: Request, number: int, format=None) -> Response:
+        account_ids: List[uuid.UUID] = list(
+            Account.objects.filter(number=number).values_list("pk", flat=True)
+        )
+
+        if not account_ids:
+            return Response("Account not found", status.HTTP_404_NOT_FOUND)
+
+        paginator: LedgerEntryCursorPagination = self.pagination_class()
+        entries: List[LedgerEntry] = paginator.paginate_queryset(
+            LedgerEntry.objects.filter(account_id=account_ids[0]),
+            request,
+            view=self,
+        )
+
+        serializer: LedgerEntrySerializer = LedgerEntrySerializer(entries, many=True)
+
+        return paginator.get_paginated_response(serializer.data)
 
 
 class AccountDepositAPIView(APIView, GetAccountMultipleTypesMixin):
     
+    @idempotent
     def put(self, request: Request, number: int, format=None) -> Response:
+        if DepositCoalescer.is_enabled():
+            return self.coalesced_put(request, number)
+
         try:
             account: Account = self.get_account_by_number(number)
         except:
@@ -115,9 +337,23 @@ class AccountDepositAPIView(APIView, GetAccountMultipleTypesMixin):
 
         return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
+    def coalesced_put(self, request: Request, number: int) -> Response:
+        serializer: TransactionSerializer = TransactionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            deposit_coalescer.deposit(number, serializer.validated_data["amount"])
+        except Account.DoesNotExist:
+            return Response("Account not found", status.HTTP_404_NOT_FOUND)
+        except NegativeTransaction as err:
+            return Response(err, status=status.HTTP_403_FORBIDDEN)
+
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
 
 class AccountTransferAPIView(APIView, GetAccountMultipleTypesMixin):
     
+    @idempotent
     def put(self, request: Request, number, format=None):
         try:
             account: Account = self.get_account_by_number(number)
@@ -148,6 +384,7 @@ class AccountTransferAPIView(APIView, GetAccountMultipleTypesMixin):
 
 class AccountWithdrawAPIView(APIView, GetAccountMultipleTypesMixin):
     
+    @idempotent
     def put(self, request: Request, number: int, format=None) -> Response:
         try:
             account: Account = self.get_account_by_number(number)
@@ -169,10 +406,32 @@ class AccountWithdrawAPIView(APIView, GetAccountMultipleTypesMixin):
 
 class GenerateYieldAPIView(APIView):
 
+    @idempotent
     def put(self, request: Request, format=None):
         serializer: GenerateYieldsSerializer = GenerateYieldsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        SavingsAccount.generate_yield_for_savings_accounts(serializer.validated_data["tax"])
+        try:
+            yield_run: YieldRun = submit_yield_run(
+                serializer.validated_data["tax"],
+                reference=serializer.validated_data.get("reference"),
+            )
+        except DuplicateYieldRun as err:
+            return Response(err.message, status.HTTP_409_CONFLICT)
+
+        return Response(
+            YieldRunSerializer(yield_run).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"{request.path}/{yield_run.id}"},
+        )
+
+
+class YieldRunStatusAPIView(APIView):
+
+    def get(self, request: Request, id: uuid.UUID, format=None) -> Response:
+        try:
+            yield_run: YieldRun = YieldRun.objects.get(pk=id)
+        except YieldRun.DoesNotExist:
+            return Response("Yield run not found", status.HTTP_404_NOT_FOUND)
 
-        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
\ No newline at end of file
+        return Response(YieldRunSerializer(yield_run).data)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Database profiles for sysbanking, picked with the SYSBANKING_DB_PROFILE environment variable.
+
+``sqlite`` is Django's plain SQLite setup. ``sqlite-tuned`` keeps SQLite but
+switches it to WAL journaling with relaxed syncing, memory mapping, a larger
+page cache, a busy timeout and ``BEGIN IMMEDIATE`` transactions, and keeps
+connections open between requests. ``postgresql`` reads its connection
+parameters from the usual PG* style SYSBANKING_DB_* variables.
+"""
+import os
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+
+DEFAULT_PROFILE = 'sqlite'
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def get_database_name(base_dir: Path) -> str | Path:
+    return os.environ.get('SYSBANKING_DB_NAME', base_dir / 'db.sqlite3')
+
+
+def sqlite(base_dir: Path) -> Dict[str, Any]:
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': get_database_name(base_dir),
+    }
+
+
+def sqlite_tuned(base_dir: Path) -> Dict[str, Any]:
+    return {
+        **sqlite(base_dir),
+        # Applies SQLITE_PRAGMAS on connect and begins transactions with BEGIN IMMEDIATE.
+        'ENGINE': 'sysbanking.sqlite_tuned',
+        'CONN_MAX_AGE': int(os.environ.get('SYSBANKING_DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+    }
+
+
+def postgresql(base_dir: Path) -> Dict[str, Any]:
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('SYSBANKING_DB_NAME', 'sysbanking'),
+        'USER': os.environ.get('SYSBANKING_DB_USER', ''),
+        'PASSWORD': os.environ.get('SYSBANKING_DB_PASSWORD', ''),
+        'HOST': os.environ.get('SYSBANKING_DB_HOST', ''),
+        'PORT': os.environ.get('SYSBANKING_DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.environ.get('SYSBANKING_DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+
+DATABASE_PROFILES: Dict[str, Callable[[Path], Dict[str, Any]]] = {
+    'sqlite': sqlite,
+    'sqlite-tuned': sqlite_tuned,
+    'postgresql': postgresql,
+}
+
+
+def get_database(base_dir: Path, profile: str | None = None) -> Dict[str, Any]:
+    profile = profile or os.environ.get('SYSBANKING_DB_PROFILE', DEFAULT_PROFILE)
+
+    try:
+        return DATABASE_PROFILES[profile](base_dir)
+    except KeyError:
+        raise ValueError(
+            f"Unknown SYSBANKING_DB_PROFILE {profile!r}, use one of {', '.join(DATABASE_PROFILES)}."
+        )
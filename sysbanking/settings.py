@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 
+from sysbanking.database import get_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'restapi.middleware.RequestMetricsMiddleware',
+    'restapi.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,14 +79,36 @@ WSGI_APPLICATION = 'sysbanking.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+# The profile comes from SYSBANKING_DB_PROFILE, see sysbanking/database.py.
 
 DATABASES = {
+    'default': get_database(BASE_DIR),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
+# Read-through cache for account detail lookups, TIMEOUT is the entries TTL in seconds.
+# Writes invalidate entries in the ALIAS cache only. With the default LocMemCache every
+# process has its own copy, so other server processes keep serving an account changed
+# or deleted elsewhere for up to TIMEOUT seconds. Point ALIAS at a shared backend such
+# as Redis or Memcached when running more than one process.
+
+ACCOUNTS_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 30,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -124,3 +150,81 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Accounts listing
+# Default and maximum number of accounts per page of the keyset paginated lists.
+
+ACCOUNTS_PAGE_SIZE = 100
+
+ACCOUNTS_MAX_PAGE_SIZE = 1000
+
+
+# Async REST API
+# Size of the thread pool the async views funnel blocking ORM writes through.
+
+ASYNC_WRITE_WORKERS = 8
+
+
+# Account numbers
+# How many server-assigned account numbers each worker reserves per database round trip.
+
+ACCOUNT_NUMBER_BLOCK_SIZE = 100
+
+
+# Idempotency keys
+# How long, in seconds, a stored response is replayed for a repeated Idempotency-Key header,
+# and how long a request still being processed holds its key before a retry may take it over.
+
+IDEMPOTENCY = {
+    'CACHE_ALIAS': 'default',
+    'TTL': 24 * 60 * 60,
+    'PROCESSING_LEASE': 60,
+}
+
+
+# Request profiling
+# ENABLED profiles every request under PATHS (all when empty), ALLOW_HEADER profiles requests
+# carrying an X-Profile header from `manage.py profile_token`. Profiles rotate in DIRECTORY.
+
+PROFILING = {
+    'ENABLED': False,
+    'ALLOW_HEADER': False,
+    'PATHS': [],
+    'DIRECTORY': BASE_DIR / 'profiles',
+    'MAX_PROFILES': 100,
+    'TOKEN_MAX_AGE': 300,
+}
+
+
+# Deposit coalescing
+# When ENABLED, concurrent REST deposits to the same account within WINDOW_MS milliseconds,
+# up to MAX_BATCH of them, are written together.
+
+ACCOUNTS_DEPOSIT_COALESCING = {
+    'ENABLED': False,
+    'WINDOW_MS': 5,
+    'MAX_BATCH': 100,
+}
+
+
+# Portfolio summary
+# Number of counter rows per account type the incremental summary updates are spread over,
+# so concurrent writers rarely wait on the same row.
+
+ACCOUNTS_SUMMARY_SLOTS = 8
+
+
+# Yield jobs
+# Yield runs submitted through the API or the form are queued and run by `manage.py run_yield_worker`.
+# With SPAWN_WORKER, the default, every submission also starts a worker process that exits once the
+# queue is empty. Deployments running their own `pipenv run worker` process can turn it off.
+# A running job that made no progress for LEASE_S seconds is picked up again by another worker.
+# With PROCESSES above 1, each job is split into primary-key ranges applied by that many processes.
+
+ACCOUNTS_YIELD_JOBS = {
+    'SPAWN_WORKER': True,
+    'POLL_INTERVAL_S': 1.0,
+    'LEASE_S': 300,
+    'PROCESSES': 1,
+}
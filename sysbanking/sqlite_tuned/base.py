@@ -0,0 +1,25 @@
+"""
+SQLite backend for the ``sqlite-tuned`` profile.
+
+Applies ``SQLITE_PRAGMAS`` to every new connection and opens transactions
+with ``BEGIN IMMEDIATE``, so concurrent writers wait on ``busy_timeout``
+instead of failing when upgrading a read lock. Django only accepts the
+``init_command`` and ``transaction_mode`` options for this from 5.1 on.
+"""
+from django.db.backends.sqlite3 import base
+
+from sysbanking.database import SQLITE_PRAGMAS
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+
+        for pragma, value in SQLITE_PRAGMAS.items():
+            connection.execute(f'PRAGMA {pragma}={value}')
+
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -18,8 +18,11 @@ from django.contrib import admin
 from django.urls import path
 from django.urls import include
 
+from restapi.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('accounts.urls')),
     path('api/', include('restapi.urls', 'api')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]